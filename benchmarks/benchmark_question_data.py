@@ -0,0 +1,173 @@
+"""Benchmarks the memory and build time of the question and suggestion data
+of large questionnaires, against the dict backed classes they replaced.
+
+Each scenario builds the data with the current (slotted, interned)
+classes and with the baseline classes below, which copy the dict backed
+classes and the per question choice lists of before. The memory is the
+size of the traced allocations that are alive after building the data.
+
+Usage:
+    python benchmarks/benchmark_question_data.py [--sizes 1000 10000]
+"""
+
+import argparse
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from hledger_preprocessor.Currency import Currency
+
+from tui_labeller.synthetic.CorpusGenerator import CorpusGenerator
+from tui_labeller.tuis.urwid.question_data_classes import (
+    AISuggestion,
+    HistorySuggestion,
+    VerticalMultipleChoiceQuestionData,
+)
+
+MODEL_NAMES: List[str] = ["Gary", "Yanet", "Barry"]
+
+
+class BaselineAISuggestion:
+    def __init__(self, question: str, probability: float, model_name: str):
+        self.question: str = question
+        self.probability: float = probability
+        self.ai_suggestions: str = model_name
+
+
+class BaselineHistorySuggestion:
+    def __init__(self, question: str, frequency: int):
+        self.question: str = question
+        self.frequency: int = frequency
+
+
+class BaselineVerticalMultipleChoiceQuestionData:
+    def __init__(self, question: str, choices: List[str], **kwargs: Any):
+        self.question = question
+        self.choices = choices
+        self.ans_required: bool = kwargs["ans_required"]
+        self.nr_of_ans_per_batch: int = kwargs["nr_of_ans_per_batch"]
+        self.reconfigurer: bool = kwargs["reconfigurer"]
+        self.terminator: bool = kwargs["terminator"]
+        self.ai_suggestions = kwargs["ai_suggestions"]
+        self.question_id = None
+        self.navigation_display = None
+        self.extra_data = None
+        self.drill_down: bool = False
+
+
+def get_answers(*, categories: List[str], size: int) -> List[str]:
+    """Returns size answers, as new strings like those read from a json or
+    typed in, drawn from the categories."""
+    return ["".join(list(categories[i % len(categories)])) for i in range(size)]
+
+
+def build_suggestions(
+    *, answers: List[str], ai_suggestion: type, history_suggestion: type
+) -> List[Any]:
+    return [
+        ai_suggestion(
+            question=answer,
+            probability=0.5,
+            model_name="".join(list(MODEL_NAMES[i % len(MODEL_NAMES)])),
+        )
+        for i, answer in enumerate(answers)
+    ] + [history_suggestion(question=answer, frequency=1) for answer in answers]
+
+
+def build_account_blocks(
+    *, nr_of_blocks: int, question_data: type
+) -> List[Any]:
+    """Returns the currency and account questions of nr_of_blocks account
+    blocks, each with its own choice lists, as the blocks are created."""
+    questions: List[Any] = []
+    for _ in range(nr_of_blocks):
+        for question, choices in (
+            ("Currency:", [currency.value for currency in Currency]),
+            ("Belongs to:", [f"assets:account{i}" for i in range(20)]),
+        ):
+            questions.append(
+                question_data(
+                    question=question,
+                    choices=choices,
+                    nr_of_ans_per_batch=8,
+                    ans_required=True,
+                    reconfigurer=False,
+                    terminator=False,
+                    ai_suggestions=[],
+                )
+            )
+    return questions
+
+
+def measure(*, build: Callable[[], Any]) -> Tuple[int, float]:
+    """Returns the bytes that are alive after build, and its duration."""
+    tracemalloc.start()
+    start: float = time.perf_counter()
+    data: Any = build()
+    duration: float = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del data
+    return size, duration
+
+
+def get_scenarios(
+    *, categories: List[str], size: int
+) -> Dict[str, Dict[str, Callable[[], Any]]]:
+    """Returns the current and baseline builds per scenario."""
+    nr_of_blocks: int = max(size // 100, 1)
+    return {
+        f"suggestions[{size}]": {
+            "current": lambda: build_suggestions(
+                answers=get_answers(categories=categories, size=size),
+                ai_suggestion=AISuggestion,
+                history_suggestion=HistorySuggestion,
+            ),
+            "baseline": lambda: build_suggestions(
+                answers=get_answers(categories=categories, size=size),
+                ai_suggestion=BaselineAISuggestion,
+                history_suggestion=BaselineHistorySuggestion,
+            ),
+        },
+        f"account_blocks[{nr_of_blocks}]": {
+            "current": lambda: build_account_blocks(
+                nr_of_blocks=nr_of_blocks,
+                question_data=VerticalMultipleChoiceQuestionData,
+            ),
+            "baseline": lambda: build_account_blocks(
+                nr_of_blocks=nr_of_blocks,
+                question_data=BaselineVerticalMultipleChoiceQuestionData,
+            ),
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 10000, 100000]
+    )
+    args = parser.parse_args()
+
+    categories: List[str] = CorpusGenerator(seed=0).categories
+    print(
+        f"{'scenario':<24}{'current KiB':>13}{'baseline KiB':>14}"
+        f"{'ratio':>7}{'current ms':>12}{'baseline ms':>13}"
+    )
+    for size in args.sizes:
+        for name, builds in get_scenarios(
+            categories=categories, size=size
+        ).items():
+            current_size, current_duration = measure(build=builds["current"])
+            baseline_size, baseline_duration = measure(build=builds["baseline"])
+            print(
+                f"{name:<24}{current_size / 1024:>13.1f}"
+                f"{baseline_size / 1024:>14.1f}"
+                f"{current_size / baseline_size:>7.2f}"
+                f"{current_duration * 1e3:>12.1f}"
+                f"{baseline_duration * 1e3:>13.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Benchmarks the end-to-end labelling throughput by replaying a key script
+for a batch of receipts with the headless driver.
+
+The receipts go through label_images, so the reconfiguration runs, the
+answer journal, the results sink and the shop catalogue are included.
+
+Usage:
+    python benchmarks/benchmark_receipts.py [--nr-of-receipts 20]
+        [--key-script benchmarks/receipt.keys] [--profile session.collapsed]
+        [--trace session.trace.json] [--memory-report memory.json]
+        [--telemetry metrics.ndjson]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from typing import List
+
+from hledger_preprocessor.receipt_transaction_matching.get_bank_data_from_transactions import (
+    HledgerFlowAccountInfo,
+)
+
+from tui_labeller.batch.batch_labelling import label_images
+from tui_labeller.headless.HeadlessDriver import HeadlessDriver
+from tui_labeller.headless.HeadlessScreen import HeadlessScreen
+from tui_labeller.headless.key_scripts import read_key_script
+from tui_labeller.instrumentation.MemoryMonitor import MemoryMonitor
+from tui_labeller.instrumentation.SamplingProfiler import SamplingProfiler
+from tui_labeller.instrumentation.Tracer import Tracer
+from tui_labeller.telemetry.QuestionTelemetry import QuestionTelemetry
+from tui_labeller.telemetry.rank_questions import (
+    format_ranking,
+    rank_questions,
+)
+from tui_labeller.tuis.urwid.question_app.addresses.ShopCatalogue import (
+    SHOP_CATALOGUE_FILENAME,
+    ShopCatalogue,
+)
+
+DEFAULT_KEY_SCRIPT: str = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "receipt.keys"
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nr-of-receipts", type=int, default=20)
+    parser.add_argument(
+        "--key-script",
+        default=DEFAULT_KEY_SCRIPT,
+        help="The keys of a single receipt, replayed for each receipt.",
+    )
+    parser.add_argument(
+        "--profile",
+        default=None,
+        help="Write the collapsed stacks of the session to this file.",
+    )
+    parser.add_argument(
+        "--trace",
+        default=None,
+        help="Write the spans of the session as a Chrome trace to this file.",
+    )
+    parser.add_argument(
+        "--memory-report",
+        default=None,
+        help="Account the memory per receipt and write it to this file.",
+    )
+    parser.add_argument(
+        "--telemetry",
+        default=None,
+        help="Append the visits of the questions to this metrics file.",
+    )
+    args = parser.parse_args()
+
+    receipt_keys: List[str] = read_key_script(filepath=args.key_script)
+    headless_driver = HeadlessDriver(keys=receipt_keys * args.nr_of_receipts)
+    with tempfile.TemporaryDirectory() as output_json_dir:
+        image_paths: List[str] = [
+            os.path.join(output_json_dir, f"receipt_{i}.jpg")
+            for i in range(args.nr_of_receipts)
+        ]
+        sampling_profiler = SamplingProfiler()
+        if args.profile is not None:
+            sampling_profiler.start()
+        tracer = Tracer()
+        if args.trace is not None:
+            tracer.start()
+        memory_monitor = MemoryMonitor()
+        if args.memory_report is not None:
+            memory_monitor.start()
+        question_telemetry = None
+        if args.telemetry is not None:
+            question_telemetry = QuestionTelemetry(filepath=args.telemetry)
+            question_telemetry.start()
+        start: float = time.perf_counter()
+        label_images(
+            image_paths=image_paths,
+            output_json_dir=output_json_dir,
+            account_infos={
+                HledgerFlowAccountInfo(
+                    account_holder="account_placeholder",
+                    bank="bank_placeholder",
+                    account_type="account_type_placeholder",
+                )
+            },
+            asset_accounts={"assets:gold"},
+            shop_catalogue=ShopCatalogue(
+                filepath=os.path.join(output_json_dir, SHOP_CATALOGUE_FILENAME)
+            ),
+            screen=HeadlessScreen(),
+            headless_driver=headless_driver,
+        )
+        duration: float = time.perf_counter() - start
+        sampling_profiler.stop()
+        tracer.stop()
+        if args.memory_report is not None:
+            memory_monitor.stop()
+        if question_telemetry is not None:
+            question_telemetry.stop()
+
+    key_latencies_us: List[float] = sorted(
+        latency * 1e6 for latency in headless_driver.key_latencies
+    )
+    percentiles: List[float] = statistics.quantiles(key_latencies_us, n=100)
+    print(f"receipts:            {args.nr_of_receipts}")
+    print(f"keys:                {len(key_latencies_us)}")
+    print(f"receipts/second:     {args.nr_of_receipts / duration:.2f}")
+    print(
+        "runs/receipt:       "
+        f" {headless_driver.nr_of_runs / args.nr_of_receipts:.1f}"
+    )
+    print(f"key latency mean us: {statistics.fmean(key_latencies_us):.1f}")
+    print(f"key latency p50 us:  {percentiles[49]:.1f}")
+    print(f"key latency p95 us:  {percentiles[94]:.1f}")
+    print(f"key latency max us:  {key_latencies_us[-1]:.1f}")
+    if args.memory_report is not None:
+        memory_monitor.write(filepath=args.memory_report)
+        print(memory_monitor.get_summary())
+    if args.telemetry is not None:
+        print(
+            format_ranking(rows=rank_questions(filepaths=[args.telemetry])[:10])
+        )
+    if args.trace is not None:
+        tracer.write(filepath=args.trace)
+    if args.profile is not None:
+        sampling_profiler.write(filepath=args.profile)
+        print(sampling_profiler.get_summary())
+
+
+if __name__ == "__main__":
+    main()
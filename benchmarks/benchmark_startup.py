@@ -0,0 +1,139 @@
+"""Benchmarks the startup time and the keystroke handling with the runtime
+type checks on (tests) and off (production).
+
+The type checks are applied when a module is imported, so each
+measurement runs in a fresh interpreter with TUI_LABELLER_TYPECHECK set.
+
+Usage:
+    python benchmarks/benchmark_startup.py [--repeats 5] [--nr-of-keys 500]
+"""
+
+import argparse
+import os
+import subprocess  # nosec
+import sys
+import time
+from typing import Dict, List
+
+from tui_labeller.typechecking import TYPECHECK_ENV_VAR
+
+MODES: Dict[str, str] = {"production": "0", "typechecked": "1"}
+
+
+def run_child(*, typecheck: str, args: List[str]) -> str:
+    """Run this script (or a module) in a fresh interpreter."""
+    env: Dict[str, str] = dict(os.environ, **{TYPECHECK_ENV_VAR: typecheck})
+    return subprocess.run(  # nosec
+        [sys.executable] + args,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+def time_cli_help(*, typecheck: str) -> float:
+    """Returns the wall time of python -m tui_labeller --help."""
+    start: float = time.perf_counter()
+    run_child(typecheck=typecheck, args=["-m", "tui_labeller", "--help"])
+    return time.perf_counter() - start
+
+
+def measure_import() -> float:
+    """Returns the time it takes to import the urwid labelling modules."""
+    start: float = time.perf_counter()
+    # pylint: disable=import-outside-toplevel,unused-import
+    import tui_labeller.batch.batch_labelling  # noqa: F401
+
+    return time.perf_counter() - start
+
+
+def measure_keystrokes(*, nr_of_keys: int) -> float:
+    """Returns the mean time per keystroke typed into an input question
+    with history suggestions."""
+    # pylint: disable=import-outside-toplevel
+    from tui_labeller.tuis.urwid.input_validation.InputType import InputType
+    from tui_labeller.tuis.urwid.question_app.generator import (
+        create_questionnaire,
+    )
+    from tui_labeller.tuis.urwid.question_data_classes import (
+        HistorySuggestion,
+        InputValidationQuestionData,
+    )
+
+    history_suggestions = [
+        HistorySuggestion(question=f"groceries:shop{i}", frequency=1)
+        for i in range(2000)
+    ]
+    question = InputValidationQuestionData(
+        question="Bookkeeping expense category:",
+        input_type=InputType.LETTERS_SEMICOLON,
+        ans_required=True,
+        reconfigurer=False,
+        terminator=False,
+        ai_suggestions=[],
+        history_suggestions=history_suggestions,
+        question_id="category",
+    )
+    app = create_questionnaire(
+        header="Benchmark", questions=[question], labelled_receipts=[]
+    )
+    app.pile.focus_position = app.nr_of_headers
+    app.loop.screen_size = (160, 80)
+    keys: List[str] = list("groceries:shop1") + ["backspace"] * 15
+    start: float = time.perf_counter()
+    for i in range(nr_of_keys):
+        app.loop.process_input([keys[i % len(keys)]])
+    return (time.perf_counter() - start) / nr_of_keys
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--nr-of-keys", type=int, default=500)
+    parser.add_argument(
+        "--child", choices=["import", "keystroke"], help=argparse.SUPPRESS
+    )
+    args = parser.parse_args()
+
+    if args.child == "import":
+        print(measure_import())
+        return
+    if args.child == "keystroke":
+        print(measure_keystrokes(nr_of_keys=args.nr_of_keys))
+        return
+
+    print(
+        f"{'mode':<12} {'--help [ms]':>12} {'import [ms]':>12} {'key [us]':>10}"
+    )
+    for mode, typecheck in MODES.items():
+        cli_help: float = min(
+            time_cli_help(typecheck=typecheck) for _ in range(args.repeats)
+        )
+        import_time: float = min(
+            float(
+                run_child(
+                    typecheck=typecheck, args=[__file__, "--child", "import"]
+                )
+            )
+            for _ in range(args.repeats)
+        )
+        keystroke_time: float = float(
+            run_child(
+                typecheck=typecheck,
+                args=[
+                    __file__,
+                    "--child",
+                    "keystroke",
+                    f"--nr-of-keys={args.nr_of_keys}",
+                ],
+            ).splitlines()[-1]
+        )
+        print(
+            f"{mode:<12} {cli_help * 1e3:>12.1f} {import_time * 1e3:>12.1f}"
+            f" {keystroke_time * 1e6:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,430 @@
+"""Microbenchmarks of the per-keystroke and per-receipt hot paths, swept over
+the size of their input (nr of suggestions, shops, choices or account
+blocks).
+
+The results (seconds per call) are stored as json, and can be compared
+against a baseline json of an earlier run. The script exits with code 1
+if a benchmark got slower than the threshold ratio, so it can guard
+against regressions.
+
+Usage:
+    python benchmarks/microbenchmarks.py --output results.json
+    python benchmarks/microbenchmarks.py --baseline results.json
+        [--threshold 1.25] [--sizes 10 100 1000] [--filter suggestion]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import timeit
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from hledger_preprocessor.receipt_transaction_matching.get_bank_data_from_transactions import (
+    HledgerFlowAccountInfo,
+)
+from hledger_preprocessor.TransactionObjects.Receipt import (
+    Address,
+    Receipt,
+    ShopId,
+)
+
+from tui_labeller.headless.HeadlessScreen import HeadlessScreen
+from tui_labeller.synthetic.CorpusGenerator import CorpusGenerator
+from tui_labeller.tuis.urwid.helper import get_matching_unique_suggestions
+from tui_labeller.tuis.urwid.input_validation.autocomplete_filtering import (
+    get_filtered_suggestions,
+)
+from tui_labeller.tuis.urwid.input_validation.SuggestionIndex import (
+    SuggestionIndex,
+)
+from tui_labeller.tuis.urwid.multiple_choice_question.helper import (
+    get_vc_question,
+)
+from tui_labeller.tuis.urwid.question_app.addresses.ShopCatalogue import (
+    ShopCatalogue,
+)
+from tui_labeller.tuis.urwid.question_app.addresses.update_addresses import (
+    get_initial_complete_list,
+    get_relevant_shop_ids,
+)
+from tui_labeller.tuis.urwid.question_app.AnswerMap import AnswerMap
+from tui_labeller.tuis.urwid.question_app.generator import create_questionnaire
+from tui_labeller.tuis.urwid.question_app.get_answers import get_answers
+from tui_labeller.tuis.urwid.question_app.reconfiguration.adding_questions import (
+    handle_add_account,
+)
+from tui_labeller.tuis.urwid.question_app.reconfiguration.restoring_answers import (
+    restore_answers,
+)
+from tui_labeller.tuis.urwid.question_data_classes import (
+    AISuggestion,
+    HistorySuggestion,
+    VerticalMultipleChoiceQuestionData,
+)
+from tui_labeller.tuis.urwid.QuestionnaireApp import QuestionnaireApp
+from tui_labeller.tuis.urwid.receipts.account_parser import (
+    get_accounts_from_answers,
+)
+from tui_labeller.tuis.urwid.receipts.AccountRegistry import AccountRegistry
+from tui_labeller.tuis.urwid.receipts.create_receipt import (
+    build_receipt_from_answers,
+)
+from tui_labeller.tuis.urwid.receipts.ReceiptQuestions import ReceiptQuestions
+from tui_labeller.typechecking import is_typechecking_enabled
+
+DEFAULT_SIZES: List[int] = [10, 100, 1000, 10000, 100000]
+# The questionnaire benchmarks create a widget per question, their size is
+# the nr of account blocks.
+MAX_ACCOUNT_BLOCKS: int = 1000
+CATEGORIES: List[str] = [
+    f"{root}:{leaf}"
+    for root in ("expenses", "groceries", "transport", "housing", "leisure")
+    for leaf in ("food", "fuel", "rent", "books", "bakery", "market")
+]
+ACCOUNT_INFO = HledgerFlowAccountInfo(
+    account_holder="holder", bank="bank", account_type="checking"
+)
+ASSET_ACCOUNTS = {"assets:gold"}
+
+# Returns the function to time for a given size.
+Setup = Callable[[int], Callable[[], Any]]
+
+
+def get_suggestions(*, size: int) -> List[str]:
+    """Returns size seeded suggestions of the form category:shopN."""
+    rng = random.Random(size)
+    return [f"{rng.choice(CATEGORIES)}:shop{i}" for i in range(size)]
+
+
+def get_shop_id(*, index: int) -> ShopId:
+    return ShopId(
+        name=f"shop{index}",
+        address=Address(street=f"street{index}", house_nr=str(index)),
+    )
+
+
+def setup_filtered_suggestions(input_text: str) -> Setup:
+    def setup(size: int) -> Callable[[], Any]:
+        suggestions: List[str] = get_suggestions(size=size)
+        return lambda: get_filtered_suggestions(
+            input_text=input_text, available_suggestions=suggestions
+        )
+
+    return setup
+
+
+def setup_suggestion_index(input_text: str) -> Setup:
+    def setup(size: int) -> Callable[[], Any]:
+        suggestion_index = SuggestionIndex(get_suggestions(size=size))
+        return lambda: suggestion_index.get_filtered_suggestions(
+            input_text=input_text
+        )
+
+    return setup
+
+
+def setup_top_suggestions(size: int) -> Callable[[], Any]:
+    suggestions: List[str] = get_suggestions(size=size)
+    suggestion_index = SuggestionIndex(
+        suggestions, scores=[float(i % 97) for i in range(len(suggestions))]
+    )
+    return lambda: suggestion_index.get_top_suggestions(
+        input_text="groceries:sh", k=10
+    )
+
+
+def setup_fuzzy_suggestions(size: int) -> Callable[[], Any]:
+    suggestion_index = SuggestionIndex(get_suggestions(size=size))
+    return lambda: suggestion_index.get_fuzzy_suggestions(
+        input_text="grocries:bakry", k=10
+    )
+
+
+def setup_matching_unique_suggestions(size: int) -> Callable[[], Any]:
+    suggestions: List[HistorySuggestion] = [
+        HistorySuggestion(question=suggestion, frequency=1)
+        for suggestion in get_suggestions(size=size)
+    ]
+    return lambda: get_matching_unique_suggestions(
+        suggestions=suggestions, current_text="groceries:sh", cursor_pos=11
+    )
+
+
+def setup_relevant_shop_ids(size: int) -> Callable[[], Any]:
+    """A synthetic corpus of size receipts with Zipf distributed shops."""
+    corpus_generator = CorpusGenerator(
+        seed=size, nr_of_shops=max(1, size // 10), nr_of_categories=30
+    )
+    labelled_receipts: List[Receipt] = list(
+        corpus_generator.generate_receipts(nr_of_receipts=size)
+    )
+    return lambda: get_relevant_shop_ids(
+        labelled_receipts=labelled_receipts,
+        category_input=corpus_generator.categories[0],
+    )
+
+
+def setup_initial_complete_list(size: int) -> Callable[[], Any]:
+    """The choices after a receipt was added, so the cache is invalidated."""
+    rng = random.Random(size)
+    shop_catalogue = ShopCatalogue()
+    for i in range(size):
+        shop_catalogue.add_shop(
+            shop_identifier=get_shop_id(index=i),
+            category=rng.choice(CATEGORIES),
+        )
+    new_shop: ShopId = get_shop_id(index=0)
+
+    def add_receipt_and_get_choices() -> Tuple[List[str], List[ShopId]]:
+        shop_catalogue.add_shop(shop_identifier=new_shop, category="a:b")
+        return get_initial_complete_list(
+            shop_catalogue=shop_catalogue, category_input="groceries:food"
+        )
+
+    return add_receipt_and_get_choices
+
+
+def setup_vc_question(size: int) -> Callable[[], Any]:
+    choices: List[str] = get_suggestions(size=size)
+    vc_question_data = VerticalMultipleChoiceQuestionData(
+        question="Select Shop Address:\n",
+        choices=choices,
+        nr_of_ans_per_batch=10,
+        ans_required=True,
+        reconfigurer=False,
+        terminator=False,
+        ai_suggestions=[
+            AISuggestion(question=choice, probability=0.5, model_name="m")
+            for choice in choices[::10]
+        ],
+    )
+    return lambda: get_vc_question(
+        vc_question_data=vc_question_data, indentation=1, batch_size=10
+    )
+
+
+def get_receipt_questionnaire(
+    *, nr_of_account_blocks: int
+) -> Tuple[QuestionnaireApp, Dict[str, Any]]:
+    """Returns a questionnaire with nr_of_account_blocks account blocks, and
+    the json answers (as in an answer journal) of all its questions."""
+    receipt_questions = ReceiptQuestions(
+        account_infos={ACCOUNT_INFO},
+        asset_accounts=ASSET_ACCOUNTS,
+        labelled_receipts=[],
+    )
+    tui: QuestionnaireApp = create_questionnaire(
+        header="Benchmark",
+        questions=receipt_questions.get_questions(),
+        labelled_receipts=[],
+        screen=HeadlessScreen(),
+    )
+    for _ in range(nr_of_account_blocks - 1):
+        handle_add_account(
+            tui=tui,
+            account_questions=receipt_questions.account_questions,
+            selected_accounts=set(),
+        )
+    questionnaire_answers: Dict[str, Any] = {
+        "Receipt date and time:\n": "2025-01-02T03:04:00",
+        "\nBookkeeping expense category:": "groceries:food",
+        "address_selector": "manual address",
+        "shop_name": "bakery",
+        "shop_street": "Broodstraat",
+        "shop_city": "Nijmegen",
+        "\nDone with this receipt?": "yes",
+    }
+    for block in range(nr_of_account_blocks):
+        suffix: str = "" if block == 0 else f"_{block + 1}"
+        questionnaire_answers.update(
+            {
+                f"Belongs to bank/asset_accounts:{suffix}": "assets:gold",
+                f"Currency:{suffix}": "EUR",
+                f"Amount paid from account:{suffix}": 1.5,
+                f"Change returned to account:{suffix}": 0.0,
+                f"Add another account (y/n)?{suffix}": (
+                    "y" if block < nr_of_account_blocks - 1 else "n"
+                ),
+            }
+        )
+    return tui, questionnaire_answers
+
+
+def setup_restore_answers(size: int) -> Callable[[], Any]:
+    tui, questionnaire_answers = get_receipt_questionnaire(
+        nr_of_account_blocks=size
+    )
+    return lambda: restore_answers(tui=tui, answers=dict(questionnaire_answers))
+
+
+def get_final_answers(*, nr_of_account_blocks: int) -> List[Tuple[Any, Any]]:
+    tui, questionnaire_answers = get_receipt_questionnaire(
+        nr_of_account_blocks=nr_of_account_blocks
+    )
+    restore_answers(tui=tui, answers=questionnaire_answers)
+    return get_answers(inputs=tui.inputs)
+
+
+def setup_accounts_from_answers(size: int) -> Callable[[], Any]:
+    final_answers = get_final_answers(nr_of_account_blocks=size)
+    account_registry = AccountRegistry(
+        account_infos={ACCOUNT_INFO}, asset_accounts=ASSET_ACCOUNTS
+    )
+    return lambda: get_accounts_from_answers(
+        answer_map=AnswerMap(final_answers=final_answers),
+        account_infos={ACCOUNT_INFO},
+        asset_accounts=ASSET_ACCOUNTS,
+        account_registry=account_registry,
+    )
+
+
+def setup_build_receipt(size: int) -> Callable[[], Any]:
+    final_answers = get_final_answers(nr_of_account_blocks=size)
+    account_registry = AccountRegistry(
+        account_infos={ACCOUNT_INFO}, asset_accounts=ASSET_ACCOUNTS
+    )
+    return lambda: build_receipt_from_answers(
+        final_answers=final_answers,
+        verbose=False,
+        account_infos={ACCOUNT_INFO},
+        asset_accounts=ASSET_ACCOUNTS,
+        account_registry=account_registry,
+    )
+
+
+# name: (setup, max size)
+BENCHMARKS: Dict[str, Tuple[Setup, Optional[int]]] = {
+    "get_filtered_suggestions[prefix]": (
+        setup_filtered_suggestions("groceries:sh"),
+        None,
+    ),
+    "get_filtered_suggestions[wildcard]": (
+        setup_filtered_suggestions("gro*hop1"),
+        None,
+    ),
+    "SuggestionIndex[prefix]": (setup_suggestion_index("groceries:sh"), None),
+    "SuggestionIndex[wildcard]": (setup_suggestion_index("gro*hop1"), None),
+    "SuggestionIndex[top_k]": (setup_top_suggestions, None),
+    "SuggestionIndex[fuzzy]": (setup_fuzzy_suggestions, None),
+    "get_matching_unique_suggestions": (
+        setup_matching_unique_suggestions,
+        None,
+    ),
+    "get_relevant_shop_ids": (setup_relevant_shop_ids, None),
+    "get_initial_complete_list": (setup_initial_complete_list, None),
+    "get_vc_question": (setup_vc_question, None),
+    "restore_answers": (setup_restore_answers, MAX_ACCOUNT_BLOCKS),
+    "get_accounts_from_answers": (
+        setup_accounts_from_answers,
+        MAX_ACCOUNT_BLOCKS,
+    ),
+    "build_receipt_from_answers": (setup_build_receipt, MAX_ACCOUNT_BLOCKS),
+}
+
+
+def time_call(*, function: Callable[[], Any], repeat: int) -> float:
+    """Returns the fastest time per call, in seconds, of repeat rounds that
+    each take at least 0.2 seconds."""
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run_benchmarks(
+    *, sizes: List[int], name_filter: Optional[str], repeat: int
+) -> Dict[str, Dict[str, float]]:
+    """Returns the seconds per call per benchmark name and size."""
+    results: Dict[str, Dict[str, float]] = {}
+    for name, (setup, max_size) in BENCHMARKS.items():
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = {}
+        for size in sizes:
+            if max_size is not None and size > max_size:
+                continue
+            seconds: float = time_call(function=setup(size), repeat=repeat)
+            results[name][str(size)] = seconds
+            print(f"{name:<36} {size:>7} {seconds * 1e6:>14.2f} us")
+    return results
+
+
+def compare(
+    *,
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+) -> List[str]:
+    """Print the ratios to the baseline, returns the regressions."""
+    regressions: List[str] = []
+    print(f"\n{'benchmark':<36} {'size':>7} {'ratio':>8}")
+    for name, size_results in results.items():
+        for size, seconds in size_results.items():
+            baseline_seconds: Optional[float] = baseline.get(name, {}).get(size)
+            if baseline_seconds is None:
+                continue
+            ratio: float = seconds / baseline_seconds
+            is_regression: bool = ratio > threshold
+            if is_regression:
+                regressions.append(f"{name}[{size}]")
+            print(
+                f"{name:<36} {size:>7} {ratio:>8.2f}"
+                f"{'  REGRESSION' if is_regression else ''}"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument(
+        "--filter", default=None, help="Only run benchmarks with this text."
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Store the results in this json.")
+    parser.add_argument("--baseline", help="Results json to compare with.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="Slowdown ratio (current/baseline) that counts as regression.",
+    )
+    args = parser.parse_args()
+
+    results = run_benchmarks(
+        sizes=args.sizes, name_filter=args.filter, repeat=args.repeat
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(
+                {
+                    "metadata": {
+                        "python": platform.python_version(),
+                        "platform": platform.platform(),
+                        "typechecked": is_typechecking_enabled(),
+                        "date": datetime.now().isoformat(timespec="seconds"),
+                    },
+                    "results": results,
+                },
+                output_file,
+                indent=2,
+            )
+    if args.baseline:
+        if not os.path.isfile(args.baseline):
+            raise FileNotFoundError(f"Baseline '{args.baseline}' not found.")
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline: Dict = json.load(baseline_file)["results"]
+        regressions: List[str] = compare(
+            results=results, baseline=baseline, threshold=args.threshold
+        )
+        if regressions:
+            print(f"\nRegressions: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,14 @@
 """Contains the project versioning."""
 
+import logging
+
 __version__ = "0.0.1"
 __version_info__ = tuple(int(i) for i in __version__.split(".") if i.isdigit())
 
+# Nothing is logged until logging_pipeline.configure_logging is called, so
+# the records never end up on the terminal that urwid draws on.
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
 
 # from tui_labeller.__main__ import main
 
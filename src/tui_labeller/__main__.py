@@ -1,25 +1,40 @@
 """Entry point for the project."""
 
+import atexit
+import os
 from argparse import ArgumentParser
+from typing import List, Optional
 
-from hledger_preprocessor.receipt_transaction_matching.get_bank_data_from_transactions import (
-    HledgerFlowAccountInfo,
-)
+from tui_labeller.typechecking import TYPECHECK_ENV_VAR
+
+# Skip the runtime type checks unless they are enabled explicitly. This has
+# to happen before the other modules of the package are imported.
+os.environ.setdefault(TYPECHECK_ENV_VAR, "0")
 
-from tui_labeller.arg_parser.arg_parser import create_arg_parser, verify_args
-from tui_labeller.interface_enum import InterfaceMode
-from tui_labeller.tuis.cli.questions.ask_receipt import (
-    build_receipt_from_cli,
+# The (heavy) TUI modules are imported in the selected interface mode only.
+from tui_labeller.arg_parser.arg_parser import (  # noqa: E402
+    create_arg_parser,
+    verify_args,
 )
-from tui_labeller.tuis.urwid.ask_urwid_receipt import build_receipt_from_urwid
+from tui_labeller.interface_enum import InterfaceMode  # noqa: E402
+from tui_labeller.logging_pipeline import configure_logging  # noqa: E402
 
 parser: ArgumentParser = create_arg_parser()
 args, categories, account_infos = verify_args(parser=parser)
 
 
 if __name__ == "__main__":
+    # Flush the queued log records when the session ends.
+    atexit.register(
+        configure_logging(
+            log_level=args.log_level, log_filepath=args.log_file
+        ).stop
+    )
 
     if args.tui.lower() == InterfaceMode.CLI.value:
+        from tui_labeller.tuis.cli.questions.ask_receipt import (
+            build_receipt_from_cli,
+        )
 
         build_receipt_from_cli(
             receipt_owner_account_holder="account_placeholder",
@@ -27,19 +42,105 @@ if __name__ == "__main__":
             receipt_owner_account_holder_type="account_type_placeholder",
         )
     elif args.tui.lower() == InterfaceMode.URWID.value:
+        from tui_labeller.batch.batch_labelling import (
+            get_image_paths,
+            get_unlabelled_image_paths,
+            label_images,
+        )
+        from tui_labeller.headless.KeyRecorder import KeyRecorder
+        from tui_labeller.instrumentation.KeyLatencyMonitor import (
+            KeyLatencyMonitor,
+        )
+        from tui_labeller.instrumentation.MemoryMonitor import MemoryMonitor
+        from tui_labeller.instrumentation.SamplingProfiler import (
+            SamplingProfiler,
+        )
+        from tui_labeller.instrumentation.Tracer import Tracer
+        from tui_labeller.results.results_reader import (
+            read_labelled_receipts,
+        )
+        from tui_labeller.telemetry.QuestionTelemetry import (
+            QuestionTelemetry,
+        )
+        from tui_labeller.tuis.urwid.question_app.addresses.ShopCatalogue import (
+            SHOP_CATALOGUE_FILENAME,
+            ShopCatalogue,
+        )
 
         # app = create_row_questionnaire()
         # app.run()
 
-        build_receipt_from_urwid(
-            account_infos=[
-                HledgerFlowAccountInfo(
-                    account_holder="account_placeholder",
-                    bank="bank_placeholder",
-                    account_type="account_type_placeholder",
-                )
-            ],
-            asset_accounts=categories,
+        sampling_profiler: Optional[SamplingProfiler] = None
+        if args.profile is not None:
+            sampling_profiler = SamplingProfiler(interval=args.profile_interval)
+            sampling_profiler.start()
+        tracer: Optional[Tracer] = None
+        if args.trace is not None:
+            tracer = Tracer()
+            tracer.start()
+        memory_monitor: Optional[MemoryMonitor] = None
+        if args.memory_report is not None:
+            memory_monitor = MemoryMonitor()
+            memory_monitor.start()
+        question_telemetry: Optional[QuestionTelemetry] = None
+        if args.telemetry is not None:
+            question_telemetry = QuestionTelemetry(filepath=args.telemetry)
+            question_telemetry.start()
+
+        # Load the shop catalogue once, it is updated with each new receipt.
+        # Without a catalogue file, it is seeded from the labelled receipts.
+        shop_catalogue: ShopCatalogue = ShopCatalogue.load(
+            filepath=os.path.join(
+                args.output_json_dir, SHOP_CATALOGUE_FILENAME
+            ),
+            labelled_receipts=read_labelled_receipts(
+                output_json_dir=args.output_json_dir
+            ),
+        )
+        if args.image_dir is None:
+            image_paths: List[str] = [args.image_path]
+        else:
+            image_paths = get_unlabelled_image_paths(
+                image_paths=get_image_paths(image_dir=args.image_dir),
+                output_json_dir=args.output_json_dir,
+            )
+        key_recorder: Optional[KeyRecorder] = (
+            None
+            if args.record_keys is None
+            else KeyRecorder(filepath=args.record_keys)
+        )
+        key_latency_monitor: Optional[KeyLatencyMonitor] = (
+            KeyLatencyMonitor(show_hud=args.latency_hud)
+            if args.latency_hud or args.latency_report is not None
+            else None
         )
+        try:
+            label_images(
+                image_paths=image_paths,
+                output_json_dir=args.output_json_dir,
+                account_infos=account_infos,
+                asset_accounts=set(categories),
+                shop_catalogue=shop_catalogue,
+                input_filter=key_recorder,
+                key_latency_monitor=key_latency_monitor,
+            )
+        finally:
+            if key_recorder is not None:
+                key_recorder.close()
+            if args.latency_report is not None:
+                key_latency_monitor.dump(filepath=args.latency_report)
+            if question_telemetry is not None:
+                question_telemetry.stop()
+            if memory_monitor is not None:
+                memory_monitor.stop()
+                memory_monitor.write(filepath=args.memory_report)
+                print(memory_monitor.get_summary())
+            if tracer is not None:
+                tracer.stop()
+                tracer.write(filepath=args.trace)
+            if sampling_profiler is not None:
+                sampling_profiler.stop()
+                sampling_profiler.write(filepath=args.profile)
+                print(sampling_profiler.get_summary())
     else:
         print(f"Please select a CLI/TUI. You choose:{args.tui.lower()}")
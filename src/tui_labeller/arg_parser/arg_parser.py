@@ -9,9 +9,14 @@ from hledger_preprocessor.dir_reading_and_writing import assert_dir_exists
 from hledger_preprocessor.receipt_transaction_matching.get_bank_data_from_transactions import (
     HledgerFlowAccountInfo,
 )
-from typeguard import typechecked
 
 from tui_labeller.interface_enum import InterfaceMode
+from tui_labeller.logging_pipeline import (
+    DEFAULT_LOG_FILENAME,
+    DEFAULT_LOG_LEVEL,
+    LOG_LEVELS,
+)
+from tui_labeller.typechecking import typechecked
 
 
 @typechecked
@@ -21,13 +26,23 @@ def create_arg_parser() -> argparse.ArgumentParser:
     )
 
     # Required args.
-    parser.add_argument(
+    image_group = parser.add_mutually_exclusive_group(required=True)
+    image_group.add_argument(
         "-i",
         "--image-path",
         type=str,
-        required=True,
         help="Path to an image.",
     )
+    image_group.add_argument(
+        "-d",
+        "--image-dir",
+        type=str,
+        help=(
+            "Directory with receipt images, labelled one after the other in"
+            " a single session. Images that already have an output json are"
+            " skipped."
+        ),
+    )
     parser.add_argument(
         "-t",
         "--tui",
@@ -64,6 +79,87 @@ def create_arg_parser() -> argparse.ArgumentParser:
             " commas (e.g., expenses:wholefoods:groceries,assets:gold)."
         ),
     )
+    parser.add_argument(
+        "--record-keys",
+        type=str,
+        default=None,
+        help=(
+            "Append the keys of the urwid session to this key script, which"
+            " can be replayed headless (see tui_labeller.headless)."
+        ),
+    )
+    parser.add_argument(
+        "--latency-hud",
+        action="store_true",
+        help="Show the p50/p95/p99 latency per key in the sidebar.",
+    )
+    parser.add_argument(
+        "--latency-report",
+        type=str,
+        default=None,
+        help=(
+            "Time each key and write the latency percentiles per question"
+            " type to this json file at exit."
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        type=str,
+        default=None,
+        help=(
+            "Sample the labelling session and write the collapsed stacks"
+            " (flamegraph format) to this file, and a summary per subsystem"
+            " to <file>.summary.txt."
+        ),
+    )
+    parser.add_argument(
+        "--profile-interval",
+        type=float,
+        default=0.005,
+        help="The sampling interval of --profile in seconds.",
+    )
+    parser.add_argument(
+        "--trace",
+        type=str,
+        default=None,
+        help=(
+            "Write the spans of the reconfiguration, receipt assembly and"
+            " result saving to this Chrome trace-event json file at exit."
+        ),
+    )
+    parser.add_argument(
+        "--memory-report",
+        type=str,
+        default=None,
+        help=(
+            "Account the memory per subsystem after each receipt, check for"
+            " leaked questionnaires and write the report with the top"
+            " allocation sites to this json file at exit (slow)."
+        ),
+    )
+    parser.add_argument(
+        "--telemetry",
+        type=str,
+        default=None,
+        help=(
+            "Append the time, keys, accepted suggestions and reversals per"
+            " question to this ndjson metrics file, rank them with: python"
+            " -m tui_labeller.telemetry <file>."
+        ),
+    )
+    parser.add_argument(
+        "--log-level",
+        type=str.upper,
+        choices=LOG_LEVELS,
+        default=DEFAULT_LOG_LEVEL,
+        help="The lowest level of the records that are written to --log-file.",
+    )
+    parser.add_argument(
+        "--log-file",
+        type=str,
+        default=DEFAULT_LOG_FILENAME,
+        help="The file the log records are written to, by a background thread.",
+    )
 
     return parser
 
@@ -115,8 +211,11 @@ def verify_args(
     # Verify output directory for jsons exist.
     assert_dir_exists(dirpath=args.output_json_dir)
 
-    # Verify the input image exists.
-    assert_file_exists(filepath=args.image_path)
+    # Verify the input image or image directory exists.
+    if args.image_dir is None:
+        assert_file_exists(filepath=args.image_path)
+    else:
+        assert_dir_exists(dirpath=args.image_dir)
 
     # Verify the chosen TUI method is supported.
     validate_tui(tui_arg=args.tui)
@@ -134,7 +233,7 @@ from typing import List, Tuple
 
 @typechecked
 def verify_account_infos(*, account_infos: str) -> set[HledgerFlowAccountInfo]:
-    hledgerFlowAccountInfos: set[HledgerFlowAccountInfo] = []
+    hledgerFlowAccountInfos: set[HledgerFlowAccountInfo] = set()
     for info in account_infos.split(","):
         parts = info.split(":")
         assert (
@@ -149,7 +248,7 @@ def verify_account_infos(*, account_infos: str) -> set[HledgerFlowAccountInfo]:
             assert all(
                 c.islower() or c == "_" for c in part
             ), "Account info can only contain lowercase letters and underscores"
-        hledgerFlowAccountInfos.append(
+        hledgerFlowAccountInfos.add(
             HledgerFlowAccountInfo(
                 account_holder=account_holder,
                 bank=bank,
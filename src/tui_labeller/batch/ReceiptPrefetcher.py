@@ -0,0 +1,143 @@
+import queue
+import threading
+from typing import List, Optional
+
+from hledger_preprocessor.receipt_transaction_matching.get_bank_data_from_transactions import (
+    HledgerFlowAccountInfo,
+)
+from hledger_preprocessor.TransactionObjects.Receipt import Receipt
+
+from tui_labeller.instrumentation.Tracer import span
+from tui_labeller.tuis.urwid.question_app.addresses.ShopCatalogue import (
+    ShopCatalogue,
+)
+from tui_labeller.tuis.urwid.receipts.AccountRegistry import AccountRegistry
+from tui_labeller.tuis.urwid.receipts.ReceiptQuestions import ReceiptQuestions
+from tui_labeller.typechecking import typechecked
+
+
+class PreparedReceipt:
+    """The work that is done ahead of time for a single receipt image."""
+
+    @typechecked
+    def __init__(
+        self,
+        *,
+        image_path: str,
+        receipt_questions: Optional[ReceiptQuestions] = None,
+        error: Optional[Exception] = None,
+    ):
+        self.image_path: str = image_path
+        self.receipt_questions: Optional[ReceiptQuestions] = receipt_questions
+        self.error: Optional[Exception] = error
+
+
+class ReceiptPrefetcher:
+    """Prepares the next receipts of a batch in a worker thread while the
+    user labels the current receipt.
+
+    The prepared receipts are handed to the UI thread through a bounded
+    queue, so at most max_prefetched receipts are prepared ahead. The
+    expensive part of a receipt is ranking the shops of the catalogue
+    for its address selector, the first ranking is built here. The shop
+    choices of a prepared receipt are refreshed when it is taken if
+    receipts were added to the shop catalogue in the meantime, which
+    only moves the shops of those receipts within the ranking.
+
+    Usage:
+        with ReceiptPrefetcher(...) as prefetcher:
+            for _ in image_paths:
+                prepared_receipt = prefetcher.get()
+    """
+
+    @typechecked
+    def __init__(
+        self,
+        *,
+        image_paths: List[str],
+        account_infos: set[HledgerFlowAccountInfo],
+        asset_accounts: set[str],
+        labelled_receipts: List[Receipt],
+        shop_catalogue: ShopCatalogue,
+        max_prefetched: int = 1,
+        account_registry: Optional[AccountRegistry] = None,
+    ):
+        if max_prefetched < 1:
+            raise ValueError(
+                f"max_prefetched should be at least 1, got:{max_prefetched}"
+            )
+        self.image_paths: List[str] = list(image_paths)
+        self.account_infos: set[HledgerFlowAccountInfo] = account_infos
+        self.asset_accounts: set[str] = asset_accounts
+        # Shared by the receipts, its indexes are built once.
+        self.account_registry: AccountRegistry = (
+            account_registry
+            if account_registry is not None
+            else AccountRegistry(
+                account_infos=account_infos, asset_accounts=asset_accounts
+            )
+        )
+        self.labelled_receipts: List[Receipt] = labelled_receipts
+        self.shop_catalogue: ShopCatalogue = shop_catalogue
+        self._queue: queue.Queue = queue.Queue(maxsize=max_prefetched)
+        self._stop_event: threading.Event = threading.Event()
+        self._thread: threading.Thread = threading.Thread(
+            target=self._prefetch, name="receipt-prefetcher", daemon=True
+        )
+
+    def __enter__(self) -> "ReceiptPrefetcher":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the worker thread, the unused prepared receipts are
+        dropped."""
+        self._stop_event.set()
+        self._thread.join()
+
+    def _prefetch(self) -> None:
+        for image_path in self.image_paths:
+            try:
+                with span("prepare_receipt", image_path=image_path):
+                    prepared_receipt = PreparedReceipt(
+                        image_path=image_path,
+                        receipt_questions=ReceiptQuestions(
+                            account_infos=self.account_infos,
+                            asset_accounts=self.asset_accounts,
+                            labelled_receipts=self.labelled_receipts,
+                            shop_catalogue=self.shop_catalogue,
+                            account_registry=self.account_registry,
+                        ),
+                    )
+            except Exception as e:  # Raised in the UI thread by get().
+                prepared_receipt = PreparedReceipt(
+                    image_path=image_path, error=e
+                )
+            # Wait for space in the queue, unless the batch is stopped.
+            while not self._stop_event.is_set():
+                try:
+                    self._queue.put(prepared_receipt, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            if self._stop_event.is_set():
+                return
+
+    @typechecked
+    def get(self) -> PreparedReceipt:
+        """Returns the next prepared receipt, waits if it is not ready yet.
+
+        Raises:
+            Exception: The error that occurred while preparing the receipt.
+        """
+        prepared_receipt: PreparedReceipt = self._queue.get()
+        if prepared_receipt.error is not None:
+            raise prepared_receipt.error
+        prepared_receipt.receipt_questions.optional_questions.refresh_shop_choices()
+        return prepared_receipt
@@ -0,0 +1,225 @@
+import os
+from typing import Callable, List, Optional
+
+import urwid
+from hledger_preprocessor.receipt_transaction_matching.get_bank_data_from_transactions import (
+    HledgerFlowAccountInfo,
+)
+from hledger_preprocessor.TransactionObjects.Receipt import Receipt
+
+from tui_labeller.batch.ReceiptPrefetcher import (
+    PreparedReceipt,
+    ReceiptPrefetcher,
+)
+from tui_labeller.headless.HeadlessDriver import HeadlessDriver
+from tui_labeller.instrumentation.KeyLatencyMonitor import KeyLatencyMonitor
+from tui_labeller.instrumentation.MemoryMonitor import MemoryMonitor
+from tui_labeller.instrumentation.Tracer import span
+from tui_labeller.results.AnswerJournal import JOURNAL_SUFFIX, AnswerJournal
+from tui_labeller.results.results_reader import read_labelled_receipts
+from tui_labeller.results.ResultsSink import ResultsSink
+from tui_labeller.telemetry.QuestionTelemetry import QuestionTelemetry
+from tui_labeller.tuis.urwid.ask_urwid_receipt import build_receipt_from_urwid
+from tui_labeller.tuis.urwid.question_app.addresses.ShopCatalogue import (
+    ShopCatalogue,
+)
+from tui_labeller.tuis.urwid.question_app.HistoryStore import (
+    HISTORY_STORE_FILENAME,
+    HistoryStore,
+)
+from tui_labeller.tuis.urwid.receipts.AccountRegistry import AccountRegistry
+from tui_labeller.typechecking import typechecked
+
+IMAGE_EXTENSIONS: List[str] = [
+    ".bmp",
+    ".gif",
+    ".jpeg",
+    ".jpg",
+    ".png",
+    ".tif",
+    ".tiff",
+    ".webp",
+]
+
+
+@typechecked
+def get_image_paths(*, image_dir: str) -> List[str]:
+    """Returns the sorted paths of the images in image_dir."""
+    return [
+        os.path.join(image_dir, filename)
+        for filename in sorted(os.listdir(image_dir))
+        if os.path.splitext(filename)[1].lower() in IMAGE_EXTENSIONS
+        and os.path.isfile(os.path.join(image_dir, filename))
+    ]
+
+
+@typechecked
+def get_output_json_path(*, output_json_dir: str, image_path: str) -> str:
+    """Returns the path of the output json of a receipt image."""
+    image_name: str = os.path.splitext(os.path.basename(image_path))[0]
+    return os.path.join(output_json_dir, f"{image_name}.json")
+
+
+@typechecked
+def get_journal_path(*, output_json_dir: str, image_path: str) -> str:
+    """Returns the path of the answer journal of a receipt image."""
+    image_name: str = os.path.splitext(os.path.basename(image_path))[0]
+    return os.path.join(output_json_dir, f"{image_name}{JOURNAL_SUFFIX}")
+
+
+@typechecked
+def get_unlabelled_image_paths(
+    *, image_paths: List[str], output_json_dir: str
+) -> List[str]:
+    """Returns the image paths that do not have an output json yet."""
+    return [
+        image_path
+        for image_path in image_paths
+        if not os.path.isfile(
+            get_output_json_path(
+                output_json_dir=output_json_dir, image_path=image_path
+            )
+        )
+    ]
+
+
+@typechecked
+def label_images(
+    *,
+    image_paths: List[str],
+    output_json_dir: str,
+    account_infos: set[HledgerFlowAccountInfo],
+    asset_accounts: set[str],
+    shop_catalogue: ShopCatalogue,
+    labelled_receipts: Optional[List[Receipt]] = None,
+    history_store: Optional[HistoryStore] = None,
+    max_prefetched: int = 1,
+    screen: Optional[urwid.display.BaseScreen] = None,
+    input_filter: Optional[Callable] = None,
+    headless_driver: Optional[HeadlessDriver] = None,
+    key_latency_monitor: Optional[KeyLatencyMonitor] = None,
+    account_registry: Optional[AccountRegistry] = None,
+) -> List[Receipt]:
+    """Label the receipt images one after the other in a single session.
+
+    The urwid screen, the history store, the labelled receipts and the
+    shop catalogue are shared between the receipts. The questions of
+    the next receipt are prepared in a background thread while the
+    current receipt is labelled. The header shows the position of the
+    receipt in the session and its image path. Each receipt is
+    written to its own output json as soon as it is labelled, and logged
+    in the results.ndjson of the output json dir. The shop catalogue is
+    saved after each receipt, like the history store, so an interrupted
+    session keeps the receipts that were completed. The answers of the current receipt are
+    journaled, so an interrupted receipt resumes with its answers.
+
+    Args:
+        image_paths: The receipt images to label, in order.
+        output_json_dir: Directory in which the receipt jsons are stored.
+        account_infos: The accounts that can pay for a receipt.
+        asset_accounts: The asset accounts/categories.
+        shop_catalogue: The catalogue of known shops.
+        labelled_receipts: The previously labelled receipts.
+        history_store: The past answers per question, by default the
+            history_store.json of the output json dir, which is seeded
+            from the labelled_receipts or the receipts in its
+            results.ndjson if it does not exist yet.
+        max_prefetched: The nr of receipts that are prepared ahead.
+        screen: The urwid screen, a raw terminal screen by default.
+        input_filter: The urwid input filter, e.g. a KeyRecorder.
+        headless_driver: Replays a key script instead of reading keys
+            from the screen.
+        key_latency_monitor: Times the keys of all receipts.
+        account_registry: Resolves the account answers of all receipts,
+            built once from the account_infos and asset_accounts by
+            default.
+
+    Returns:
+        The receipts that were labelled in this session.
+    """
+    if labelled_receipts is None:
+        labelled_receipts = []
+    if history_store is None:
+        history_store = HistoryStore(
+            filepath=os.path.join(output_json_dir, HISTORY_STORE_FILENAME),
+            labelled_receipts=labelled_receipts
+            or read_labelled_receipts(output_json_dir=output_json_dir),
+        )
+    # An invalid history or results file raises here, instead of on the
+    # first suggestion lookup in the running questionnaire.
+    history_store.load()
+    if screen is None:
+        screen = urwid.raw_display.Screen()
+
+    if account_registry is None:
+        account_registry = AccountRegistry(
+            account_infos=account_infos, asset_accounts=asset_accounts
+        )
+
+    new_receipts: List[Receipt] = []
+    with ResultsSink(output_json_dir=output_json_dir) as results_sink:
+        with ReceiptPrefetcher(
+            image_paths=image_paths,
+            account_infos=account_infos,
+            asset_accounts=asset_accounts,
+            labelled_receipts=labelled_receipts,
+            shop_catalogue=shop_catalogue,
+            max_prefetched=max_prefetched,
+            account_registry=account_registry,
+        ) as prefetcher:
+            for position, _ in enumerate(image_paths, start=1):
+                prepared_receipt: PreparedReceipt = prefetcher.get()
+                with span(
+                    "label_receipt", image_path=prepared_receipt.image_path
+                ):
+                    answer_journal = AnswerJournal(
+                        filepath=get_journal_path(
+                            output_json_dir=output_json_dir,
+                            image_path=prepared_receipt.image_path,
+                        )
+                    )
+                    if QuestionTelemetry.active is not None:
+                        QuestionTelemetry.active.start_receipt(
+                            image_path=prepared_receipt.image_path
+                        )
+                    with answer_journal:
+                        receipt: Receipt = build_receipt_from_urwid(
+                            account_infos=account_infos,
+                            asset_accounts=asset_accounts,
+                            labelled_receipts=labelled_receipts,
+                            shop_catalogue=shop_catalogue,
+                            screen=screen,
+                            history_store=history_store,
+                            receipt_questions=prepared_receipt.receipt_questions,
+                            results_sink=results_sink,
+                            answer_journal=answer_journal,
+                            input_filter=input_filter,
+                            headless_driver=headless_driver,
+                            key_latency_monitor=key_latency_monitor,
+                            account_registry=account_registry,
+                            header=(
+                                f"{position}/{len(image_paths)} "
+                                f"{prepared_receipt.image_path}"
+                            ),
+                        )
+                        if QuestionTelemetry.active is not None:
+                            QuestionTelemetry.active.end_visit()
+                        results_sink.add_receipt(
+                            receipt=receipt,
+                            image_path=prepared_receipt.image_path,
+                            output_json_path=get_output_json_path(
+                                output_json_dir=output_json_dir,
+                                image_path=prepared_receipt.image_path,
+                            ),
+                        )
+                    answer_journal.discard()
+                    shop_catalogue.save()
+                    if history_store.filepath is not None:
+                        history_store.save()
+                    labelled_receipts.append(receipt)
+                    new_receipts.append(receipt)
+                if MemoryMonitor.active is not None:
+                    MemoryMonitor.active.snapshot_receipt(
+                        image_path=prepared_receipt.image_path
+                    )
+    return new_receipts
@@ -1,3 +1,10 @@
+import json
+import os
+from dataclasses import fields, is_dataclass
+from datetime import date, datetime
+from enum import Enum
+
+
 def write_to_file(*, filename, content, append=False):
     """Write content to a file with option to append or overwrite.
 
@@ -13,3 +20,58 @@ def write_to_file(*, filename, content, append=False):
             file.writelines([str(item) + "\n" for item in content])
         else:
             file.write(str(content) + "\n")
+
+
+def to_jsonable(obj):
+    """Convert (nested) dataclasses, enums, dates and containers into json
+    serialisable objects.
+
+    Args:
+        obj: The object to convert, e.g. a Receipt.
+
+    Returns:
+        The object as dicts, lists and json primitives.
+    """
+    if obj is None or isinstance(obj, (str, int, float, bool)):
+        return obj
+    if isinstance(obj, Enum):
+        return to_jsonable(obj.value)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, dict):
+        return {str(key): to_jsonable(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return [to_jsonable(item) for item in obj]
+    if is_dataclass(obj):
+        return {
+            field.name: to_jsonable(getattr(obj, field.name))
+            for field in fields(obj)
+        }
+    if hasattr(obj, "__dict__"):
+        return {
+            key: to_jsonable(value)
+            for key, value in vars(obj).items()
+            if not key.startswith("_")
+        }
+    return str(obj)
+
+
+def write_json_file(*, filepath, content, sync=True):
+    """Write content as json, atomically replacing an existing file.
+
+    The json is written and synced to a temporary file first, so an
+    interrupted write never leaves a truncated file at filepath.
+
+    Args:
+        filepath (str): Path of the json file.
+        content: Object that is converted with to_jsonable.
+        sync (bool): If False, the file is not synced to disk, e.g. when
+            writing many generated files.
+    """
+    tmp_filepath = f"{filepath}.tmp"
+    with open(tmp_filepath, "w", encoding="utf-8") as file:
+        json.dump(to_jsonable(content), file, indent=2)
+        if sync:
+            file.flush()
+            os.fsync(file.fileno())
+    os.replace(tmp_filepath, filepath)
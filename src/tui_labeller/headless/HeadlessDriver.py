@@ -0,0 +1,52 @@
+import time
+from typing import Iterable, Iterator, List
+
+import urwid
+
+from tui_labeller.typechecking import typechecked
+
+
+class HeadlessDriver:
+    """Runs questionnaires by feeding a key script into their main loop,
+    instead of reading the keys from a terminal.
+
+    The keys go through MainLoop.process_input, so they are handled by
+    the widget keypress methods and QuestionnaireApp._handle_input like
+    typed keys, without drawing and without waiting. The script is
+    shared by all runs, so a single script can fill multiple receipts,
+    including the reconfiguration runs in between. The time each key
+    takes is stored in key_latencies.
+
+    Usage:
+        driver = HeadlessDriver(keys=read_key_script(filepath="a.keys"))
+        build_receipt_from_urwid(..., screen=HeadlessScreen(),
+                                 headless_driver=driver)
+    """
+
+    @typechecked
+    def __init__(self, *, keys: Iterable[str]):
+        self.keys: Iterator[str] = iter(keys)
+        self.key_latencies: List[float] = []
+        self.nr_of_runs: int = 0
+
+    @typechecked
+    def run(self, *, loop: urwid.MainLoop) -> None:
+        """Feed keys into the loop until the questionnaire exits.
+
+        Raises:
+            ValueError: If the key script ends before the questionnaire
+                exits.
+        """
+        self.nr_of_runs += 1
+        for key in self.keys:
+            start: float = time.perf_counter()
+            try:
+                loop.process_input([key])
+            except urwid.ExitMainLoop:
+                return
+            finally:
+                self.key_latencies.append(time.perf_counter() - start)
+        raise ValueError(
+            "The key script ended before the questionnaire exited, after"
+            f" {len(self.key_latencies)} keys."
+        )
@@ -0,0 +1,22 @@
+from typing import Tuple
+
+import urwid
+
+from tui_labeller.typechecking import typechecked
+
+
+class HeadlessScreen(urwid.display.BaseScreen):
+    """Screen of a fixed size that does not draw, for driving a
+    questionnaire without a terminal (see HeadlessDriver)."""
+
+    @typechecked
+    def __init__(self, *, cols: int = 160, rows: int = 80):
+        super().__init__()
+        self.cols: int = cols
+        self.rows: int = rows
+
+    def get_cols_rows(self) -> Tuple[int, int]:
+        return self.cols, self.rows
+
+    def draw_screen(self, size: Tuple[int, int], canvas: urwid.Canvas) -> None:
+        """Nothing is drawn."""
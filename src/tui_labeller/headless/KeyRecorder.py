@@ -0,0 +1,41 @@
+from typing import List, Tuple, Union
+
+from tui_labeller.typechecking import typechecked
+
+Key = Union[str, Tuple]
+
+
+class KeyRecorder:
+    """Records the keys of a labelling session to a key script, which can
+    be replayed with the HeadlessDriver.
+
+    The recorder is an urwid input_filter, it appends the keys and lets
+    them through unchanged. Mouse events are not recorded.
+
+    Usage:
+        with KeyRecorder(filepath="session.keys") as key_recorder:
+            label_images(..., input_filter=key_recorder)
+    """
+
+    @typechecked
+    def __init__(self, *, filepath: str):
+        self.filepath: str = filepath
+        self._file = open(filepath, "a", encoding="utf-8")
+
+    def __enter__(self) -> "KeyRecorder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __call__(self, keys: List[Key], raw: List[int]) -> List[Key]:
+        """Record the keys (not typechecked, it is called for each input)."""
+        for key in keys:
+            if isinstance(key, str) and key != "window resize":
+                self._file.write(f"{key}\n")
+        self._file.flush()
+        return keys
+
+    @typechecked
+    def close(self) -> None:
+        self._file.close()
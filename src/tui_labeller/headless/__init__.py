@@ -0,0 +1,4 @@
+"""Contains the project versioning."""
+
+__version__ = "0.0.7"
+__version_info__ = tuple(int(i) for i in __version__.split(".") if i.isdigit())
@@ -0,0 +1,33 @@
+from typing import Iterable, List
+
+from tui_labeller.typechecking import typechecked
+
+COMMENT_PREFIX: str = "# "
+
+
+@typechecked
+def read_key_script(*, filepath: str) -> List[str]:
+    """Read the keys of a key script.
+
+    A key script has one urwid key name per line, e.g. "enter", "a" or
+    "shift tab". Empty lines and lines that start with "# " are skipped.
+
+    Args:
+        filepath: The path of the key script.
+
+    Returns:
+        The keys in order.
+    """
+    with open(filepath, encoding="utf-8") as key_file:
+        return [
+            line
+            for line in (raw_line.rstrip("\n") for raw_line in key_file)
+            if line and not line.startswith(COMMENT_PREFIX)
+        ]
+
+
+@typechecked
+def write_key_script(*, filepath: str, keys: Iterable[str]) -> None:
+    """Write keys to a key script, one key per line."""
+    with open(filepath, "w", encoding="utf-8") as key_file:
+        key_file.writelines(f"{key}\n" for key in keys)
@@ -2,7 +2,7 @@ import re
 from datetime import datetime
 from typing import Union
 
-from typeguard import typechecked
+from tui_labeller.typechecking import typechecked
 
 
 @typechecked
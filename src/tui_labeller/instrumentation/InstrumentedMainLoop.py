@@ -0,0 +1,61 @@
+from typing import Callable, List, Optional
+
+import urwid
+
+from tui_labeller.instrumentation.KeyLatencyMonitor import KeyLatencyMonitor
+
+
+class InstrumentedMainLoop(urwid.MainLoop):
+    """An urwid MainLoop that reports the input handling and the render of
+    each key to a KeyLatencyMonitor, and that calls hooks around the input
+    handling, e.g. for the question telemetry.
+
+    The main loop draws the screen once the pending input is handled, so
+    a batch of keys that is read at once is timed as a single key. Unlike
+    an input_filter, the hooks also see the keys of a HeadlessDriver.
+
+    Args:
+        key_latency_monitor: Receives the timings, if any.
+        get_question_type: Returns the question type of the focused
+            question, that receives the key.
+        on_input: Is called with the keys before they are handled.
+        on_input_handled: Is called after the keys are handled and before
+            the screen is drawn, e.g. to update a HUD.
+    """
+
+    def __init__(
+        self,
+        *args,
+        key_latency_monitor: Optional[KeyLatencyMonitor],
+        get_question_type: Callable[[], str],
+        on_input: Optional[Callable[[List], None]] = None,
+        on_input_handled: Optional[Callable[[], None]] = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.key_latency_monitor: Optional[KeyLatencyMonitor] = (
+            key_latency_monitor
+        )
+        self.get_question_type: Callable[[], str] = get_question_type
+        self.on_input: Optional[Callable[[List], None]] = on_input
+        self.on_input_handled: Optional[Callable[[], None]] = on_input_handled
+
+    def process_input(self, keys) -> bool:
+        if self.on_input is not None:
+            self.on_input(keys)
+        if self.key_latency_monitor is not None:
+            self.key_latency_monitor.start_key(
+                question_type=self.get_question_type()
+            )
+        try:
+            return super().process_input(keys)
+        finally:
+            if self.key_latency_monitor is not None:
+                self.key_latency_monitor.end_input()
+            if self.on_input_handled is not None:
+                self.on_input_handled()
+
+    def draw_screen(self) -> None:
+        super().draw_screen()
+        if self.key_latency_monitor is not None:
+            self.key_latency_monitor.end_render()
@@ -0,0 +1,188 @@
+import functools
+import math
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Iterator, List, Optional
+
+from tui_labeller.file_read_write_helper import write_json_file
+from tui_labeller.typechecking import typechecked
+
+INPUT: str = "input"
+SUGGESTIONS: str = "suggestions"
+RENDER: str = "render"
+TOTAL: str = "total"
+PHASES: List[str] = [INPUT, SUGGESTIONS, RENDER, TOTAL]
+PERCENTILES: List[int] = [50, 95, 99]
+
+
+class KeyLatencyMonitor:
+    """Times each key from its input until the screen is rendered, split
+    into the input handling, the suggestion updates and the render.
+
+    The latencies are kept per question type (the class of the focused
+    widget) in a rolling window of the last window_size keys, from which
+    the p50/p95/p99 are computed. The time spent in methods decorated
+    with suggestion_phase is counted as suggestions instead of input.
+    The InstrumentedMainLoop calls start_key, end_input and end_render.
+
+    Usage:
+        key_latency_monitor = KeyLatencyMonitor(show_hud=True)
+        label_images(..., key_latency_monitor=key_latency_monitor)
+        key_latency_monitor.dump(filepath="key_latencies.json")
+    """
+
+    # The monitor of the key that is being handled, if any.
+    active: Optional["KeyLatencyMonitor"] = None
+
+    @typechecked
+    def __init__(self, *, window_size: int = 1000, show_hud: bool = False):
+        self.window_size: int = window_size
+        self.show_hud: bool = show_hud
+        self.latencies: Dict[str, Dict[str, Deque[float]]] = {}
+        self.nr_of_keys: Dict[str, int] = {}
+        self._question_type: Optional[str] = None
+        self._key_start: float = 0.0
+        self._input_end: Optional[float] = None
+        self._suggestions: float = 0.0
+        self._suggestions_depth: int = 0
+
+    def start_key(self, *, question_type: str) -> None:
+        """Start timing a key that is sent to a question of question_type.
+
+        A previous key that was not rendered (e.g. when the keys are
+        replayed headless) is stored without a render time.
+        """
+        if self._input_end is not None:
+            self._store_key(render_end=None)
+        self._question_type = question_type
+        self._suggestions = 0.0
+        self._key_start = time.perf_counter()
+        KeyLatencyMonitor.active = self
+
+    def end_input(self) -> None:
+        """Mark the key as handled by the widgets and the questionnaire."""
+        if self._question_type is not None:
+            self._input_end = time.perf_counter()
+        KeyLatencyMonitor.active = None
+
+    def end_render(self) -> None:
+        """Mark the key as rendered, which completes its latency."""
+        if self._input_end is not None:
+            self._store_key(render_end=time.perf_counter())
+
+    @contextmanager
+    def measure_suggestions(self) -> Iterator[None]:
+        """Count the time of the block as suggestion updates, nested
+        blocks are counted once."""
+        self._suggestions_depth += 1
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._suggestions_depth -= 1
+            if not self._suggestions_depth:
+                self._suggestions += time.perf_counter() - start
+
+    def _store_key(self, *, render_end: Optional[float]) -> None:
+        phase_latencies: Dict[str, Deque[float]] = self.latencies.setdefault(
+            self._question_type,
+            {phase: deque(maxlen=self.window_size) for phase in PHASES},
+        )
+        input_duration: float = self._input_end - self._key_start
+        phase_latencies[INPUT].append(input_duration - self._suggestions)
+        phase_latencies[SUGGESTIONS].append(self._suggestions)
+        if render_end is None:
+            phase_latencies[TOTAL].append(input_duration)
+        else:
+            phase_latencies[RENDER].append(render_end - self._input_end)
+            phase_latencies[TOTAL].append(render_end - self._key_start)
+        self.nr_of_keys[self._question_type] = (
+            self.nr_of_keys.get(self._question_type, 0) + 1
+        )
+        self._input_end = None
+
+    @typechecked
+    def get_percentiles(
+        self, *, question_type: str, phase: str = TOTAL
+    ) -> Dict[int, float]:
+        """Returns the p50/p95/p99 latencies in seconds of the rolling
+        window, an empty dict if no key was timed."""
+        latencies: List[float] = sorted(
+            self.latencies.get(question_type, {}).get(phase, [])
+        )
+        if not latencies:
+            return {}
+        return {
+            percentile: latencies[
+                max(0, math.ceil(percentile / 100 * len(latencies)) - 1)
+            ]
+            for percentile in PERCENTILES
+        }
+
+    @typechecked
+    def get_hud_text(self, *, question_type: str) -> str:
+        """Returns the latencies of question_type for the sidebar."""
+        lines: List[str] = [
+            f"{question_type} ({self.nr_of_keys.get(question_type, 0)} keys)",
+            f"{'ms':<12}" + "".join(f"{f'p{p}':>7}" for p in PERCENTILES),
+        ]
+        for phase in PHASES:
+            percentiles: Dict[int, float] = self.get_percentiles(
+                question_type=question_type, phase=phase
+            )
+            if percentiles:
+                lines.append(
+                    f"{phase:<12}"
+                    + "".join(
+                        f"{percentiles[p] * 1e3:>7.2f}" for p in PERCENTILES
+                    )
+                )
+        return "\n".join(lines)
+
+    @typechecked
+    def get_report(self) -> Dict:
+        """Returns the nr of keys and the percentiles in ms per question
+        type and phase."""
+        return {
+            "window_size": self.window_size,
+            "question_types": {
+                question_type: {
+                    "nr_of_keys": self.nr_of_keys.get(question_type, 0),
+                    "phases": {
+                        phase: {
+                            f"p{percentile}_ms": latency * 1e3
+                            for percentile, latency in self.get_percentiles(
+                                question_type=question_type, phase=phase
+                            ).items()
+                        }
+                        for phase in PHASES
+                    },
+                }
+                for question_type in sorted(self.latencies)
+            },
+        }
+
+    @typechecked
+    def dump(self, *, filepath: str) -> None:
+        """Write the report to a json file."""
+        if self._input_end is not None:
+            self._store_key(render_end=None)
+        write_json_file(filepath=filepath, content=self.get_report())
+
+
+def suggestion_phase(method: Callable) -> Callable:
+    """Decorator that counts the time of method as the suggestions phase of
+    the key that the active KeyLatencyMonitor is timing."""
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        key_latency_monitor: Optional[KeyLatencyMonitor] = (
+            KeyLatencyMonitor.active
+        )
+        if key_latency_monitor is None:
+            return method(*args, **kwargs)
+        with key_latency_monitor.measure_suggestions():
+            return method(*args, **kwargs)
+
+    return wrapper
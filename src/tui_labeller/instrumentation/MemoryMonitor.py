@@ -0,0 +1,205 @@
+import functools
+import gc
+import os
+import sys
+import tracemalloc
+import weakref
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import urwid
+
+from tui_labeller.file_read_write_helper import write_json_file
+from tui_labeller.instrumentation.SamplingProfiler import get_subsystem
+from tui_labeller.typechecking import typechecked
+
+# The allocations of the snapshots and of the accounting are left out.
+ACCOUNTING_MODULES: Set[str] = {"tracemalloc", __name__}
+ACCOUNTING_FILTERS: List[tracemalloc.Filter] = [
+    tracemalloc.Filter(False, tracemalloc.__file__, all_frames=True),
+    tracemalloc.Filter(False, __file__, all_frames=True),
+]
+
+
+@functools.lru_cache(maxsize=None)
+def get_module_name(*, filename: str) -> str:
+    """Returns the dotted module name of a source file, relative to the
+    longest sys.path entry that contains it (cached, it is called for
+    every frame of every allocation site)."""
+    for path in sorted(filter(None, sys.path), key=len, reverse=True):
+        if filename.startswith(os.path.join(path, "")):
+            relative_path: str = os.path.relpath(filename, path)
+            return os.path.splitext(relative_path)[0].replace(os.sep, ".")
+    return os.path.splitext(os.path.basename(filename))[0]
+
+
+class MemoryMonitor:
+    """Accounts the memory of a labelling session per receipt, to verify
+    that it stays flat over many receipts.
+
+    After each receipt the traced allocations (tracemalloc) are grouped
+    per subsystem, the same subsystems as the SamplingProfiler, and the
+    live urwid widgets are counted. The QuestionnaireApps are tracked
+    with weak references: an app of an earlier receipt that is still
+    alive after a garbage collection is a leaked widget tree. At the end
+    the largest allocation sites and the sites that grew the most since
+    the first receipt are reported.
+
+    Tracing the allocations slows the session down, so it is opt-in.
+
+    Usage:
+        memory_monitor = MemoryMonitor()
+        memory_monitor.start()
+        label_images(...)
+        memory_monitor.stop()
+        memory_monitor.write(filepath="memory.json")
+    """
+
+    # The monitor that tracks the QuestionnaireApps, if any.
+    active: Optional["MemoryMonitor"] = None
+
+    @typechecked
+    def __init__(self, *, nr_of_frames: int = 10, top_n: int = 20):
+        self.nr_of_frames: int = nr_of_frames
+        self.top_n: int = top_n
+        self.receipts: List[Dict[str, Any]] = []
+        self._apps: List[weakref.ref] = []
+        self._first_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._last_snapshot: Optional[tracemalloc.Snapshot] = None
+
+    @typechecked
+    def start(self) -> None:
+        """Start tracing the allocations and make this the active monitor."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.nr_of_frames)
+        MemoryMonitor.active = self
+
+    @typechecked
+    def stop(self) -> None:
+        if MemoryMonitor.active is self:
+            MemoryMonitor.active = None
+        tracemalloc.stop()
+
+    def track_app(self, *, app: Any) -> None:
+        """Track a QuestionnaireApp to detect if it outlives its receipt."""
+        self._apps.append(weakref.ref(app))
+
+    @typechecked
+    def snapshot_receipt(self, *, image_path: str) -> Dict[str, Any]:
+        """Account the memory after a receipt is labelled.
+
+        Returns:
+            The record of the receipt, which is also stored in receipts.
+        """
+        gc.collect()
+        # The receipts are done, so the apps that are still alive leaked.
+        self._apps = [app for app in self._apps if app() is not None]
+        snapshot: tracemalloc.Snapshot = tracemalloc.take_snapshot()
+        if self._first_snapshot is None:
+            self._first_snapshot = snapshot
+        self._last_snapshot = snapshot
+
+        subsystem_bytes: Dict[str, int] = {}
+        # The subsystem per site of this snapshot, many sites share the
+        # same files.
+        subsystems: Dict[Tuple[str, ...], Optional[str]] = {}
+        for statistic in snapshot.statistics("traceback"):
+            filenames: Tuple[str, ...] = tuple(
+                frame.filename for frame in statistic.traceback
+            )
+            if filenames not in subsystems:
+                subsystems[filenames] = get_allocation_subsystem(
+                    filenames=filenames
+                )
+            subsystem: Optional[str] = subsystems[filenames]
+            if subsystem is None:
+                continue
+            subsystem_bytes[subsystem] = (
+                subsystem_bytes.get(subsystem, 0) + statistic.size
+            )
+        current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        record: Dict[str, Any] = {
+            "image_path": image_path,
+            "traced_bytes": current_bytes,
+            "peak_bytes": peak_bytes,
+            "subsystem_bytes": subsystem_bytes,
+            # Not isinstance, it would fill the abc caches of urwid.Widget.
+            "live_widgets": sum(
+                urwid.Widget in type(obj).__mro__ for obj in gc.get_objects()
+            ),
+            "leaked_questionnaire_apps": len(self._apps),
+        }
+        self.receipts.append(record)
+        return record
+
+    @typechecked
+    def get_report(self) -> Dict[str, Any]:
+        """Returns the records per receipt, the top allocation sites and the
+        sites that grew the most since the first receipt."""
+        report: Dict[str, Any] = {"receipts": self.receipts}
+        if self._last_snapshot is None:
+            return report
+        last_snapshot: tracemalloc.Snapshot = self._last_snapshot.filter_traces(
+            ACCOUNTING_FILTERS
+        )
+        report["top_allocation_sites"] = [
+            {
+                "site": str(statistic.traceback[0]),
+                "size_bytes": statistic.size,
+                "count": statistic.count,
+            }
+            for statistic in last_snapshot.statistics("lineno")[: self.top_n]
+        ]
+        report["top_growth_sites"] = [
+            {
+                "site": str(statistic.traceback[0]),
+                "size_diff_bytes": statistic.size_diff,
+                "count_diff": statistic.count_diff,
+            }
+            for statistic in last_snapshot.compare_to(
+                self._first_snapshot.filter_traces(ACCOUNTING_FILTERS),
+                "lineno",
+            )[: self.top_n]
+        ]
+        return report
+
+    @typechecked
+    def get_summary(self) -> str:
+        """Returns the memory of the first and last receipt per subsystem."""
+        if not self.receipts:
+            return "No receipts were labelled."
+        first, last = self.receipts[0], self.receipts[-1]
+        lines: List[str] = [
+            f"{len(self.receipts)} receipts, leaked questionnaire apps:"
+            f" {last['leaked_questionnaire_apps']},"
+            f" live widgets: {first['live_widgets']} ->"
+            f" {last['live_widgets']}",
+            f"{'subsystem':<18}{'first kB':>10}{'last kB':>10}",
+        ]
+        for subsystem in sorted(
+            last["subsystem_bytes"],
+            key=last["subsystem_bytes"].get,
+            reverse=True,
+        ):
+            lines.append(
+                f"{subsystem:<18}"
+                f"{first['subsystem_bytes'].get(subsystem, 0) / 1e3:>10.1f}"
+                f"{last['subsystem_bytes'][subsystem] / 1e3:>10.1f}"
+            )
+        return "\n".join(lines)
+
+    @typechecked
+    def write(self, *, filepath: str) -> None:
+        """Write the report to a json file."""
+        write_json_file(filepath=filepath, content=self.get_report())
+
+
+def get_allocation_subsystem(*, filenames: Tuple[str, ...]) -> Optional[str]:
+    """Returns the subsystem of an allocation site, given the files of its
+    frames, None for the allocations of the accounting itself."""
+    # The frames of a tracemalloc traceback are the outermost first.
+    module_names: List[str] = [
+        get_module_name(filename=filename) for filename in reversed(filenames)
+    ]
+    if any(module_name in ACCOUNTING_MODULES for module_name in module_names):
+        return None
+    return get_subsystem(module_names=module_names)
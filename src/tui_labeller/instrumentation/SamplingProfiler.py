@@ -0,0 +1,186 @@
+import sys
+import threading
+import time
+from collections import Counter
+from types import FrameType
+from typing import Counter as CounterType
+from typing import List, Optional, Tuple
+
+from tui_labeller.typechecking import typechecked
+
+IDLE: str = "idle"
+WIDGETS: str = "widgets"
+OTHER: str = "other"
+SUMMARY_SUFFIX: str = ".summary.txt"
+# The subsystems are matched on the module names of the frames, from the
+# innermost frame outwards, so e.g. the address ranking of a
+# reconfiguration is attributed to the address ranking.
+SUBSYSTEMS: List[Tuple[str, Tuple[str, ...]]] = [
+    ("typeguard", ("typeguard",)),
+    (
+        "io",
+        (
+            "json",
+            "logging",
+            "tui_labeller.file_read_write_helper",
+            "tui_labeller.results",
+            "tui_labeller.headless.KeyRecorder",
+        ),
+    ),
+    ("address ranking", ("tui_labeller.tuis.urwid.question_app.addresses",)),
+    ("receipt assembly", ("tui_labeller.tuis.urwid.receipts",)),
+    (
+        "reconfiguration",
+        (
+            "tui_labeller.tuis.urwid.question_app.reconfiguration",
+            "tui_labeller.tuis.urwid.appending_questions",
+            "tui_labeller.tuis.urwid.removing_questions",
+            "tui_labeller.tuis.urwid.move_optionals_to_end",
+        ),
+    ),
+]
+WIDGET_MODULES: Tuple[str, ...] = ("urwid", "tui_labeller.tuis.urwid")
+# The select of the urwid event loop, that waits for the next key.
+IDLE_MODULES: Tuple[str, ...] = ("selectors",)
+
+
+def get_module_name(frame: FrameType) -> str:
+    return frame.f_globals.get("__name__", "?")
+
+
+def has_prefix(*, module_name: str, prefixes: Tuple[str, ...]) -> bool:
+    return any(
+        module_name == prefix or module_name.startswith(f"{prefix}.")
+        for prefix in prefixes
+    )
+
+
+@typechecked
+def get_subsystem(*, module_names: List[str]) -> str:
+    """Returns the subsystem of a stack.
+
+    Args:
+        module_names: The module names of the frames, innermost first.
+    """
+    if has_prefix(module_name=module_names[0], prefixes=IDLE_MODULES):
+        return IDLE
+    for module_name in module_names:
+        for subsystem, prefixes in SUBSYSTEMS:
+            if has_prefix(module_name=module_name, prefixes=prefixes):
+                return subsystem
+    if any(
+        has_prefix(module_name=module_name, prefixes=WIDGET_MODULES)
+        for module_name in module_names
+    ):
+        return WIDGETS
+    return OTHER
+
+
+class SamplingProfiler:
+    """Samples the stack of the main (UI) thread from a background thread
+    and attributes each sample to a subsystem.
+
+    Unlike a deterministic profiler it does not slow down every function
+    call, the overhead is a stack walk per interval. The stacks are
+    written in the collapsed format of flamegraph.pl/speedscope, with the
+    subsystem as the root frame, and summarised per subsystem. The
+    background threads (e.g. the ReceiptPrefetcher) are not sampled.
+
+    Usage:
+        with SamplingProfiler(interval=0.005) as sampling_profiler:
+            label_images(...)
+        sampling_profiler.write(filepath="session.collapsed")
+    """
+
+    @typechecked
+    def __init__(self, *, interval: float = 0.005):
+        self.interval: float = interval
+        self.stacks: CounterType[str] = Counter()
+        self.subsystems: CounterType[str] = Counter()
+        self.nr_of_samples: int = 0
+        self.duration: float = 0.0
+        self._thread_id: int = threading.main_thread().ident
+        self._stop: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start: float = 0.0
+
+    def __enter__(self) -> "SamplingProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    @typechecked
+    def start(self) -> None:
+        self._stop.clear()
+        self._start = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._run, name="SamplingProfiler", daemon=True
+        )
+        self._thread.start()
+
+    @typechecked
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.duration += time.perf_counter() - self._start
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame: Optional[FrameType] = sys._current_frames().get(
+                self._thread_id
+            )
+            if frame is not None:
+                self._sample(frame=frame)
+
+    def _sample(self, *, frame: FrameType) -> None:
+        module_names: List[str] = []
+        frame_names: List[str] = []
+        while frame is not None:
+            module_name: str = get_module_name(frame)
+            module_names.append(module_name)
+            frame_names.append(f"{module_name}:{frame.f_code.co_qualname}")
+            frame = frame.f_back
+        subsystem: str = get_subsystem(module_names=module_names)
+        self.stacks[";".join([subsystem] + frame_names[::-1])] += 1
+        self.subsystems[subsystem] += 1
+        self.nr_of_samples += 1
+
+    @typechecked
+    def get_summary(self) -> str:
+        """Returns a table with the samples, share and estimated time per
+        subsystem."""
+        lines: List[str] = [
+            f"{self.nr_of_samples} samples in {self.duration:.1f} s"
+            f" (interval {self.interval * 1e3:.1f} ms)",
+            f"{'subsystem':<18}{'samples':>9}{'%':>8}{'busy %':>8}{'s':>9}",
+        ]
+        nr_of_busy_samples: int = self.nr_of_samples - self.subsystems[IDLE]
+        for subsystem, nr_of_samples in self.subsystems.most_common():
+            busy_share: str = (
+                "-"
+                if subsystem == IDLE
+                else f"{100 * nr_of_samples / nr_of_busy_samples:.1f}"
+            )
+            lines.append(
+                f"{subsystem:<18}{nr_of_samples:>9}"
+                f"{100 * nr_of_samples / self.nr_of_samples:>8.1f}"
+                f"{busy_share:>8}{nr_of_samples * self.interval:>9.2f}"
+            )
+        return "\n".join(lines)
+
+    @typechecked
+    def write(self, *, filepath: str) -> None:
+        """Write the collapsed stacks to filepath, and the summary next to
+        it with the SUMMARY_SUFFIX."""
+        with open(filepath, "w", encoding="utf-8") as collapsed_file:
+            for stack, nr_of_samples in self.stacks.most_common():
+                collapsed_file.write(f"{stack} {nr_of_samples}\n")
+        with open(
+            f"{filepath}{SUMMARY_SUFFIX}", "w", encoding="utf-8"
+        ) as summary_file:
+            summary_file.write(f"{self.get_summary()}\n")
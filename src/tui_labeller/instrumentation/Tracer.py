@@ -0,0 +1,141 @@
+import functools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+from tui_labeller.file_read_write_helper import write_json_file
+from tui_labeller.typechecking import typechecked
+
+
+class Tracer:
+    """Records nested spans and exports them as Chrome trace events, which
+    can be opened offline in chrome://tracing, Perfetto or speedscope.
+
+    A span is a named, timed block with attributes (e.g. the nr of
+    questions). Spans are recorded while the tracer is the active one,
+    the span function and the traced decorator are no-ops otherwise.
+    Only the last max_events spans are kept, so a long session cannot
+    grow without bounds.
+
+    Usage:
+        tracer = Tracer()
+        tracer.start()
+        with span("get_configuration", nr_of_questions=20):
+            add_span_attributes(nr_of_account_blocks=6)
+        tracer.stop()
+        tracer.write(filepath="session.trace.json")
+    """
+
+    # The tracer that records the spans, if any.
+    active: Optional["Tracer"] = None
+
+    @typechecked
+    def __init__(self, *, max_events: int = 1_000_000):
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=max_events)
+        self.thread_names: Dict[int, str] = {}
+        self._start_ns: int = time.perf_counter_ns()
+        self._local: threading.local = threading.local()
+
+    @typechecked
+    def start(self) -> None:
+        """Make this the active tracer."""
+        Tracer.active = self
+
+    @typechecked
+    def stop(self) -> None:
+        if Tracer.active is self:
+            Tracer.active = None
+
+    def _get_open_attributes(self) -> List[Dict[str, Any]]:
+        """Returns the attributes of the open spans of the current thread,
+        innermost last."""
+        if not hasattr(self._local, "open_attributes"):
+            self._local.open_attributes = []
+        return self._local.open_attributes
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+        """Record the block as a span, yields its attributes."""
+        open_attributes: List[Dict[str, Any]] = self._get_open_attributes()
+        open_attributes.append(attributes)
+        start_ns: int = time.perf_counter_ns()
+        try:
+            yield attributes
+        finally:
+            end_ns: int = time.perf_counter_ns()
+            open_attributes.pop()
+            thread: threading.Thread = threading.current_thread()
+            self.thread_names.setdefault(thread.ident, thread.name)
+            self.events.append(
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": (start_ns - self._start_ns) / 1e3,
+                    "dur": (end_ns - start_ns) / 1e3,
+                    "pid": os.getpid(),
+                    "tid": thread.ident,
+                    "args": attributes,
+                }
+            )
+
+    @typechecked
+    def get_trace(self) -> Dict[str, Any]:
+        """Returns the spans in the Chrome trace event format."""
+        thread_name_events: List[Dict[str, Any]] = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": os.getpid(),
+                "tid": thread_id,
+                "args": {"name": thread_name},
+            }
+            for thread_id, thread_name in self.thread_names.items()
+        ]
+        return {
+            "traceEvents": thread_name_events + list(self.events),
+            "displayTimeUnit": "ms",
+        }
+
+    @typechecked
+    def write(self, *, filepath: str) -> None:
+        """Write the trace to a json file."""
+        write_json_file(filepath=filepath, content=self.get_trace())
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+    """Record the block as a span of the active tracer, if any."""
+    tracer: Optional[Tracer] = Tracer.active
+    if tracer is None:
+        yield attributes
+        return
+    with tracer.span(name, **attributes) as span_attributes:
+        yield span_attributes
+
+
+def add_span_attributes(**attributes: Any) -> None:
+    """Add attributes to the innermost open span of the current thread."""
+    tracer: Optional[Tracer] = Tracer.active
+    if tracer is None:
+        return
+    open_attributes: List[Dict[str, Any]] = tracer._get_open_attributes()
+    if open_attributes:
+        open_attributes[-1].update(attributes)
+
+
+def traced(function: Callable) -> Callable:
+    """Decorator that records each call of function as a span of the active
+    tracer, named after the function."""
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        tracer: Optional[Tracer] = Tracer.active
+        if tracer is None:
+            return function(*args, **kwargs)
+        with tracer.span(function.__qualname__):
+            return function(*args, **kwargs)
+
+    return wrapper
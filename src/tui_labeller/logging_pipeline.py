@@ -0,0 +1,72 @@
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from typing import List
+
+from tui_labeller.typechecking import typechecked
+
+LOGGER_NAME: str = "tui_labeller"
+LOG_LEVELS: List[str] = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+DEFAULT_LOG_LEVEL: str = "WARNING"
+DEFAULT_LOG_FILENAME: str = "log.txt"
+LOG_FORMAT: str = "%(asctime)s %(levelname)s %(name)s - %(message)s"
+
+
+class DeferredQueueHandler(QueueHandler):
+    """A QueueHandler that enqueues the records as they are, so the message
+    is formatted by the listener thread instead of on the keystroke path.
+
+    The arguments of a record are formatted later, when the listener
+    thread writes it. Callers must therefore only pass arguments that do
+    not change after the logging call, e.g. strings, numbers and ids. A
+    mutable argument, like a list or a widget, could be logged with its
+    state at write time instead of at the time of the call, or be read
+    while the keystroke path changes it.
+    Records with exception info are prepared as usual, because the
+    traceback has to be formatted before the frames are gone.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            return super().prepare(record)
+        return record
+
+
+@typechecked
+def configure_logging(
+    *,
+    log_level: str = DEFAULT_LOG_LEVEL,
+    log_filepath: str = DEFAULT_LOG_FILENAME,
+) -> QueueListener:
+    """Send the records of the tui_labeller loggers through a queue to a
+    background thread that writes them to log_filepath.
+
+    Logging calls below log_level return after the level check, the
+    others only enqueue the record. Nothing is written to stdout or
+    stderr, which belong to urwid while the TUI runs.
+
+    Args:
+        log_level: The lowest level that is logged, one of LOG_LEVELS.
+        log_filepath: The file the records are appended to, it is
+            created at the first record.
+
+    Returns:
+        The started listener, stop it to flush the remaining records.
+    """
+    log_queue: SimpleQueue = SimpleQueue()
+    file_handler = logging.FileHandler(
+        log_filepath, encoding="utf-8", delay=True
+    )
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    logger: logging.Logger = logging.getLogger(LOGGER_NAME)
+    for handler in list(logger.handlers):
+        if isinstance(handler, QueueHandler):
+            logger.removeHandler(handler)
+    logger.addHandler(DeferredQueueHandler(log_queue))
+    logger.setLevel(log_level)
+    logger.propagate = False
+
+    queue_listener = QueueListener(log_queue, file_handler)
+    queue_listener.start()
+    return queue_listener
@@ -0,0 +1,130 @@
+import os
+from typing import Any, Dict, Optional
+
+from tui_labeller.file_read_write_helper import to_jsonable
+from tui_labeller.results.NdjsonWriter import (
+    NdjsonWriter,
+    truncate_torn_tail,
+)
+from tui_labeller.results.results_reader import read_results
+from tui_labeller.typechecking import typechecked
+
+JOURNAL_SUFFIX: str = ".journal.ndjson"
+
+
+class JournalState:
+    """The answers and focus of a questionnaire, replayed from a journal."""
+
+    @typechecked
+    def __init__(
+        self,
+        *,
+        answers: Optional[Dict[str, Any]] = None,
+        focus_question_id: Optional[str] = None,
+    ):
+        self.answers: Dict[str, Any] = {} if answers is None else answers
+        self.focus_question_id: Optional[str] = focus_question_id
+
+
+class AnswerJournal:
+    """Write-ahead journal of the answers of a single questionnaire.
+
+    Every changed answer and focus move is appended as one json line,
+    instead of snapshotting the questionnaire, so recording an answer
+    costs a single small write. If the session is killed, the journal is
+    replayed on the next start (see resume_questionnaire) to restore the
+    answers and the focus. The journal is discarded once the receipt is
+    stored.
+
+    Records:
+        {"kind": "answer", "question_id": ..., "answer": ...}
+        {"kind": "focus", "question_id": ...}
+    A None answer means the answer was cleared.
+    """
+
+    @typechecked
+    def __init__(self, *, filepath: str, fsync_every: int = 1):
+        self.filepath: str = filepath
+        # The answer that was being written when the session was killed is
+        # lost, the journal resumes from the complete records.
+        truncate_torn_tail(filepath=filepath)
+        self.state: JournalState = (
+            read_journal(filepath=filepath)
+            if os.path.isfile(filepath)
+            else JournalState()
+        )
+        # The json answers as they are in the journal, to skip unchanged ones.
+        self.answers: Dict[str, Any] = dict(self.state.answers)
+        self.focus_question_id: Optional[str] = self.state.focus_question_id
+        self.writer: NdjsonWriter = NdjsonWriter(
+            filepath=filepath, fsync_every=fsync_every
+        )
+
+    def __enter__(self) -> "AnswerJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @typechecked
+    def record_answer(self, *, question_id: str, answer: Any) -> bool:
+        """Append the answer of a question if it changed.
+
+        Returns:
+            bool: True if the answer was appended.
+        """
+        json_answer: Any = to_jsonable(answer)
+        if self.answers.get(question_id) == json_answer:
+            return False
+        if json_answer is None:
+            self.answers.pop(question_id, None)
+        else:
+            self.answers[question_id] = json_answer
+        self.writer.write(
+            record={
+                "kind": "answer",
+                "question_id": question_id,
+                "answer": json_answer,
+            }
+        )
+        return True
+
+    @typechecked
+    def record_focus(self, *, question_id: str) -> bool:
+        """Append the focused question if the focus moved.
+
+        Returns:
+            bool: True if the focus was appended.
+        """
+        if self.focus_question_id == question_id:
+            return False
+        self.focus_question_id = question_id
+        self.writer.write(record={"kind": "focus", "question_id": question_id})
+        return True
+
+    @typechecked
+    def close(self) -> None:
+        self.writer.close()
+
+    @typechecked
+    def discard(self) -> None:
+        """Close and remove the journal, e.g. after the receipt is stored."""
+        self.close()
+        if os.path.isfile(self.filepath):
+            os.remove(self.filepath)
+
+
+@typechecked
+def read_journal(*, filepath: str) -> JournalState:
+    """Replay a journal in a single pass, the last record of a question
+    wins."""
+    state = JournalState()
+    for record in read_results(filepath=filepath):
+        if record["kind"] == "answer":
+            if record["answer"] is None:
+                state.answers.pop(record["question_id"], None)
+            else:
+                state.answers[record["question_id"]] = record["answer"]
+        elif record["kind"] == "focus":
+            state.focus_question_id = record["question_id"]
+    return state
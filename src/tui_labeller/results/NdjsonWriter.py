@@ -0,0 +1,110 @@
+import json
+import os
+from typing import Dict
+
+from tui_labeller.file_read_write_helper import to_jsonable
+from tui_labeller.typechecking import typechecked
+
+# The nr of bytes that are read at a time to find the last newline.
+TAIL_CHUNK_SIZE: int = 4096
+
+
+class NdjsonWriter:
+    """Append-only, buffered writer of newline-delimited json records.
+
+    The file is kept open, records are buffered and the file is only
+    flushed and fsynced every fsync_every records (and on close), so
+    writing a record does not cost a file open and a disk sync. A crash
+    can leave a partial last line, which read_results skips, and which
+    is truncated before the first new record is appended.
+
+    Usage:
+        with NdjsonWriter(filepath="results.ndjson") as writer:
+            writer.write(record={"some": "record"})
+    """
+
+    @typechecked
+    def __init__(
+        self,
+        *,
+        filepath: str,
+        fsync_every: int = 16,
+        buffer_size: int = 64 * 1024,
+    ):
+        if fsync_every < 1:
+            raise ValueError(
+                f"fsync_every should be at least 1, got:{fsync_every}"
+            )
+        self.filepath: str = filepath
+        self.fsync_every: int = fsync_every
+        self.buffer_size: int = buffer_size
+        self.nr_of_unsynced_records: int = 0
+        self._file = None
+
+    def __enter__(self) -> "NdjsonWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @typechecked
+    def write(self, *, record: Dict) -> None:
+        """Append a record as a single json line."""
+        if self._file is None:
+            truncate_torn_tail(filepath=self.filepath)
+            self._file = open(
+                self.filepath, "a", encoding="utf-8", buffering=self.buffer_size
+            )
+        self._file.write(
+            json.dumps(to_jsonable(record), separators=(",", ":")) + "\n"
+        )
+        self.nr_of_unsynced_records += 1
+        if self.nr_of_unsynced_records >= self.fsync_every:
+            self.flush()
+
+    @typechecked
+    def flush(self) -> None:
+        """Write the buffered records to disk."""
+        if self._file is None or not self.nr_of_unsynced_records:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.nr_of_unsynced_records = 0
+
+    @typechecked
+    def close(self) -> None:
+        """Flush the buffered records and close the file."""
+        if self._file is None:
+            return
+        self.flush()
+        self._file.close()
+        self._file = None
+
+
+@typechecked
+def truncate_torn_tail(*, filepath: str) -> int:
+    """Remove a partial last line, left by an interrupted write, so the next
+    appended record starts on a line of its own.
+
+    Only the tail of the file is read, back to its last newline.
+
+    Returns:
+        The nr of bytes that were removed.
+    """
+    if not os.path.isfile(filepath):
+        return 0
+    with open(filepath, "rb+") as ndjson_file:
+        size: int = ndjson_file.seek(0, os.SEEK_END)
+        end: int = size
+        keep: int = 0
+        while end > 0:
+            start: int = max(end - TAIL_CHUNK_SIZE, 0)
+            ndjson_file.seek(start)
+            newline: int = ndjson_file.read(end - start).rfind(b"\n")
+            if newline != -1:
+                keep = start + newline + 1
+                break
+            end = start
+        if keep < size:
+            ndjson_file.truncate(keep)
+    return size - keep
@@ -0,0 +1,63 @@
+import os
+from typing import Dict
+
+from hledger_preprocessor.TransactionObjects.Receipt import Receipt
+
+from tui_labeller.file_read_write_helper import write_json_file
+from tui_labeller.instrumentation.Tracer import traced
+from tui_labeller.results.NdjsonWriter import NdjsonWriter
+from tui_labeller.typechecking import typechecked
+
+RESULTS_FILENAME: str = "results.ndjson"
+
+
+class ResultsSink:
+    """Stores the labelling results of a session in the output json dir.
+
+    Each labelled receipt is written to its own json file (atomically),
+    and every result is appended as a record to the results.ndjson log,
+    which can be streamed with read_results:
+        {"kind": "receipt", "image_path": ..., "output_json": ...,
+         "receipt": {...}}
+        {"kind": "answers", "answers": {question_id: answer}}
+    """
+
+    @typechecked
+    def __init__(self, *, output_json_dir: str, fsync_every: int = 16):
+        self.output_json_dir: str = output_json_dir
+        self.writer: NdjsonWriter = NdjsonWriter(
+            filepath=os.path.join(output_json_dir, RESULTS_FILENAME),
+            fsync_every=fsync_every,
+        )
+
+    def __enter__(self) -> "ResultsSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @traced
+    @typechecked
+    def add_receipt(
+        self, *, receipt: Receipt, image_path: str, output_json_path: str
+    ) -> None:
+        """Write the receipt json and log it in the results."""
+        write_json_file(filepath=output_json_path, content=receipt)
+        self.writer.write(
+            record={
+                "kind": "receipt",
+                "image_path": image_path,
+                "output_json": output_json_path,
+                "receipt": receipt,
+            }
+        )
+
+    @traced
+    @typechecked
+    def add_answers(self, *, answers: Dict) -> None:
+        """Log the (partial) answers of a questionnaire."""
+        self.writer.write(record={"kind": "answers", "answers": answers})
+
+    @typechecked
+    def close(self) -> None:
+        self.writer.close()
@@ -0,0 +1,49 @@
+import json
+import os
+from typing import Dict, Iterator, Optional
+
+from tui_labeller.results.ResultsSink import RESULTS_FILENAME
+from tui_labeller.typechecking import typechecked
+
+
+@typechecked
+def read_results(
+    *, filepath: str, kind: Optional[str] = None
+) -> Iterator[Dict]:
+    """Stream the records of a results ndjson file one at a time, without
+    loading the whole file.
+
+    A partial last line, left by an interrupted write, is skipped.
+
+    Args:
+        filepath: The path of the ndjson file.
+        kind: If given, only the records of this kind are returned, e.g.
+            "receipt".
+
+    Raises:
+        ValueError: If a complete line is not valid json.
+    """
+    with open(filepath, encoding="utf-8") as results_file:
+        for line in results_file:
+            # Only the last line can miss its newline.
+            if not line.endswith("\n"):
+                return
+            if not line.strip():
+                continue
+            try:
+                record: Dict = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid results line:{line!r}") from e
+            if kind is None or record.get("kind") == kind:
+                yield record
+
+
+@typechecked
+def read_labelled_receipts(*, output_json_dir: str) -> Iterator[Dict]:
+    """Stream the (json) receipts that were labelled into output_json_dir,
+    from its results.ndjson, none if there is no results.ndjson yet."""
+    filepath: str = os.path.join(output_json_dir, RESULTS_FILENAME)
+    if not os.path.isfile(filepath):
+        return
+    for record in read_results(filepath=filepath, kind="receipt"):
+        yield record["receipt"]
@@ -0,0 +1,293 @@
+import itertools
+import os
+import random
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import (
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    TypeVar,
+)
+
+from hledger_preprocessor.Currency import Currency
+from hledger_preprocessor.receipt_transaction_matching.get_bank_data_from_transactions import (
+    HledgerFlowAccountInfo,
+)
+from hledger_preprocessor.TransactionObjects.Receipt import (
+    Account,
+    AccountTransaction,
+    Address,
+    AssetType,
+    ExchangedItem,
+    Receipt,
+    ShopId,
+)
+
+from tui_labeller.file_read_write_helper import write_json_file
+from tui_labeller.tuis.urwid.question_app.addresses.ShopCatalogue import (
+    SHOP_CATALOGUE_FILENAME,
+    ShopCatalogue,
+)
+from tui_labeller.typechecking import typechecked
+
+T = TypeVar("T")
+
+SYLLABLES: List[str] = [
+    "al", "ber", "co", "da", "el", "fa", "go", "han", "in", "jo", "ka",
+    "lo", "mar", "no", "ol", "pe", "ra", "sa", "ter", "u", "ve", "wi",
+]  # fmt: skip
+CATEGORY_GROUPS: List[str] = [
+    "groceries",
+    "transport",
+    "housing",
+    "leisure",
+    "health",
+    "clothing",
+]
+STREET_SUFFIXES: List[str] = ["straat", "weg", "laan", "plein", "singel"]
+COUNTRY: str = "Netherlands"
+
+
+class CorpusGenerator:
+    """Seeded generator of realistic labelled receipt corpora, to reproduce
+    the scaling behaviour of the labeller without sharing real receipts.
+
+    The shops, categories and accounts are drawn from a Zipf-like
+    distribution: the k-th most popular one is drawn with a weight of
+    1/k**zipf_exponent, so a few shops and categories cover most
+    receipts, like in a real bookkeeping. Every shop has a main category
+    that most of its receipts are booked in. The same seed and settings
+    always give the same corpus.
+
+    Usage:
+        corpus_generator = CorpusGenerator(seed=0, nr_of_shops=1000)
+        receipts = list(corpus_generator.generate_receipts(nr_of_receipts=10))
+    """
+
+    @typechecked
+    def __init__(
+        self,
+        *,
+        seed: int = 0,
+        nr_of_shops: int = 100,
+        nr_of_categories: int = 30,
+        nr_of_account_infos: int = 2,
+        nr_of_asset_accounts: int = 1,
+        zipf_exponent: float = 1.1,
+        main_category_probability: float = 0.9,
+        multiple_accounts_probability: float = 0.1,
+        start_date: datetime = datetime(2020, 1, 1),
+        nr_of_days: int = 3 * 365,
+    ):
+        if min(nr_of_shops, nr_of_categories, nr_of_account_infos) < 1:
+            raise ValueError(
+                "Need at least one shop, category and account info."
+            )
+        self.rng: random.Random = random.Random(seed)
+        # The cumulative Zipf weights per nr of items.
+        self._cum_weights: Dict[int, List[float]] = {}
+        self.zipf_exponent: float = zipf_exponent
+        self.main_category_probability: float = main_category_probability
+        self.multiple_accounts_probability: float = (
+            multiple_accounts_probability
+        )
+        self.start_date: datetime = start_date
+        self.nr_of_days: int = nr_of_days
+
+        self.categories: List[str] = self._get_unique_names(
+            count=nr_of_categories,
+            get_name=lambda: (
+                f"{self.rng.choice(CATEGORY_GROUPS)}:{self._get_word()}"
+            ),
+        )
+        self.account_infos: List[HledgerFlowAccountInfo] = [
+            HledgerFlowAccountInfo(
+                account_holder=f"holder{i}",
+                bank=f"bank{i % 3}",
+                account_type=("checking", "savings", "credit")[i % 3],
+            )
+            for i in range(nr_of_account_infos)
+        ]
+        self.asset_accounts: List[str] = [
+            f"assets:{name}"
+            for name in self._get_unique_names(
+                count=nr_of_asset_accounts, get_name=self._get_word
+            )
+        ]
+        # Shops of a chain share their name, so there are fewer names.
+        shop_names: List[str] = self._get_unique_names(
+            count=max(1, nr_of_shops // 2),
+            get_name=lambda: self._get_word().capitalize(),
+        )
+        cities: List[str] = self._get_unique_names(
+            count=max(1, nr_of_shops // 20),
+            get_name=lambda: self._get_word().capitalize(),
+        )
+        self.shops: List[ShopId] = [
+            ShopId(
+                name=self._draw(items=shop_names),
+                address=Address(
+                    street=(
+                        f"{self._get_word().capitalize()}"
+                        f"{self.rng.choice(STREET_SUFFIXES)}"
+                    ),
+                    house_nr=str(self.rng.randint(1, 300)),
+                    zipcode=(
+                        f"{self.rng.randint(1000, 9999)}"
+                        f"{self.rng.choice('ABCDEFGHJKLMNPRSTVWXZ')}"
+                        f"{self.rng.choice('ABCDEFGHJKLMNPRSTVWXZ')}"
+                    ),
+                    city=self._draw(items=cities),
+                    country=COUNTRY,
+                ),
+            )
+            for _ in range(nr_of_shops)
+        ]
+        self.shop_categories: List[str] = [
+            self._draw(items=self.categories) for _ in self.shops
+        ]
+
+    def _get_word(self) -> str:
+        return "".join(self.rng.choices(SYLLABLES, k=self.rng.randint(2, 3)))
+
+    def _get_unique_names(
+        self, *, count: int, get_name: Callable[[], str]
+    ) -> List[str]:
+        """Returns count unique names, numbered once the names run out."""
+        names: List[str] = []
+        seen: Set[str] = set()
+        for attempt in itertools.count():
+            if len(names) == count:
+                return names
+            name: str = get_name()
+            if attempt > 10 * count:
+                name = f"{name}{len(names)}"
+            if name not in seen:
+                seen.add(name)
+                names.append(name)
+
+    def _draw(self, *, items: Sequence[T]) -> T:
+        """Draw an item, the k-th item with weight 1/k**zipf_exponent."""
+        cum_weights: List[float] = self._get_cum_weights(size=len(items))
+        position: float = self.rng.random() * cum_weights[-1]
+        return items[bisect_left(cum_weights, position)]
+
+    def _get_cum_weights(self, *, size: int) -> List[float]:
+        if size not in self._cum_weights:
+            self._cum_weights[size] = list(
+                itertools.accumulate(
+                    1 / (k**self.zipf_exponent) for k in range(1, size + 1)
+                )
+            )
+        return self._cum_weights[size]
+
+    def _get_account(self) -> Account:
+        if self.asset_accounts and self.rng.random() < 0.05:
+            return Account(
+                asset_type=AssetType.ASSET,
+                asset_category=self.rng.choice(self.asset_accounts),
+            )
+        account_info: HledgerFlowAccountInfo = self._draw(
+            items=self.account_infos
+        )
+        return Account(
+            asset_type=AssetType.BANK,
+            account_holder=account_info.account_holder,
+            bank=account_info.bank,
+            account_type=account_info.account_type,
+        )
+
+    @typechecked
+    def generate_receipt(self) -> Receipt:
+        """Returns the next receipt of the corpus."""
+        shop_index: int = self._draw(items=range(len(self.shops)))
+        category: str = (
+            self.shop_categories[shop_index]
+            if self.rng.random() < self.main_category_probability
+            else self._draw(items=self.categories)
+        )
+        the_date: datetime = self.start_date + timedelta(
+            days=self.rng.randrange(self.nr_of_days),
+            minutes=self.rng.randrange(8 * 60, 22 * 60),
+        )
+        nr_of_accounts: int = (
+            2 if self.rng.random() < self.multiple_accounts_probability else 1
+        )
+        account_transactions: List[AccountTransaction] = [
+            AccountTransaction(
+                account=self._get_account(),
+                currency=Currency.EUR,
+                amount_paid=round(self.rng.lognormvariate(3, 1), 2),
+                change_returned=0.0,
+            )
+            for _ in range(nr_of_accounts)
+        ]
+        return Receipt(
+            shop_identifier=self.shops[shop_index],
+            net_bought_items=ExchangedItem(
+                quantity=1,
+                account_transactions=account_transactions,
+                description=category,
+                the_date=the_date,
+                tax_per_unit=0,
+                group_discount=0,
+                category=None,
+                round_amount=None,
+            ),
+            net_returned_items=None,
+            the_date=the_date,
+            subtotal=None,
+            total_tax=None,
+            receipt_owner_address=None,
+            receipt_category=category,
+        )
+
+    @typechecked
+    def generate_receipts(self, *, nr_of_receipts: int) -> Iterator[Receipt]:
+        """Yield nr_of_receipts receipts, one at a time, so large corpora
+        are not kept in memory."""
+        for _ in range(nr_of_receipts):
+            yield self.generate_receipt()
+
+
+@typechecked
+def write_corpus(
+    *,
+    receipts: Iterator[Receipt],
+    output_json_dir: str,
+    shop_catalogue_filepath: Optional[str] = None,
+) -> int:
+    """Write a corpus in the format of the --output-json-dir of the
+    labeller: a json per receipt and the shop catalogue of the receipts.
+
+    Args:
+        receipts: The receipts to write.
+        output_json_dir: The directory in which the jsons are written.
+        shop_catalogue_filepath: Where the shop catalogue is stored,
+            shop_catalogue.json in the output_json_dir by default.
+
+    Returns:
+        The nr of receipts that were written.
+    """
+    shop_catalogue = ShopCatalogue(
+        filepath=shop_catalogue_filepath
+        or os.path.join(output_json_dir, SHOP_CATALOGUE_FILENAME)
+    )
+    nr_of_receipts: int = 0
+    for receipt in receipts:
+        write_json_file(
+            filepath=os.path.join(
+                output_json_dir, f"receipt_{nr_of_receipts:07d}.json"
+            ),
+            content=receipt,
+            sync=False,
+        )
+        shop_catalogue.add_receipt(receipt=receipt)
+        nr_of_receipts += 1
+    shop_catalogue.save()
+    return nr_of_receipts
@@ -0,0 +1,62 @@
+"""Generates a synthetic labelled receipt corpus.
+
+Usage:
+    python -m tui_labeller.synthetic -o <output_json_dir> -n 100000
+"""
+
+import os
+from argparse import ArgumentParser, Namespace
+
+from tui_labeller.synthetic.CorpusGenerator import (
+    CorpusGenerator,
+    write_corpus,
+)
+
+parser = ArgumentParser(description="Generate a synthetic receipt corpus.")
+parser.add_argument(
+    "-o",
+    "--output-json-dir",
+    type=str,
+    required=True,
+    help="Where the receipt jsons and shop catalogue are written.",
+)
+parser.add_argument("-n", "--nr-of-receipts", type=int, default=1000)
+parser.add_argument("--seed", type=int, default=0)
+parser.add_argument("--nr-of-shops", type=int, default=100)
+parser.add_argument("--nr-of-categories", type=int, default=30)
+parser.add_argument("--nr-of-account-infos", type=int, default=2)
+parser.add_argument("--nr-of-asset-accounts", type=int, default=1)
+parser.add_argument(
+    "--zipf-exponent",
+    type=float,
+    default=1.1,
+    help="Popularity skew of the shops, categories and accounts.",
+)
+args: Namespace = parser.parse_args()
+
+if __name__ == "__main__":
+    os.makedirs(args.output_json_dir, exist_ok=True)
+    corpus_generator = CorpusGenerator(
+        seed=args.seed,
+        nr_of_shops=args.nr_of_shops,
+        nr_of_categories=args.nr_of_categories,
+        nr_of_account_infos=args.nr_of_account_infos,
+        nr_of_asset_accounts=args.nr_of_asset_accounts,
+        zipf_exponent=args.zipf_exponent,
+    )
+    nr_of_receipts: int = write_corpus(
+        receipts=corpus_generator.generate_receipts(
+            nr_of_receipts=args.nr_of_receipts
+        ),
+        output_json_dir=args.output_json_dir,
+    )
+    accounts: str = ",".join(
+        account_info.to_colon_separated_string()
+        for account_info in corpus_generator.account_infos
+    )
+    print(f"Wrote {nr_of_receipts} receipts to {args.output_json_dir}.")
+    print(
+        "Label with the same accounts using:"
+        f" --accounts {accounts}"
+        f" --categories {','.join(corpus_generator.asset_accounts)}"
+    )
@@ -0,0 +1,118 @@
+import time
+import uuid
+from typing import Any, Dict, Optional, Set
+
+from tui_labeller.results.NdjsonWriter import NdjsonWriter
+from tui_labeller.typechecking import typechecked
+
+VISIT_KIND: str = "question_visit"
+AI: str = "ai"
+HISTORY: str = "history"
+
+
+class QuestionTelemetry:
+    """Records how long the labeller spends on each question, to find the
+    questions that limit the labelling throughput.
+
+    A visit starts when a question gets the focus and ends when the focus
+    moves to another question, or when the receipt is done. Each visit is
+    appended as a question_visit record to an ndjson metrics file, with
+    the question_id, the dwell time, the nr of keys, the suggestion that
+    was accepted (ai or history, if any) and whether the labeller came
+    back to a question that was already visited for the receipt (a
+    reversal). Since the question_ids are unique within a questionnaire,
+    the visits of a question can be aggregated across receipts and
+    sessions with rank_questions.
+
+    The QuestionnaireApp reports the focus and keys of its main loop,
+    the questions report the accepted suggestions to the active
+    telemetry.
+
+    Usage:
+        question_telemetry = QuestionTelemetry(filepath="metrics.ndjson")
+        question_telemetry.start()
+        label_images(...)
+        question_telemetry.stop()
+    """
+
+    # The telemetry that records the questionnaires, if any.
+    active: Optional["QuestionTelemetry"] = None
+
+    @typechecked
+    def __init__(self, *, filepath: str, session_id: Optional[str] = None):
+        self.filepath: str = filepath
+        self.session_id: str = session_id or uuid.uuid4().hex
+        self.image_path: Optional[str] = None
+        self._writer: NdjsonWriter = NdjsonWriter(filepath=filepath)
+        self._visit: Optional[Dict[str, Any]] = None
+        self._visit_start: float = 0.0
+        self._visited_question_ids: Set[str] = set()
+
+    @typechecked
+    def start(self) -> None:
+        """Make this the active telemetry."""
+        QuestionTelemetry.active = self
+
+    @typechecked
+    def stop(self) -> None:
+        """End the current visit and close the metrics file."""
+        self.end_visit()
+        if QuestionTelemetry.active is self:
+            QuestionTelemetry.active = None
+        self._writer.close()
+
+    @typechecked
+    def start_receipt(self, *, image_path: Optional[str]) -> None:
+        """Attribute the next visits to the receipt of image_path."""
+        self.end_visit()
+        self.image_path = image_path
+        self._visited_question_ids = set()
+
+    def record_focus(self, *, question_id: str) -> None:
+        """Start a visit if the focus moved to another question (not
+        typechecked, it is called for each input)."""
+        if self._visit is not None and self._visit["question_id"] == (
+            question_id
+        ):
+            return
+        self.end_visit()
+        self._visit = {
+            "kind": VISIT_KIND,
+            "session_id": self.session_id,
+            "image_path": self.image_path,
+            "question_id": question_id,
+            "nr_of_keys": 0,
+            "accepted_suggestion": None,
+            "reversal": question_id in self._visited_question_ids,
+        }
+        self._visit_start = time.perf_counter()
+        self._visited_question_ids.add(question_id)
+
+    def record_keys(self, *, nr_of_keys: int) -> None:
+        """Count the keys that are sent to the visited question."""
+        if self._visit is not None:
+            self._visit["nr_of_keys"] += nr_of_keys
+
+    @typechecked
+    def record_suggestion(self, *, source: str) -> None:
+        """Mark that the answer of the visited question was taken from an
+        ai or history suggestion."""
+        if source not in (AI, HISTORY):
+            raise ValueError(f"Unexpected suggestion source:{source}")
+        if self._visit is not None:
+            self._visit["accepted_suggestion"] = source
+
+    @typechecked
+    def end_visit(self) -> None:
+        """Append the current visit, if any, to the metrics file."""
+        if self._visit is None:
+            return
+        self._visit["dwell_s"] = time.perf_counter() - self._visit_start
+        self._writer.write(record=self._visit)
+        self._visit = None
+
+
+def record_accepted_suggestion(*, source: str) -> None:
+    """Report an accepted suggestion to the active telemetry, if any."""
+    if QuestionTelemetry.active is not None:
+        QuestionTelemetry.active.record_suggestion(source=source)
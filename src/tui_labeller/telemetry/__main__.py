@@ -0,0 +1,36 @@
+"""Ranks the slowest questions of the labelling sessions in metrics files.
+
+Usage:
+    python -m tui_labeller.telemetry metrics.ndjson [...] [--top 20]
+"""
+
+from argparse import ArgumentParser, Namespace
+
+from tui_labeller.telemetry.rank_questions import (
+    SORT_KEYS,
+    format_ranking,
+    rank_questions,
+)
+
+parser = ArgumentParser(
+    description="Rank the slowest questions across labelling sessions."
+)
+parser.add_argument(
+    "filepaths",
+    nargs="+",
+    help="The metrics files written with python -m tui_labeller --telemetry.",
+)
+parser.add_argument(
+    "--sort-by", choices=SORT_KEYS, default="dwell_s_per_answer"
+)
+parser.add_argument("--top", type=int, default=20)
+args: Namespace = parser.parse_args()
+
+if __name__ == "__main__":
+    print(
+        format_ranking(
+            rows=rank_questions(filepaths=args.filepaths, sort_by=args.sort_by)[
+                : args.top
+            ]
+        )
+    )
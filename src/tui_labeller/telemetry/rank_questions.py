@@ -0,0 +1,100 @@
+from typing import Dict, List, Set, Tuple
+
+from tui_labeller.results.results_reader import read_results
+from tui_labeller.telemetry.QuestionTelemetry import AI, HISTORY, VISIT_KIND
+from tui_labeller.typechecking import typechecked
+
+SORT_KEYS: List[str] = [
+    "dwell_s_per_answer",
+    "total_dwell_s",
+    "keys_per_answer",
+    "nr_of_reversals",
+]
+
+
+@typechecked
+def rank_questions(
+    *, filepaths: List[str], sort_by: str = "dwell_s_per_answer"
+) -> List[Dict]:
+    """Aggregate the question visits of one or more metrics files per
+    question_id, slowest first.
+
+    The visits of a question for the same receipt in the same session
+    count as a single answer, so going back to a question adds to the
+    time of its answer. The files are streamed, so they can span many
+    sessions.
+
+    Args:
+        filepaths: The ndjson metrics files of QuestionTelemetry.
+        sort_by: One of SORT_KEYS, sorted from high to low.
+
+    Returns:
+        A row per question_id with the nr of answers and sessions, the
+        dwell time and keys per answer, the fraction of the answers that
+        accepted an ai or history suggestion and the nr of reversals.
+    """
+    if sort_by not in SORT_KEYS:
+        raise ValueError(f"sort_by should be one of {SORT_KEYS}, got:{sort_by}")
+    totals: Dict[str, Dict[str, float]] = {}
+    answers: Dict[str, Set[Tuple]] = {}
+    sessions: Dict[str, Set[str]] = {}
+    accepted: Dict[str, Dict[str, Set[Tuple]]] = {}
+    for filepath in filepaths:
+        for visit in read_results(filepath=filepath, kind=VISIT_KIND):
+            question_id: str = visit["question_id"]
+            answer: Tuple = (visit["session_id"], visit["image_path"])
+            total: Dict[str, float] = totals.setdefault(
+                question_id,
+                {"total_dwell_s": 0.0, "nr_of_keys": 0, "nr_of_reversals": 0},
+            )
+            total["total_dwell_s"] += visit["dwell_s"]
+            total["nr_of_keys"] += visit["nr_of_keys"]
+            total["nr_of_reversals"] += visit["reversal"]
+            answers.setdefault(question_id, set()).add(answer)
+            sessions.setdefault(question_id, set()).add(visit["session_id"])
+            if visit["accepted_suggestion"] is not None:
+                accepted.setdefault(question_id, {AI: set(), HISTORY: set()})[
+                    visit["accepted_suggestion"]
+                ].add(answer)
+
+    rows: List[Dict] = []
+    for question_id, total in totals.items():
+        nr_of_answers: int = len(answers[question_id])
+        accepted_answers: Dict[str, Set[Tuple]] = accepted.get(
+            question_id, {AI: set(), HISTORY: set()}
+        )
+        rows.append(
+            {
+                "question_id": question_id,
+                "nr_of_answers": nr_of_answers,
+                "nr_of_sessions": len(sessions[question_id]),
+                "total_dwell_s": total["total_dwell_s"],
+                "dwell_s_per_answer": total["total_dwell_s"] / nr_of_answers,
+                "keys_per_answer": total["nr_of_keys"] / nr_of_answers,
+                "ai_accepted": len(accepted_answers[AI]) / nr_of_answers,
+                "history_accepted": (
+                    len(accepted_answers[HISTORY]) / nr_of_answers
+                ),
+                "nr_of_reversals": total["nr_of_reversals"],
+            }
+        )
+    return sorted(rows, key=lambda row: row[sort_by], reverse=True)
+
+
+@typechecked
+def format_ranking(*, rows: List[Dict]) -> str:
+    """Returns the ranked questions as a table."""
+    lines: List[str] = [
+        f"{'question_id':<40}{'answers':>8}{'s/answer':>10}{'total s':>10}"
+        f"{'keys':>7}{'ai':>6}{'hist':>6}{'back':>6}"
+    ]
+    for row in rows:
+        # The question_ids can contain newlines.
+        question_id: str = " ".join(row["question_id"].split())
+        lines.append(
+            f"{question_id[:39]:<40}{row['nr_of_answers']:>8}"
+            f"{row['dwell_s_per_answer']:>10.2f}{row['total_dwell_s']:>10.1f}"
+            f"{row['keys_per_answer']:>7.1f}{row['ai_accepted']:>6.0%}"
+            f"{row['history_accepted']:>6.0%}{row['nr_of_reversals']:>6}"
+        )
+    return "\n".join(lines)
@@ -5,7 +5,6 @@ from hledger_preprocessor.TransactionObjects.Receipt import (
     ExchangedItem,
     Receipt,
 )
-from typeguard import typechecked
 
 from tui_labeller.input_parser.input_parser import (
     ask_yn_question_is_yes,
@@ -13,6 +12,7 @@ from tui_labeller.input_parser.input_parser import (
     get_float_input,
     get_input_with_az_chars_answer,
 )
+from tui_labeller.typechecking import typechecked
 
 
 @typechecked
@@ -1,15 +1,23 @@
 import logging
-import os
-from typing import Any, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 
 import urwid
 from hledger_preprocessor.TransactionObjects.Receipt import (  # For image handling
     Receipt,
 )
-from typeguard import typechecked
 from urwid import AttrMap
 
-from tui_labeller.file_read_write_helper import write_to_file
+from tui_labeller.headless.HeadlessDriver import HeadlessDriver
+from tui_labeller.instrumentation.InstrumentedMainLoop import (
+    InstrumentedMainLoop,
+)
+from tui_labeller.instrumentation.KeyLatencyMonitor import KeyLatencyMonitor
+from tui_labeller.instrumentation.MemoryMonitor import MemoryMonitor
+from tui_labeller.instrumentation.Tracer import traced
+from tui_labeller.results.AnswerJournal import AnswerJournal
+from tui_labeller.results.NdjsonWriter import NdjsonWriter
+from tui_labeller.results.ResultsSink import RESULTS_FILENAME, ResultsSink
+from tui_labeller.telemetry.QuestionTelemetry import QuestionTelemetry
 from tui_labeller.tuis.urwid.multiple_choice_question.HorizontalMultipleChoiceWidget import (
     HorizontalMultipleChoiceWidget,
 )
@@ -19,6 +27,7 @@ from tui_labeller.tuis.urwid.multiple_choice_question.VerticalMultipleChoiceWidg
 from tui_labeller.tuis.urwid.question_app.build_questionnaire import (
     build_questionnaire,
 )
+from tui_labeller.tuis.urwid.question_app.HistoryStore import HistoryStore
 from tui_labeller.tuis.urwid.question_app.palette import (
     setup_palette,
 )
@@ -27,15 +36,9 @@ from tui_labeller.tuis.urwid.question_data_classes import (
     InputValidationQuestionData,
     VerticalMultipleChoiceQuestionData,
 )
+from tui_labeller.typechecking import typechecked
 
-log_file = os.path.join(os.path.dirname(__file__), "../../../../log.txt")
-logging.basicConfig(
-    filename=log_file,
-    level=logging.INFO,
-    format="%(asctime)s - %(message)s",
-    force=True,
-)
-log = logging.info
+logger = logging.getLogger(__name__)
 
 
 class QuestionnaireApp:
@@ -50,9 +53,32 @@ class QuestionnaireApp:
             ]
         ],
         labelled_receipts: List[Receipt],
+        screen: Optional[urwid.display.BaseScreen] = None,
+        history_store: Optional[HistoryStore] = None,
+        results_sink: Optional[ResultsSink] = None,
+        answer_journal: Optional[AnswerJournal] = None,
+        input_filter: Optional[Callable] = None,
+        headless_driver: Optional[HeadlessDriver] = None,
+        key_latency_monitor: Optional[KeyLatencyMonitor] = None,
     ):
         """Initialize the questionnaire application with a list of
-        questions."""
+        questions.
+
+        The screen and history_store can be passed to share them between
+        the questionnaires of multiple receipts. The answers are saved to
+        the results_sink on quit, or to results.ndjson in the working
+        directory if there is no sink. Changed answers and focus moves
+        are appended to the answer_journal, if any, so an interrupted
+        questionnaire can be resumed. The input_filter of the main loop
+        can e.g. record the keys, and with a headless_driver the keys are
+        read from a key script instead of the terminal. The latency of each
+        key is timed by the key_latency_monitor, if any, which is shown in
+        a performance section of the sidebar if its show_hud is set. The
+        focus and keys are reported to the active QuestionTelemetry, if
+        any.
+        """
+        if MemoryMonitor.active is not None:
+            MemoryMonitor.active.track_app(app=self)
         self.indentation_spaces: int = 1
         self.descriptor_col_width: int = 20
         self.header = header
@@ -68,10 +94,20 @@ class QuestionnaireApp:
             ]
         ] = []
         self.labelled_receipts: List[Receipt] = labelled_receipts
+        self.results_sink: Optional[ResultsSink] = results_sink
+        self.answer_journal: Optional[AnswerJournal] = answer_journal
+        self.headless_driver: Optional[HeadlessDriver] = headless_driver
+        self.key_latency_monitor: Optional[KeyLatencyMonitor] = (
+            key_latency_monitor
+        )
+        self.question_telemetry: Optional[QuestionTelemetry] = (
+            QuestionTelemetry.active
+        )
         self.pile = urwid.Pile([])
-        self.history_store = (
-            {}
-        )  # New: Dictionary to store history suggestions {question_id: [suggestions]}
+        # The past answers per question_id, for the history suggestions.
+        self.history_store: HistoryStore = (
+            HistoryStore() if history_store is None else history_store
+        )
 
         # Setup UI elements
         self.ai_suggestion_box: AttrMap = urwid.AttrMap(
@@ -107,11 +143,15 @@ class QuestionnaireApp:
             ),
             "history_suggestions",
         )
+        # The message of the error display, set with set_error_text.
+        self.error_message: urwid.Text = urwid.Text(
+            ("error", f"{self.indentation_spaces*" "}None")
+        )
         self.error_display: AttrMap = urwid.AttrMap(
             urwid.Pile(
                 [
                     urwid.Text(("normal", "Input Error(s)")),
-                    urwid.Text(("error", f"{self.indentation_spaces*" "}None")),
+                    self.error_message,
                 ]
             ),
             "",
@@ -135,6 +175,9 @@ class QuestionnaireApp:
             ),
             "normal",
         )
+        self.performance_display: AttrMap = urwid.AttrMap(
+            urwid.Text(("normal", "Key latency")), "normal"
+        )
 
         # Build questionnaire
         build_questionnaire(
@@ -150,10 +193,16 @@ class QuestionnaireApp:
         )
 
         # Calculate the height for each section (4 sections + 3 dividers)
-        screen = urwid.raw_display.Screen()
-        term_width, term_height = screen.get_cols_rows()
+        self.screen: urwid.display.BaseScreen = (
+            screen or urwid.raw_display.Screen()
+        )
+        term_width, term_height = self.screen.get_cols_rows()
+        show_hud: bool = (
+            key_latency_monitor is not None and key_latency_monitor.show_hud
+        )
+        # The performance section takes two more units and a divider.
         section_height = max(
-            3, term_height // 8
+            3, term_height // (11 if show_hud else 8)
         )  # Divide by 4 for equal sections
 
         # Create the sidebar pile with four sections, each with fixed height
@@ -180,6 +229,16 @@ class QuestionnaireApp:
                 ),
             ]
         )
+        if show_hud:
+            sidebar_pile.contents.extend(
+                [
+                    (urwid.Divider("─"), ("pack", None)),
+                    (
+                        urwid.Filler(self.performance_display, valign="top"),
+                        ("given", section_height * 2),
+                    ),
+                ]
+            )
 
         # Create columns: main content (80%) and sidebar (20%)
         self.fill = urwid.Filler(self.pile, valign="top")
@@ -195,9 +254,34 @@ class QuestionnaireApp:
         )
 
         # Setup main loop
-        self.loop = urwid.MainLoop(
-            self.columns, self.palette, unhandled_input=self._handle_input
-        )
+        if key_latency_monitor is None and self.question_telemetry is None:
+            self.loop = urwid.MainLoop(
+                self.columns,
+                self.palette,
+                screen=self.screen,
+                unhandled_input=self._handle_input,
+                input_filter=input_filter,
+            )
+        else:
+            self.loop = InstrumentedMainLoop(
+                self.columns,
+                self.palette,
+                screen=self.screen,
+                unhandled_input=self._handle_input,
+                input_filter=input_filter,
+                key_latency_monitor=key_latency_monitor,
+                get_question_type=self._get_question_type,
+                on_input=(
+                    None
+                    if self.question_telemetry is None
+                    else self._record_input
+                ),
+                on_input_handled=(
+                    self._on_input_handled
+                    if show_hud or self.question_telemetry is not None
+                    else None
+                ),
+            )
 
     def _move_focus(self, current_pos: int, key: str) -> None:
         """Move focus to next/previous question with wrap-around."""
@@ -229,10 +313,9 @@ class QuestionnaireApp:
         """Handle user keyboard input."""
         current_pos: int = self.get_focus()
 
-        log(
-            f"DEBUG: QuestionnaireApp handling key={key!r},"
-            f" current_pos={current_pos}"
-        )
+        logger.debug("Handling key=%r, current_pos=%d", key, current_pos)
+        # Journal the answer before a reconfigurer or terminator exits.
+        self._journal_answer(position=current_pos)
         if key in ("enter", "down", "tab", "up"):
             if current_pos >= 0:
                 focused_widget = self.get_focus_widget()
@@ -275,17 +358,51 @@ class QuestionnaireApp:
                 ),
             ):
                 focused_widget.update_autocomplete()
+        self._journal_focus()
 
+    @traced
     def _save_results(self):
-        """Save questionnaire results before exit."""
-        results = {}
-        # for i, input_widget in enumerate(self.inputs):
-        #     results[f"question_{i}"] = input_widget.base_widget.edit_text
-        for i, input_widget in enumerate(self.inputs):
-            question_id = self.questions[i].question_id
-            results[question_id] = input_widget.base_widget.edit_text
-        write_to_file("results.txt", str(results), append=True)
+        """Save the questionnaire answers before exit."""
+        results: Dict[str, Any] = {}
+        for question_data, input_widget in zip(self.questions, self.inputs):
+            widget = input_widget.base_widget
+            results[question_data.question_id or question_data.question] = (
+                widget.get_answer() if widget.has_answer() else None
+            )
+        if self.results_sink is not None:
+            self.results_sink.add_answers(answers=results)
+        else:
+            with NdjsonWriter(filepath=RESULTS_FILENAME) as writer:
+                writer.write(record={"kind": "answers", "answers": results})
+
+    def _journal_answer(self, *, position: int) -> None:
+        """Append the answer of the question at position to the answer
+        journal if it changed."""
+        if self.answer_journal is None or not (
+            0 <= position < len(self.inputs)
+        ):
+            return
+        widget = self.inputs[position].base_widget
+        question_data = widget.question_data
+        self.answer_journal.record_answer(
+            question_id=question_data.question_id or question_data.question,
+            answer=widget.get_answer() if widget.has_answer() else None,
+        )
 
+    def _journal_focus(self) -> None:
+        """Append the focused question to the answer journal if the focus
+        moved."""
+        position: int = self.get_focus()
+        if self.answer_journal is None or not (
+            0 <= position < len(self.questions)
+        ):
+            return
+        question_data = self.questions[position]
+        self.answer_journal.record_focus(
+            question_id=question_data.question_id or question_data.question
+        )
+
+    @traced
     @typechecked
     def run(self, alternative_start_pos: Optional[int] = None) -> None:
         """Start the questionnaire application."""
@@ -302,7 +419,11 @@ class QuestionnaireApp:
                 (VerticalMultipleChoiceWidget, HorizontalMultipleChoiceWidget),
             ):
                 self.inputs[0].base_widget.initalise_autocomplete_suggestions()
-        self.loop.run()
+            self._record_focus()
+        if self.headless_driver is None:
+            self.loop.run()
+        else:
+            self.headless_driver.run(loop=self.loop)
 
     @typechecked
     def set_focus(self, target_position: int) -> None:
@@ -317,24 +438,76 @@ class QuestionnaireApp:
         current_pos = self.pile.focus_position - self.nr_of_headers
         return current_pos
 
+    @typechecked
+    def set_error_text(self, *, text: str) -> None:
+        """Show an error or notice to the user in the error display."""
+        self.error_message.set_text(("error", text))
+
     @typechecked
     def get_focus_widget(self) -> Any:
         current_pos: int = self.get_focus()
         focused_widget = self.inputs[current_pos].base_widget
         return focused_widget
 
+    def _get_question_type(self) -> str:
+        """Returns the widget class of the focused question."""
+        position: int = self.get_focus()
+        if 0 <= position < len(self.inputs):
+            return type(self.inputs[position].base_widget).__name__
+        return "header"
+
+    def _record_focus(self) -> None:
+        """Report the focused question to the question telemetry."""
+        position: int = self.get_focus()
+        if self.question_telemetry is None or not (
+            0 <= position < len(self.questions)
+        ):
+            return
+        question_data = self.questions[position]
+        self.question_telemetry.record_focus(
+            question_id=question_data.question_id or question_data.question
+        )
+
+    def _record_input(self, keys: List) -> None:
+        """Report the keys to the question telemetry, before the focused
+        question handles them."""
+        self._record_focus()
+        self.question_telemetry.record_keys(
+            nr_of_keys=sum(
+                isinstance(key, str) and key != "window resize" for key in keys
+            )
+        )
+
+    def _on_input_handled(self) -> None:
+        if self.question_telemetry is not None:
+            self._record_focus()
+        if self.key_latency_monitor is not None and (
+            self.key_latency_monitor.show_hud
+        ):
+            self._update_performance_display()
+
+    def _update_performance_display(self) -> None:
+        """Show the key latencies of the focused question type."""
+        self.performance_display.original_widget.set_text(
+            (
+                "normal",
+                self.key_latency_monitor.get_hud_text(
+                    question_type=self._get_question_type()
+                ),
+            )
+        )
+
     def _update_navigation_screen(self) -> None:
         focused_widget = self.get_focus_widget()
-        log(f"focused_widget={focused_widget}")
+        logger.debug(
+            "Focused %s at position=%d",
+            type(focused_widget).__name__,
+            self.get_focus(),
+        )
 
         if isinstance(focused_widget, VerticalMultipleChoiceWidget):
-            log("FOUND QUESTION")
-            log(
-                f"focused_widget.navigation_display={focused_widget.navigation_display}"
-            )
             if focused_widget.navigation_display:
                 updated_pile = focused_widget.navigation_display
 
                 self.navigation_display.original_widget = updated_pile
-
-                log(f"\n\nUpdated navigation_display content.")
+                logger.debug("Updated the navigation display.")
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Tuple, Union
+from typing import Callable, List, Optional, Tuple, Union
 
 import urwid
 from hledger_preprocessor.receipt_transaction_matching.get_bank_data_from_transactions import (
@@ -9,8 +9,12 @@ from hledger_preprocessor.TransactionObjects.Receipt import (  # For image handl
     ExchangedItem,
     Receipt,
 )
-from typeguard import typechecked
 
+from tui_labeller.headless.HeadlessDriver import HeadlessDriver
+from tui_labeller.instrumentation.KeyLatencyMonitor import KeyLatencyMonitor
+from tui_labeller.instrumentation.Tracer import traced
+from tui_labeller.results.AnswerJournal import AnswerJournal
+from tui_labeller.results.ResultsSink import ResultsSink
 from tui_labeller.tuis.urwid.date_question.DateTimeQuestion import (
     DateTimeQuestion,
 )
@@ -23,50 +27,100 @@ from tui_labeller.tuis.urwid.multiple_choice_question.HorizontalMultipleChoiceWi
 from tui_labeller.tuis.urwid.multiple_choice_question.VerticalMultipleChoiceWidget import (
     VerticalMultipleChoiceWidget,
 )
+from tui_labeller.tuis.urwid.question_app.addresses.ShopCatalogue import (
+    ShopCatalogue,
+)
 from tui_labeller.tuis.urwid.question_app.generator import create_questionnaire
 from tui_labeller.tuis.urwid.question_app.get_answers import (
     get_answers,
     is_terminated,
 )
+from tui_labeller.tuis.urwid.question_app.HistoryStore import HistoryStore
 from tui_labeller.tuis.urwid.question_app.reconfiguration.reconfiguration import (
     get_configuration,
 )
-from tui_labeller.tuis.urwid.receipts.AccountQuestions import AccountQuestions
-from tui_labeller.tuis.urwid.receipts.BaseQuestions import (
-    BaseQuestions,
+from tui_labeller.tuis.urwid.question_app.reconfiguration.restoring_answers import (
+    resume_questionnaire,
 )
+from tui_labeller.tuis.urwid.receipts.AccountRegistry import AccountRegistry
 from tui_labeller.tuis.urwid.receipts.create_receipt import (
     build_receipt_from_answers,
 )
-from tui_labeller.tuis.urwid.receipts.OptionalQuestions import OptionalQuestions
+from tui_labeller.tuis.urwid.receipts.ReceiptQuestions import ReceiptQuestions
+from tui_labeller.typechecking import typechecked
 
 
+@traced
 @typechecked
 def build_receipt_from_urwid(
     *,
     account_infos: set[HledgerFlowAccountInfo],
     asset_accounts: set[str],
     labelled_receipts: List[Receipt],
+    shop_catalogue: Optional[ShopCatalogue] = None,
+    screen: Optional[urwid.display.BaseScreen] = None,
+    history_store: Optional[HistoryStore] = None,
+    receipt_questions: Optional[ReceiptQuestions] = None,
+    results_sink: Optional[ResultsSink] = None,
+    answer_journal: Optional[AnswerJournal] = None,
+    input_filter: Optional[Callable] = None,
+    headless_driver: Optional[HeadlessDriver] = None,
+    key_latency_monitor: Optional[KeyLatencyMonitor] = None,
+    account_registry: Optional[AccountRegistry] = None,
+    header: str = "Answer the receipt questions.",
 ) -> Receipt:
+    """Ask the receipt questions in the urwid TUI and build the Receipt.
 
-    account_questions = AccountQuestions(
-        account_infos=list(
-            {x.to_colon_separated_string() for x in account_infos}
-        ),
-        asset_accounts=asset_accounts,
-    )
-    base_questions = BaseQuestions()
-    optional_questions = OptionalQuestions(labelled_receipts=labelled_receipts)
+    The shop catalogue is built from the labelled_receipts if it is not
+    passed, and the new receipt is added to it afterwards. Pass the same
+    screen and history_store to reuse them for the next receipt, and
+    receipt_questions to use questions that were created ahead of time.
+    The partial answers are saved to the results_sink if the user quits.
+    The answers are recorded in the answer_journal, and if the journal
+    already has answers the questionnaire resumes where it was left.
+    The input_filter and headless_driver are passed to the
+    QuestionnaireApp, e.g. to record or replay a key script, and the
+    key_latency_monitor to time the keys. The input answers of the
+    receipt are added to the history_store, if any. Pass the same
+    account_registry to share it between the receipts, the account
+    answers are resolved with the registry of the receipt_questions.
+    The header is shown above the questions, e.g. the receipt image.
+    """
+    if receipt_questions is None:
+        receipt_questions = ReceiptQuestions(
+            account_infos=account_infos,
+            asset_accounts=asset_accounts,
+            labelled_receipts=labelled_receipts,
+            shop_catalogue=shop_catalogue,
+            account_registry=account_registry,
+        )
+    account_questions = receipt_questions.account_questions
+    optional_questions = receipt_questions.optional_questions
 
     tui = create_questionnaire(
-        questions=base_questions.base_questions
-        + account_questions.account_questions
-        + optional_questions.optional_questions,
-        header="Answer the receipt questions.",
+        questions=receipt_questions.get_questions(),
+        header=header,
         labelled_receipts=labelled_receipts,
+        screen=screen,
+        history_store=history_store,
+        results_sink=results_sink,
+        answer_journal=answer_journal,
+        input_filter=input_filter,
+        headless_driver=headless_driver,
+        key_latency_monitor=key_latency_monitor,
     )
 
-    tui.run()  # Start the first run.
+    if answer_journal is not None and answer_journal.state.answers:
+        tui.run(
+            alternative_start_pos=resume_questionnaire(
+                tui=tui,
+                journal_state=answer_journal.state,
+                account_questions=account_questions,
+                optional_questions=optional_questions,
+            )
+        )
+    else:
+        tui.run()  # Start the first run.
     while True:
         if is_terminated(inputs=tui.inputs):
             final_answers: List[
@@ -81,28 +135,39 @@ def build_receipt_from_urwid(
                 ]
             ] = get_answers(inputs=tui.inputs)
 
-            return build_receipt_from_answers(
+            receipt: Receipt = build_receipt_from_answers(
                 final_answers=final_answers,
                 verbose=True,
                 account_infos=account_infos,
                 asset_accounts=asset_accounts,
+                account_registry=account_questions.account_registry,
             )
+            optional_questions.shop_catalogue.add_receipt(receipt=receipt)
+            if history_store is not None:
+                history_store.add_answers(
+                    answers={
+                        widget.question_id: answer
+                        for widget, answer in final_answers
+                        # The uses of the drill down choices rank their
+                        # levels.
+                        if isinstance(widget, InputValidationQuestion)
+                        or (
+                            isinstance(widget, VerticalMultipleChoiceWidget)
+                            and widget.question_data.drill_down
+                        )
+                    }
+                )
+            return receipt
 
         else:
             current_position: int = tui.get_focus()
+            # Reconfigures the pile and inputs in place.
             tui = get_configuration(
                 tui=tui,
                 account_questions=account_questions,
                 optional_questions=optional_questions,
-                labelled_receipts=labelled_receipts,
             )
 
-            # Update the pile based on the reconfiguration.
-            pile_contents = [(urwid.Text(tui.header), ("pack", None))]
-            for some_widget in tui.inputs:
-                pile_contents.append((some_widget, ("pack", None)))
-            tui.pile.contents = pile_contents
-
             # TODO: fix this
             tui.run(
                 alternative_start_pos=current_position + tui.nr_of_headers  # +1
@@ -2,9 +2,13 @@ from datetime import datetime
 from typing import List, Union
 
 import urwid
-from typeguard import typechecked
 from urwid.widget.pile import Pile
 
+from tui_labeller.instrumentation.KeyLatencyMonitor import suggestion_phase
+from tui_labeller.telemetry.QuestionTelemetry import (
+    AI,
+    record_accepted_suggestion,
+)
 from tui_labeller.tuis.urwid.date_question.helper import (
     update_values,
 )
@@ -16,6 +20,7 @@ from tui_labeller.tuis.urwid.question_data_classes import (
     AISuggestion,
     DateQuestionData,
 )
+from tui_labeller.typechecking import typechecked
 
 
 @typechecked
@@ -252,6 +257,7 @@ class DateTimeQuestion(urwid.Edit):
         else:
             return "previous_question"
 
+    @suggestion_phase
     def update_autocomplete(self):
         if self._in_autocomplete:  # Prevent recursion
             return
@@ -286,6 +292,7 @@ class DateTimeQuestion(urwid.Edit):
         )
         self.set_edit_text(matching_suggestions[0])
         self.set_edit_pos(len(matching_suggestions[0]) - 1)
+        record_accepted_suggestion(source=AI)
         return None
 
     def initalise_autocomplete_suggestions(self):
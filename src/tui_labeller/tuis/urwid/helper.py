@@ -1,11 +1,10 @@
 from typing import List, Union
 
-from typeguard import typechecked
-
 from tui_labeller.tuis.urwid.question_data_classes import (
     AISuggestion,
     HistorySuggestion,
 )
+from tui_labeller.typechecking import typechecked
 
 
 @typechecked
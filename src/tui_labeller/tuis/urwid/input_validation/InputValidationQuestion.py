@@ -1,17 +1,35 @@
+import logging
 import re
-from typing import Dict, List, Optional, Union
+from typing import List, Optional, Set, Tuple, Union
 
 import urwid
-from typeguard import typechecked
 
-from tui_labeller.tuis.urwid.helper import get_matching_unique_suggestions
-from tui_labeller.tuis.urwid.input_validation.autocomplete_filtering import (
-    get_filtered_suggestions,
+from tui_labeller.instrumentation.KeyLatencyMonitor import suggestion_phase
+from tui_labeller.telemetry.QuestionTelemetry import (
+    AI,
+    HISTORY,
+    record_accepted_suggestion,
 )
 from tui_labeller.tuis.urwid.input_validation.InputType import InputType
+from tui_labeller.tuis.urwid.input_validation.SuggestionIndex import (
+    SuggestionIndex,
+)
+from tui_labeller.tuis.urwid.question_app.CategoryTree import CategoryTree
+from tui_labeller.tuis.urwid.question_app.HistoryStore import (
+    HistoryStore,
+    get_frequency_rank,
+)
 from tui_labeller.tuis.urwid.question_data_classes import (
     InputValidationQuestionData,
 )
+from tui_labeller.typechecking import typechecked
+
+logger = logging.getLogger(__name__)
+
+# The nr of suggestions that is shown in a suggestion box.
+MAX_SHOWN_SUGGESTIONS: int = 10
+# Marks the suggestions that only match the input with a typo.
+FUZZY_MARKER: str = "~"
 
 
 class InputValidationQuestion(urwid.Edit):
@@ -22,7 +40,7 @@ class InputValidationQuestion(urwid.Edit):
         # ans_required: bool,
         # ai_suggestions=None,
         # history_suggestions=None,
-        history_store: Dict,
+        history_store: HistoryStore,
         ai_suggestion_box=None,
         history_suggestion_box=None,
         pile=None,
@@ -38,9 +56,21 @@ class InputValidationQuestion(urwid.Edit):
         self.pile = pile
         self._in_autocomplete: bool = False
         self.question_id = (
-            question_id or question_data.question
+            question_id or question_data.question_id or question_data.question
         )  # TODO: improve naming.
-        self.history_store = history_store
+        self.history_store: HistoryStore = history_store
+        # Built once, queried on every keystroke.
+        self.ai_suggestion_index: SuggestionIndex = SuggestionIndex(
+            [suggestion.question for suggestion in self.ai_suggestions],
+            scores=[
+                suggestion.probability for suggestion in self.ai_suggestions
+            ],
+        )
+        self.history_suggestion_index: SuggestionIndex = SuggestionIndex()
+        self._history_revision: Optional[int] = None
+        # The segments of the suggested categories, for LETTERS_SEMICOLON.
+        self.category_tree: Optional[CategoryTree] = None
+        self._category_tree_revision: Optional[int] = None
 
     # def valid_char(self, ch):
     #     return len(ch) == 1 and (ch.isalpha() or ch in [":", "*"])
@@ -126,34 +156,61 @@ class InputValidationQuestion(urwid.Edit):
         """Overrides the internal/urwid pip package method "keypress" to map
         incoming keys into separate behaviour."""
         if key == "meta u":
-            matching_suggestions: List[str] = get_matching_unique_suggestions(
-                suggestions=self.ai_suggestions,
-                current_text=self.get_edit_text(),
-                cursor_pos=self.edit_pos,
+            suggestions, fuzzy_suggestions = self._get_ranked_suggestions(
+                suggestion_index=self.ai_suggestion_index,
+                input_text=self._get_text_to_match(),
+                k=1,
             )
+            matching_suggestions: List[str] = suggestions + fuzzy_suggestions
             if len(matching_suggestions) >= 1:
                 self.apply_suggestion(matching_suggestions=matching_suggestions)
+                record_accepted_suggestion(source=AI)
                 return self.safely_go_to_next_question()
         if key == "ctrl u":
-            matching_suggestions: List[str] = get_matching_unique_suggestions(
-                suggestions=self.history_suggestions,
-                current_text=self.get_edit_text(),
-                cursor_pos=self.edit_pos,
+            self._sync_history_suggestion_index()
+            suggestions, fuzzy_suggestions = self._get_ranked_suggestions(
+                suggestion_index=self.history_suggestion_index,
+                input_text=self._get_text_to_match(),
+                k=1,
             )
+            matching_suggestions: List[str] = suggestions + fuzzy_suggestions
             if len(matching_suggestions) >= 1:
                 self.apply_suggestion(matching_suggestions=matching_suggestions)
+                record_accepted_suggestion(source=HISTORY)
                 return self.safely_go_to_next_question()
 
         if key == "tab":
-            matching_suggestions: List[str] = get_matching_unique_suggestions(
-                suggestions=self.ai_suggestions + self.history_suggestions,
-                current_text=self.get_edit_text(),
-                cursor_pos=self.edit_pos,
+            # Two matches are enough to know whether there is one.
+            self._sync_history_suggestion_index()
+            ai_matches: List[str] = (
+                self.ai_suggestion_index.get_top_suggestions(
+                    input_text=self._get_text_to_match(), k=2
+                )
+            )
+            matching_suggestions: List[str] = list(
+                dict.fromkeys(
+                    ai_matches
+                    + self.history_suggestion_index.get_top_suggestions(
+                        input_text=self._get_text_to_match(), k=2
+                    )
+                )
             )
             if len(matching_suggestions) == 1:
 
                 self.apply_suggestion(matching_suggestions=matching_suggestions)
+                record_accepted_suggestion(source=AI if ai_matches else HISTORY)
                 return self.safely_go_to_next_question()
+            if self.input_type == InputType.LETTERS_SEMICOLON:
+                # Complete the current segment of the category instead.
+                completed_text: (
+                    str
+                ) = self._get_category_tree().complete_segment(
+                    text=self.get_edit_text()
+                )
+                if completed_text != self.get_edit_text():
+                    self._apply_autocomplete(completed_text)
+                    self.update_autocomplete()
+                return None
         if key == "home":
             if self.edit_pos == 0:
                 # Home at start of question moves to previous question.
@@ -190,16 +247,20 @@ class InputValidationQuestion(urwid.Edit):
         pattern = self.edit_text.lower().replace("*", ".*")
         return bool(re.match(f"^{pattern}$", suggestion.lower()))
 
+    @suggestion_phase
     def update_autocomplete(self):
         if self._in_autocomplete:  # Prevent recursion
             raise NotImplementedError("Prevented recursion.")
 
         # See if flag can be deleted.
         self._in_autocomplete = True  # Set flag
-        self._update_ai_suggestions()
-        self._update_history_suggestions()
+        ai_suggestions = self._update_ai_suggestions() or []
+        history_suggestions = self._update_history_suggestions() or []
 
-        self._handle_autocomplete()
+        self._handle_autocomplete(
+            ai_suggestions=ai_suggestions,
+            history_suggestions=history_suggestions,
+        )
         self._in_autocomplete = False  # Reset flag
 
     def _update_ai_suggestions(self):
@@ -207,60 +268,128 @@ class InputValidationQuestion(urwid.Edit):
         if not self.ai_suggestion_box or not self.ai_suggestions:
             return
 
-        ai_remaining_suggestions = get_filtered_suggestions(
-            input_text=self.edit_text,
-            available_suggestions=list(
-                map(lambda x: x.question, self.ai_suggestions)
-            ),
+        ai_remaining_suggestions, fuzzy_suggestions = (
+            self._get_ranked_suggestions(
+                suggestion_index=self.ai_suggestion_index,
+                input_text=self.edit_text,
+                k=MAX_SHOWN_SUGGESTIONS,
+            )
+        )
+        ai_suggestions_text = get_suggestions_text(
+            suggestions=ai_remaining_suggestions,
+            fuzzy_suggestions=fuzzy_suggestions,
         )
-        ai_suggestions_text = ", ".join(ai_remaining_suggestions)
         self._set_suggestion_text(self.ai_suggestion_box, ai_suggestions_text)
         return ai_remaining_suggestions
 
     def _update_history_suggestions(self):
         """Update the history suggestion box with filtered suggestions."""
         if not self.history_suggestion_box:
-            self._set_suggestion_text(self.history_suggestion_box, "")
             return []
 
-        # history_remaining_suggestions = get_filtered_suggestions(
-        #     input_text=self.edit_text,
-        #     available_suggestions=list(
-        #         map(lambda x: x.question, self.history_suggestions)
-        #     ),
-        # )
-
-        # history_suggestions_text = ", ".join(history_remaining_suggestions)
-        # self._set_suggestion_text(
-        #     self.history_suggestion_box, history_suggestions_text
-        # )
-        # return history_remaining_suggestions
-
-        # Fetch suggestions from global history_store
-        history_remaining_suggestions = get_filtered_suggestions(
-            input_text=self.edit_text,
-            available_suggestions=self.history_store.get(
-                self.question_data.question_id, []
-            ),
+        self._sync_history_suggestion_index()
+        history_remaining_suggestions, fuzzy_suggestions = (
+            self._get_ranked_suggestions(
+                suggestion_index=self.history_suggestion_index,
+                input_text=self.edit_text,
+                k=MAX_SHOWN_SUGGESTIONS,
+            )
+        )
+        history_suggestions_text = get_suggestions_text(
+            suggestions=history_remaining_suggestions,
+            fuzzy_suggestions=fuzzy_suggestions,
         )
-        history_suggestions_text = ", ".join(history_remaining_suggestions)
         self._set_suggestion_text(
             self.history_suggestion_box, history_suggestions_text
         )
         return history_remaining_suggestions
 
+    def _sync_history_suggestion_index(self) -> None:
+        """Rebuild the history index if the history_store changed.
+
+        The answers of the history_store are scored by their rank, the
+        history suggestions of the question rank below them by their
+        frequency.
+        """
+        if self._history_revision == self.history_store.revision:
+            return
+        scored_suggestions: List[Tuple[str, float]] = (
+            self.history_store.get_scored_suggestions(
+                question_id=self.question_id
+            )
+        )
+        stored: Set[str] = {answer for answer, _ in scored_suggestions}
+        scored_suggestions.extend(
+            (
+                suggestion.question,
+                get_frequency_rank(frequency=suggestion.frequency),
+            )
+            for suggestion in self.history_suggestions
+            if suggestion.question not in stored
+        )
+        self.history_suggestion_index = SuggestionIndex(
+            [answer for answer, _ in scored_suggestions],
+            scores=[score for _, score in scored_suggestions],
+        )
+        self._history_revision = self.history_store.revision
+
+    def _get_ranked_suggestions(
+        self, *, suggestion_index: SuggestionIndex, input_text: str, k: int
+    ) -> Tuple[List[str], List[str]]:
+        """Returns the top k suggestions that match input_text, and if there
+        are fewer than k, the closest suggestions that match it with a
+        typo to fill up to k."""
+        suggestions: List[str] = suggestion_index.get_top_suggestions(
+            input_text=input_text, k=k
+        )
+        if len(suggestions) >= k:
+            return suggestions, []
+        return suggestions, suggestion_index.get_fuzzy_suggestions(
+            input_text=input_text, k=k - len(suggestions)
+        )
+
+    def _get_category_tree(self) -> CategoryTree:
+        """Returns the tree of the AI and history suggestions, with the uses
+        of the history suggestions, rebuilt if the history_store
+        changed."""
+        if (
+            self.category_tree is None
+            or self._category_tree_revision != self.history_store.revision
+        ):
+            self.category_tree = CategoryTree(
+                categories=[
+                    suggestion.question for suggestion in self.ai_suggestions
+                ]
+            )
+            for suggestion in self.history_suggestions + (
+                self.history_store.get_history_suggestions(
+                    question_id=self.question_id
+                )
+            ):
+                self.category_tree.add(
+                    category=suggestion.question, count=suggestion.frequency
+                )
+            self._category_tree_revision = self.history_store.revision
+        return self.category_tree
+
+    def _get_text_to_match(self) -> str:
+        """Returns the text up to and including the cursor position, that
+        the accepted suggestions should match."""
+        return self.get_edit_text()[: self.edit_pos + 1]
+
     def _set_suggestion_text(self, suggestion_box, text):
         """Set text in a suggestion box and invalidate it."""
         suggestion_box.base_widget.set_text(text)
         suggestion_box.base_widget._invalidate()
 
-    def _handle_autocomplete(self):
-        """Handle wildcard-based autocompletion."""
+    def _handle_autocomplete(
+        self, *, ai_suggestions: List[str], history_suggestions: List[str]
+    ):
+        """Handle wildcard-based autocompletion with the suggestions that
+        were filtered for the current input."""
         if "*" not in self.edit_text:
             self.owner.set_attr_map({None: "normal"})
             return
-        ai_suggestions = self._update_ai_suggestions() or []
-        history_suggestions = self._update_history_suggestions() or []
 
         if len(ai_suggestions) == 1:
             self._apply_autocomplete(ai_suggestions[0])
@@ -295,10 +424,6 @@ class InputValidationQuestion(urwid.Edit):
             ValueError: If the input cannot be converted to the specified type or is empty when required
         """
         current_text = self.get_edit_text().strip()
-        print(
-            f"current_text={current_text}END"
-            f' on:{self.question_data.question.replace("\n","")}END'
-        )
 
         # Check if answer is required but empty
         if self.question_data.ans_required and not current_text:
@@ -344,15 +469,10 @@ class InputValidationQuestion(urwid.Edit):
 
         try:
             self.get_answer()
-            print(
-                f'question={self.question_data.question.replace("\n","")}END'
-                " has YES answer"
-            )
             return True
         except ValueError:
-            print(
-                f'question={self.question_data.question.replace("\n","")} NO'
-                " answer"
+            logger.debug(
+                "No answer for question_id=%r", self.question_data.question_id
             )
             return False
 
@@ -404,27 +524,25 @@ class InputValidationQuestion(urwid.Edit):
         else:
             raise ValueError(f"Unknown input_type: {self.input_type}")
 
-        # Set the text and update autocomplete
+        # Set the text and update autocomplete. The set_answer restores
+        # answers, they are added to the history_store once the receipt
+        # is done, so they are counted once.
         self.set_edit_text(str(value))
         self.update_autocomplete()
 
-        # Store answer in history_store
-        question_id = self.question_id
-        if question_id not in self.history_store:
-            self.history_store[question_id] = []
-        if str(value) not in self.history_store[question_id]:
-            self.history_store[question_id].append(str(value))
-
-        # Update address history if this is the categories question
-        if "\nBookkeeping expense category:" in question_id.lower():
-            address_question_id = None
-            for q in self.questions:
-                if "address" in q.question_id.lower():
-                    address_question_id = q.question_id
-                    break
-            if address_question_id and str(value) not in self.history_store.get(
-                address_question_id, []
-            ):
-                self.history_store.setdefault(address_question_id, []).append(
-                    str(value)
-                )
+
+def get_suggestions_text(
+    *, suggestions: List[str], fuzzy_suggestions: List[str]
+) -> str:
+    """Returns the text of a suggestion box, the fuzzy suggestions marked
+    with the FUZZY_MARKER after the exact ones."""
+    return (
+        ", ".join(
+            suggestions
+            + [
+                f"{FUZZY_MARKER}{suggestion}"
+                for suggestion in fuzzy_suggestions
+            ]
+        )
+        or "-"
+    )
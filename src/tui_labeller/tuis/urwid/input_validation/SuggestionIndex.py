@@ -0,0 +1,364 @@
+import heapq
+import time
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from tui_labeller.typechecking import typechecked
+
+# Sorts after any character that can follow a prefix in a lowercased key.
+_MAX_CHAR: str = "\U0010ffff"
+NGRAM_SIZE: int = 3
+# Prefix ranges up to this size are checked directly, without n-grams.
+MAX_SCAN_SIZE: int = 2000
+# The time a fuzzy lookup may take per keystroke, in seconds.
+FUZZY_TIME_BUDGET: float = 0.02
+
+
+class SuggestionIndex:
+    """Index over the suggestions of a single source (e.g. the history of one
+    question) that answers the get_filtered_suggestions queries without
+    scanning all suggestions.
+
+    The lowercased suggestions are kept in a sorted array, so a prefix
+    is a bisect range. The wildcard parts (after a "*") can be anywhere
+    in a suggestion, those are narrowed with an n-gram index before the
+    remaining candidates are checked. get_filtered_suggestions returns
+    the matches in the order in which the suggestions were added, like
+    the get_filtered_suggestions function. get_top_suggestions only
+    returns the k highest scored matches, e.g. the most probable AI
+    suggestions or the highest ranked history answers.
+    """
+
+    @typechecked
+    def __init__(
+        self,
+        suggestions: Optional[Iterable[str]] = None,
+        scores: Optional[Iterable[float]] = None,
+    ):
+        self._reset()
+        if suggestions is not None:
+            self.extend(suggestions=suggestions, scores=scores)
+
+    def __len__(self) -> int:
+        return len(self.suggestions)
+
+    def _reset(self) -> None:
+        self.suggestions: List[str] = []
+        self.scores: List[float] = []
+        self._lowered: List[str] = []
+        # Sorted (lowercased suggestion, position) pairs.
+        self._sorted: List[Tuple[str, int]] = []
+        # The n-grams are only indexed when a wildcard query needs them.
+        self._ngrams: Dict[str, Set[int]] = {}
+        self._nr_ngram_indexed: int = 0
+        # Prefix and bisect range of the last query, a longer prefix is
+        # searched within that range.
+        self._last_prefix: Optional[str] = None
+        self._last_range: Tuple[int, int] = (0, 0)
+
+    @typechecked
+    def add(self, *, suggestion: str, score: float = 0.0) -> None:
+        """Add a suggestion to the index."""
+        insort(self._sorted, self._append(suggestion=suggestion, score=score))
+        self._last_prefix = None
+
+    @typechecked
+    def extend(
+        self,
+        *,
+        suggestions: Iterable[str],
+        scores: Optional[Iterable[float]] = None,
+    ) -> None:
+        """Add multiple suggestions (with a score of 0 by default) to the
+        index, sorting once."""
+        suggestions = list(suggestions)
+        self._sorted.extend(
+            self._append(suggestion=suggestion, score=score)
+            for suggestion, score in zip(
+                suggestions,
+                [0.0] * len(suggestions) if scores is None else scores,
+                strict=True,
+            )
+        )
+        self._sorted.sort()
+        self._last_prefix = None
+
+    def _append(self, *, suggestion: str, score: float) -> Tuple[str, int]:
+        """Store a suggestion, returns its sort entry."""
+        position: int = len(self.suggestions)
+        lowered: str = suggestion.lower()
+        self.suggestions.append(suggestion)
+        self.scores.append(score)
+        self._lowered.append(lowered)
+        return (lowered, position)
+
+    def _update_ngrams(self) -> None:
+        """Index the n-grams of the suggestions that were added since the
+        last wildcard query."""
+        for position in range(self._nr_ngram_indexed, len(self._lowered)):
+            for ngram in get_ngrams(text=self._lowered[position]):
+                self._ngrams.setdefault(ngram, set()).add(position)
+        self._nr_ngram_indexed = len(self._lowered)
+
+    @typechecked
+    def sync(self, *, suggestions: List[str]) -> None:
+        """Update the index to the suggestions of an append-only list.
+
+        Only the new tail of the list is added. If the list does not
+        start with the indexed suggestions, the index is rebuilt.
+        """
+        nr_indexed: int = len(self.suggestions)
+        if len(suggestions) < nr_indexed or (
+            nr_indexed and suggestions[nr_indexed - 1] != self.suggestions[-1]
+        ):
+            self._reset()
+            nr_indexed = 0
+        if len(suggestions) > nr_indexed:
+            self.extend(suggestions=suggestions[nr_indexed:])
+
+    @typechecked
+    def get_filtered_suggestions(self, *, input_text: str) -> List[str]:
+        """Returns the same suggestions as get_filtered_suggestions.
+
+        Args:
+            input_text: The text entered by user, can include '*' as
+                wildcard.
+
+        Returns:
+            The matching suggestions in insertion order, or ["-"] if
+            there are none.
+        """
+        positions: List[int] = self._get_matching_positions(
+            input_text=input_text
+        )
+        positions.sort()
+        filtered: List[str] = [self.suggestions[i] for i in positions]
+        return filtered if filtered else ["-"]
+
+    @typechecked
+    def get_top_suggestions(self, *, input_text: str, k: int) -> List[str]:
+        """Returns the k highest scored distinct suggestions that match
+        input_text, equal scores in insertion order.
+
+        A suggestion that was added more than once counts once, with its
+        best rank, so k is not filled up by copies. The matches are
+        selected with a bounded heap of size k, so the work after the
+        lookup is O(matches * log(k)) and the result stays small however
+        many suggestions match.
+
+        Args:
+            input_text: The text entered by user, can include '*' as
+                wildcard.
+            k: The maximum nr of suggestions to return.
+
+        Returns:
+            The top matching suggestions, an empty list if there are none.
+        """
+        # The best rank per distinct suggestion.
+        ranks: Dict[str, Tuple[float, int]] = {}
+        for position in self._get_matching_positions(input_text=input_text):
+            suggestion: str = self.suggestions[position]
+            rank: Tuple[float, int] = (-self.scores[position], position)
+            if suggestion not in ranks or rank < ranks[suggestion]:
+                ranks[suggestion] = rank
+        return heapq.nsmallest(k, ranks, key=ranks.__getitem__)
+
+    @typechecked
+    def get_fuzzy_suggestions(
+        self,
+        *,
+        input_text: str,
+        k: int,
+        max_distance: Optional[int] = None,
+        time_budget: float = FUZZY_TIME_BUDGET,
+    ) -> List[str]:
+        """Returns the k closest suggestions that start with a typo of
+        input_text, i.e. that do not match it exactly.
+
+        The distance of a suggestion is the smallest edit distance
+        between input_text and a prefix of the (lowercased) suggestion.
+        The sorted array is walked as a trie: the edit distance rows of a
+        prefix are shared by all keys that start with it, and all keys of
+        a prefix are skipped once its row exceeds max_distance. The walk
+        stops after time_budget, with the matches found so far, to keep
+        the lookup interactive for large histories.
+
+        Args:
+            input_text: The text entered by user, inputs with a '*'
+                wildcard are not matched fuzzily.
+            k: The maximum nr of suggestions to return.
+            max_distance: The maximum nr of edits, by default based on
+                the length of input_text (see get_max_distance).
+            time_budget: The maximum duration of the lookup, in seconds.
+
+        Returns:
+            The fuzzy matches, the closest and highest scored first.
+        """
+        query: str = input_text.strip().lower()
+        if "*" in query:
+            return []
+        if max_distance is None:
+            max_distance = get_max_distance(query=query)
+        if max_distance < 1 or k < 1:
+            return []
+
+        deadline: float = time.perf_counter() + time_budget
+        # The edit distance rows of the prefixes of the previous key, and
+        # the smallest distance of the query to any of those prefixes.
+        rows: List[List[int]] = [list(range(len(query) + 1))]
+        closest: List[int] = [len(query)]
+        previous_key: str = ""
+        # A bounded heap of the k best matches, the worst on top.
+        matches: List[Tuple[int, float, int]] = []
+        i: int = 0
+        while i < len(self._sorted):
+            if not i % 256 and time.perf_counter() > deadline:
+                break
+            key, position = self._sorted[i]
+            depth: int = 0
+            max_depth: int = min(len(rows) - 1, len(key), len(previous_key))
+            while depth < max_depth and key[depth] == previous_key[depth]:
+                depth += 1
+            del rows[depth + 1 :]
+            del closest[depth + 1 :]
+            previous_key = key
+            pruned: bool = False
+            for char in key[depth:]:
+                row: List[int] = get_next_row(
+                    query=query, row=rows[-1], char=char
+                )
+                rows.append(row)
+                closest.append(min(closest[-1], row[-1]))
+                if min(row) > max_distance:
+                    pruned = True
+                    break
+            end: int = i + 1
+            if pruned:
+                # Longer prefixes can not get closer, so all keys that start
+                # with this prefix have the same distance.
+                end = bisect_left(
+                    self._sorted, (key[: len(rows) - 1] + _MAX_CHAR,), end
+                )
+            if 0 < closest[-1] <= max_distance:
+                for _, match_position in self._sorted[i:end]:
+                    heapq.heappush(
+                        matches,
+                        (
+                            -closest[-1],
+                            self.scores[match_position],
+                            -match_position,
+                        ),
+                    )
+                    if len(matches) > k:
+                        heapq.heappop(matches)
+            i = end
+        return [
+            self.suggestions[-negated_position]
+            for _, _, negated_position in sorted(matches, reverse=True)
+        ]
+
+    def _get_matching_positions(self, *, input_text: str) -> List[int]:
+        """Returns the positions of the suggestions that match input_text,
+        in no particular order."""
+        input_text = input_text.strip()
+        if not input_text or input_text == "*":
+            return list(range(len(self.suggestions)))
+
+        parts: List[str] = input_text.lower().split("*")
+        start, end = self._get_prefix_range(prefix=parts[0])
+        wildcard_parts: List[str] = [part for part in parts[1:] if part]
+        if not wildcard_parts:
+            return [position for _, position in self._sorted[start:end]]
+        return self._get_wildcard_positions(
+            prefix=parts[0],
+            start=start,
+            end=end,
+            wildcard_parts=wildcard_parts,
+        )
+
+    def _get_prefix_range(self, *, prefix: str) -> Tuple[int, int]:
+        """Returns the range in the sorted array of the keys that start with
+        prefix."""
+        if self._last_prefix is not None and prefix.startswith(
+            self._last_prefix
+        ):
+            lo, hi = self._last_range
+        else:
+            lo, hi = 0, len(self._sorted)
+        start: int = bisect_left(self._sorted, (prefix,), lo, hi)
+        end: int = bisect_left(self._sorted, (prefix + _MAX_CHAR,), start, hi)
+        self._last_prefix = prefix
+        self._last_range = (start, end)
+        return start, end
+
+    def _get_wildcard_positions(
+        self, *, prefix: str, start: int, end: int, wildcard_parts: List[str]
+    ) -> List[int]:
+        """Returns the positions in the prefix range that contain all
+        wildcard parts."""
+        candidates: Optional[Set[int]] = None
+        if end - start > MAX_SCAN_SIZE:
+            self._update_ngrams()
+            for part in wildcard_parts:
+                for ngram in get_ngrams(text=part):
+                    postings: Set[int] = self._ngrams.get(ngram, set())
+                    candidates = (
+                        postings
+                        if candidates is None
+                        else candidates & postings
+                    )
+                    if not candidates:
+                        return []
+
+        if candidates is None or len(candidates) > end - start:
+            # Small prefix range, or wildcard parts too short for an n-gram
+            # lookup: check the prefix range directly.
+            positions = [position for _, position in self._sorted[start:end]]
+        else:
+            positions = [
+                position
+                for position in candidates
+                if self._lowered[position].startswith(prefix)
+            ]
+        return [
+            position
+            for position in positions
+            if all(part in self._lowered[position] for part in wildcard_parts)
+        ]
+
+
+def get_ngrams(*, text: str) -> Set[str]:
+    """Returns the n-grams of a (lowercased) text.
+
+    Not typechecked, it is called for every indexed suggestion.
+    """
+    return {text[i : i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+def get_max_distance(*, query: str) -> int:
+    """Returns the nr of typos that are tolerated in a query: none in very
+    short queries, which would match nearly everything, one up to 7
+    characters and two in longer queries."""
+    if len(query) < 4:
+        return 0
+    if len(query) < 8:
+        return 1
+    return 2
+
+
+def get_next_row(*, query: str, row: List[int], char: str) -> List[int]:
+    """Returns the edit distances of the prefixes of query to a text, given
+    the distances (row) to the text without its last character char.
+
+    Not typechecked, it is called for every visited prefix.
+    """
+    next_row: List[int] = [row[0] + 1]
+    for j, query_char in enumerate(query):
+        next_row.append(
+            min(
+                row[j + 1] + 1,
+                next_row[j] + 1,
+                row[j] + (query_char != char),
+            )
+        )
+    return next_row
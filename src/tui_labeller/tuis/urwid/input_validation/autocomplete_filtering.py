@@ -1,6 +1,6 @@
 from typing import List
 
-from typeguard import typechecked
+from tui_labeller.typechecking import typechecked
 
 
 @typechecked
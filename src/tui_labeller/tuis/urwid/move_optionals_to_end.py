@@ -1,7 +1,6 @@
 from typing import List, Union
 
 import urwid
-from typeguard import typechecked
 
 from tui_labeller.tuis.urwid.question_data_classes import (
     DateQuestionData,
@@ -10,6 +9,7 @@ from tui_labeller.tuis.urwid.question_data_classes import (
     VerticalMultipleChoiceQuestionData,
 )
 from tui_labeller.tuis.urwid.QuestionnaireApp import QuestionnaireApp
+from tui_labeller.typechecking import typechecked
 
 
 @typechecked
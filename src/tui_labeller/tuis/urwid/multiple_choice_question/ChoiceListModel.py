@@ -0,0 +1,150 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from tui_labeller.tuis.urwid.question_data_classes import (
+    AISuggestion,
+    VerticalMultipleChoiceQuestionData,
+)
+from tui_labeller.typechecking import typechecked
+
+
+class ChoiceListModel:
+    """Renders the captions of a vertical multiple choice question.
+
+    Only the visible batch of choices is rendered. The AI suggestion per
+    choice is a dict lookup, and the rendered batch captions, the
+    length of the longest choice and the choice indices are cached, so
+    paging and typing cost O(batch) instead of O(choices x suggestions).
+
+    The model belongs to one list of choices, create a new one when the
+    choices (or AI suggestions) of the question are replaced.
+    """
+
+    @typechecked
+    def __init__(
+        self,
+        *,
+        vc_question_data: VerticalMultipleChoiceQuestionData,
+        indentation: int,
+    ):
+        self.question_data: VerticalMultipleChoiceQuestionData = (
+            vc_question_data
+        )
+        self.indentation: int = indentation
+        # Kept to detect that the question data got new choices.
+        self.choices: Sequence[str] = vc_question_data.choices
+        self.ai_suggestions: List[AISuggestion] = (
+            vc_question_data.ai_suggestions
+        )
+        self.suggestion_texts: Dict[str, str] = get_suggestion_texts(
+            ai_suggestions=self.ai_suggestions
+        )
+        self._max_choice_length: Optional[int] = None
+        self._choice_indices: Optional[Dict[str, int]] = None
+        self._batch_captions: Dict[Tuple[int, Optional[int]], str] = {}
+
+    @typechecked
+    def is_stale(self) -> bool:
+        """Returns True if the choices or AI suggestions of the question were
+        replaced after this model was created."""
+        return (
+            self.choices is not self.question_data.choices
+            or self.ai_suggestions is not self.question_data.ai_suggestions
+        )
+
+    @typechecked
+    def get_max_choice_length(self) -> int:
+        """Returns the length of the longest choice."""
+        if self._max_choice_length is None:
+            self._max_choice_length = max(
+                (len(choice) for choice in self.choices), default=0
+            )
+        return self._max_choice_length
+
+    @typechecked
+    def get_choice_index(self, *, choice: str) -> int:
+        """Returns the index of the first occurrence of a choice.
+
+        Raises:
+            ValueError: If the choice is not in the choices.
+        """
+        if self._choice_indices is None:
+            self._choice_indices = {}
+            for index, some_choice in enumerate(self.choices):
+                self._choice_indices.setdefault(some_choice, index)
+        if choice not in self._choice_indices:
+            raise ValueError(f"'{choice}' is not in the choices.")
+        return self._choice_indices[choice]
+
+    @typechecked
+    def get_batch_caption(
+        self, *, batch_start: int = 0, batch_size: Optional[int] = None
+    ) -> str:
+        """Returns the question with the choices of a single batch."""
+        batch_key: Tuple[int, Optional[int]] = (batch_start, batch_size)
+        if batch_key not in self._batch_captions:
+            self._batch_captions[batch_key] = self._render_batch(
+                batch_start=batch_start, batch_size=batch_size
+            )
+        return self._batch_captions[batch_key]
+
+    def _render_batch(
+        self, *, batch_start: int, batch_size: Optional[int]
+    ) -> str:
+        # If batch_size is None, show all choices from batch_start
+        choices: Sequence[str] = (
+            self.choices[batch_start : batch_start + batch_size]
+            if batch_size
+            else self.choices[batch_start:]
+        )
+        max_choice_length: int = max(
+            (len(choice) for choice in choices), default=0
+        )
+        result: List[str] = [self.question_data.question]
+        for i, choice in enumerate(choices):
+            result.append(
+                self._render_line(
+                    index=batch_start + i,
+                    choice=choice,
+                    max_choice_length=max_choice_length,
+                )
+            )
+        options_text: str = "\n".join(result)
+        # Ensure the output is clean ASCII to avoid encoding issues
+        options_text = options_text.encode("ascii", errors="ignore").decode(
+            "ascii"
+        )
+        return f"\n{options_text}\n"
+
+    @typechecked
+    def get_selected_caption(self, *, selected_index: int) -> str:
+        """Returns the question with only the selected choice."""
+        selected_line: str = self._render_line(
+            index=selected_index,
+            choice=self.choices[selected_index],
+            max_choice_length=self.get_max_choice_length(),
+        )
+        return f"{self.question_data.question}\n{selected_line}\n"
+
+    def _render_line(
+        self, *, index: int, choice: str, max_choice_length: int
+    ) -> str:
+        # Use fixed-width spacing instead of tabs for consistent rendering
+        suggestion_text: str = self.suggestion_texts.get(choice, "")
+        return (
+            f"{' ' * self.indentation}{index} {choice:<{max_choice_length}} "
+            f" {suggestion_text}"
+        )
+
+
+@typechecked
+def get_suggestion_texts(
+    *, ai_suggestions: List[AISuggestion]
+) -> Dict[str, str]:
+    """Returns the rendered AI suggestion per choice, if a choice has
+    multiple suggestions the last one is shown."""
+    return {
+        suggestion.question: (
+            f"{suggestion.probability:.2f} {suggestion.ai_suggestions}"
+        )
+        for suggestion in ai_suggestions
+    }
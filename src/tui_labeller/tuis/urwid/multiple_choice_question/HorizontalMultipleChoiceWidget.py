@@ -1,12 +1,12 @@
 from typing import List, Union
 
 import urwid
-from typeguard import typechecked
 
 from tui_labeller.tuis.urwid.question_data_classes import (
     AISuggestion,
     HorizontalMultipleChoiceQuestionData,
 )
+from tui_labeller.typechecking import typechecked
 
 
 @typechecked
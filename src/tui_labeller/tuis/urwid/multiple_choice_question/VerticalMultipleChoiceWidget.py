@@ -1,18 +1,22 @@
-from typing import List, Union
+from typing import List, Optional, Sequence, Union
 
 import urwid
-from typeguard import typechecked
 from urwid import AttrMap
 
 from tui_labeller.tuis.urwid.helper import get_matching_unique_suggestions
 from tui_labeller.tuis.urwid.input_validation.InputType import InputType
-from tui_labeller.tuis.urwid.multiple_choice_question.helper import (
-    get_selected_caption,
-    get_vc_question,
+from tui_labeller.tuis.urwid.multiple_choice_question.ChoiceListModel import (
+    ChoiceListModel,
 )
+from tui_labeller.tuis.urwid.question_app.CategoryTree import (
+    SEPARATOR,
+    CategoryTree,
+)
+from tui_labeller.tuis.urwid.question_app.HistoryStore import HistoryStore
 from tui_labeller.tuis.urwid.question_data_classes import (
     VerticalMultipleChoiceQuestionData,
 )
+from tui_labeller.typechecking import typechecked
 
 
 class VerticalMultipleChoiceWidget(urwid.Edit):
@@ -27,10 +31,25 @@ class VerticalMultipleChoiceWidget(urwid.Edit):
         ai_suggestion_box=None,
         history_suggestion_box=None,
         pile=None,
+        history_store: Optional[HistoryStore] = None,
     ):
         self.indentation: int = 1
         self.current_batch: int = 0
         self.question_data: VerticalMultipleChoiceQuestionData = question_data
+        self.question_id: str = (
+            question_data.question_id or question_data.question
+        )
+        self.choice_list_model: ChoiceListModel = ChoiceListModel(
+            vc_question_data=question_data, indentation=self.indentation
+        )
+        self.history_store: Optional[HistoryStore] = history_store
+        # The drill down state: the level that is shown, and whether a
+        # choice was selected (the edit text is then its index in the
+        # choices, instead of the index in the level).
+        self.category_tree: Optional[CategoryTree] = None
+        self.category_tree_choices: Optional[Sequence[str]] = None
+        self.drill_path: str = ""
+        self.drill_selected: bool = False
         super().__init__(caption=self._get_batch_caption())
         self.input_type: InputType = InputType.INTEGER
         self.ai_suggestions = ai_suggestions or []
@@ -47,18 +66,104 @@ class VerticalMultipleChoiceWidget(urwid.Edit):
             self.navigation_display: Union[None, AttrMap] = None
 
     @typechecked
-    def _get_batch_choices(self) -> List[str]:
+    def _get_batch_choices(self) -> Sequence[str]:
         """Returns the choices for the current batch."""
         start = self.current_batch * self.BATCH_SIZE
         end = start + self.BATCH_SIZE
         return self.question_data.choices[start:end]
 
+    @typechecked
+    def _get_choice_list_model(self) -> ChoiceListModel:
+        """Returns the caption model, rebuilt if the choices were
+        replaced."""
+        if self.choice_list_model.is_stale():
+            self.choice_list_model = ChoiceListModel(
+                vc_question_data=self.question_data,
+                indentation=self.indentation,
+            )
+        return self.choice_list_model
+
+    @typechecked
+    def is_drill_down(self) -> bool:
+        """Returns True if the choices are chosen level by level, which is
+        only done if they do not fit in a single batch."""
+        return self.question_data.drill_down and (
+            len(self.question_data.choices) > self.BATCH_SIZE
+        )
+
+    @typechecked
+    def _get_category_tree(self) -> CategoryTree:
+        """Returns the tree of the choices, with the uses of the choices in
+        the history_store, rebuilt if the choices were replaced."""
+        if (
+            self.category_tree is None
+            or self.category_tree_choices is not self.question_data.choices
+        ):
+            self.category_tree_choices = self.question_data.choices
+            self.category_tree = CategoryTree(
+                categories=self.question_data.choices
+            )
+            if self.history_store is not None:
+                choices = set(self.question_data.choices)
+                for suggestion in self.history_store.get_history_suggestions(
+                    question_id=self.question_id
+                ):
+                    if suggestion.question in choices:
+                        self.category_tree.add(
+                            category=suggestion.question,
+                            count=suggestion.frequency,
+                        )
+        return self.category_tree
+
+    @typechecked
+    def _get_level_choices(self) -> List[str]:
+        """Returns the choices of the drill down level: the level itself if
+        it is a choice, followed by its children, the most used first."""
+        category_tree: CategoryTree = self._get_category_tree()
+        level_choices: List[str] = []
+        if self.drill_path and category_tree.is_category(path=self.drill_path):
+            level_choices.append(self.drill_path)
+        return level_choices + category_tree.get_children(path=self.drill_path)
+
+    @typechecked
+    def _get_nr_of_choices(self) -> int:
+        """Returns the nr of choices that are paged through in batches."""
+        if self.is_drill_down():
+            return len(self._get_level_choices())
+        return len(self.question_data.choices)
+
+    @typechecked
+    def _get_level_caption(self) -> str:
+        """Returns the caption for the current batch of the drill down
+        level. Choices with choices below them end with a colon, the level
+        itself is shown as a dot."""
+        category_tree: CategoryTree = self._get_category_tree()
+        batch_start: int = self.current_batch * self.BATCH_SIZE
+        lines: List[str] = [
+            self.question_data.question,
+            f"{' ' * self.indentation}{self.drill_path or SEPARATOR}",
+        ]
+        for index, choice in enumerate(
+            self._get_level_choices()[
+                batch_start : batch_start + self.BATCH_SIZE
+            ],
+            start=batch_start,
+        ):
+            if choice == self.drill_path:
+                name: str = "."
+            else:
+                name = choice.rpartition(SEPARATOR)[2]
+                if category_tree.has_children(path=choice):
+                    name += SEPARATOR
+            lines.append(f"{' ' * (self.indentation + 1)}{index} {name}")
+        return "\n{}\n".format("\n".join(lines))
+
     @typechecked
     def _get_batch_caption(self) -> str:
         """Returns the caption for the current batch of choices."""
-        return get_vc_question(
-            vc_question_data=self.question_data,
-            indentation=self.indentation,
+        if self.is_drill_down() and not self.drill_selected:
+            return self._get_level_caption()
+        return self._get_choice_list_model().get_batch_caption(
             batch_start=self.current_batch * self.BATCH_SIZE,
             batch_size=self.BATCH_SIZE,
         )
@@ -66,10 +171,8 @@ class VerticalMultipleChoiceWidget(urwid.Edit):
     @typechecked
     def _get_batch_selected_caption(self, selected_index: int) -> str:
         """Returns the caption for the selected choice in the current batch."""
-        return get_selected_caption(
-            vc_question_data=self.question_data,
-            selected_index=selected_index,
-            indentation=self.indentation,
+        return self._get_choice_list_model().get_selected_caption(
+            selected_index=selected_index
         )
 
     @typechecked
@@ -160,9 +263,10 @@ class VerticalMultipleChoiceWidget(urwid.Edit):
         Returns:
             bool: True if navigation was successful, False otherwise.
         """
-        max_batch = (len(self.question_data.choices) - 1) // self.BATCH_SIZE
+        max_batch = (self._get_nr_of_choices() - 1) // self.BATCH_SIZE
         if self.current_batch < max_batch:
             self.current_batch += 1
+            self.drill_selected = False
             self.set_caption(self._get_batch_caption())
             self.set_edit_text("")  # Clear input for new batch
             return True
@@ -177,6 +281,7 @@ class VerticalMultipleChoiceWidget(urwid.Edit):
         """
         if self.current_batch > 0:
             self.current_batch -= 1
+            self.drill_selected = False
             self.set_caption(self._get_batch_caption())
             self.set_edit_text("")  # Clear input for new batch
             return True
@@ -186,6 +291,15 @@ class VerticalMultipleChoiceWidget(urwid.Edit):
     def keypress(self, size, key):
         """Overrides the internal/urwid pip package method "keypress" to map
         incoming keys into separate behaviour."""
+        if self.is_drill_down():
+            if key in ("delete", "backspace", "enter") or self.valid_char(
+                ch=key
+            ):
+                return self._drill_down_keypress(size=size, key=key)
+            if not self.drill_selected:
+                # The typed digits are not an answer, they index the level.
+                self.set_edit_text("")
+
         if key == "tab":
             matching_suggestions: List[str] = get_matching_unique_suggestions(
                 suggestions=self.ai_suggestions + self.history_suggestions,
@@ -284,13 +398,94 @@ class VerticalMultipleChoiceWidget(urwid.Edit):
 
         return None
 
+    @typechecked
+    def _drill_down_keypress(self, *, size, key: str) -> Union[str, None]:
+        """Handles the digits, enter and backspace in drill down mode.
+
+        A typed number selects a choice of the level, as soon as no other
+        choice of the batch starts with it. If the choice has choices
+        below it, its level is shown, otherwise it is the answer.
+        Backspace on an empty input goes back up a level. Once a choice is
+        selected, enter moves on and backspace or a digit chooses again.
+        """
+        if self.drill_selected:
+            if key == "enter":
+                return self.safely_go_to_next_question()
+            # Choose again, from the top level.
+            self.drill_selected = False
+            self.drill_path = ""
+            self.current_batch = 0
+            self.set_edit_text("")
+            self.set_caption(self._get_batch_caption())
+            if not self.valid_char(ch=key):
+                return None
+
+        if key in ("delete", "backspace"):
+            if self.edit_text:
+                super().keypress(size, key)
+            elif self.drill_path:
+                self.drill_path = self.drill_path.rpartition(SEPARATOR)[0]
+                self.current_batch = 0
+            self.set_caption(self._get_batch_caption())
+            return None
+
+        if key == "enter":
+            if self.edit_text:
+                return self._choose_level_choice(index=int(self.edit_text))
+            return None
+
+        new_text: str = self.edit_text + key
+        batch_start: int = self.current_batch * self.BATCH_SIZE
+        batch_end: int = min(
+            batch_start + self.BATCH_SIZE, self._get_nr_of_choices()
+        )
+        if not any(
+            str(index).startswith(new_text)
+            for index in range(batch_start, batch_end)
+        ):
+            return None
+        self.set_edit_text(new_text)
+        self.set_edit_pos(len(new_text))
+        if any(
+            str(index).startswith(new_text) and str(index) != new_text
+            for index in range(batch_start, batch_end)
+        ):
+            # Wait for the next digit.
+            return None
+        return self._choose_level_choice(index=int(new_text))
+
+    @typechecked
+    def _choose_level_choice(self, *, index: int) -> Union[str, None]:
+        """Shows the level of the choice at index of the drill down level,
+        or selects it as answer if there are no choices below it."""
+        level_choices: List[str] = self._get_level_choices()
+        if not 0 <= index < len(level_choices):
+            return None
+        choice: str = level_choices[index]
+        self.set_edit_text("")
+        if choice != self.drill_path and self._get_category_tree().has_children(
+            path=choice
+        ):
+            self.drill_path = choice
+            self.current_batch = 0
+            self.set_caption(self._get_batch_caption())
+            return None
+
+        self._get_category_tree().record_use(category=choice)
+        self.drill_selected = True
+        self.set_edit_text(
+            str(self._get_choice_list_model().get_choice_index(choice=choice))
+        )
+        self.set_edit_pos(len(self.edit_text))
+        return self.safely_go_to_next_question()
+
     @typechecked
     def is_valid_batch_choice(
         self,
         value: int,
         batch_start: int,
         batch_end: int,
-        batch_choices: List[str],
+        batch_choices: Sequence[str],
     ) -> bool:
         # Check if value is within the valid range
         # if not (batch_start <= value <= batch_end):
@@ -361,6 +556,8 @@ class VerticalMultipleChoiceWidget(urwid.Edit):
         """
         if not self.get_edit_text():  # Check if edit text is empty
             return False
+        if self.is_drill_down() and not self.drill_selected:
+            return False
         try:
             self.get_answer()
             return True
@@ -384,14 +581,16 @@ class VerticalMultipleChoiceWidget(urwid.Edit):
             ValueError: If the value is not a valid choice or index, or if the type is incorrect.
         """
         if isinstance(value, str):
-            # Check if the string is a valid choice
-            if value not in self.question_data.choices:
+            # Find the index of the choice.
+            try:
+                index = self._get_choice_list_model().get_choice_index(
+                    choice=value
+                )
+            except ValueError:
                 raise ValueError(
                     f"Value '{value}' is not a valid choice in"
                     f" {self.question_data.choices}"
                 )
-            # Find the index of the choice.
-            index = self.question_data.choices.index(value)
             self.current_batch = index // self.BATCH_SIZE  # Set correct batch
             self.set_edit_text(str(index))
         elif isinstance(value, int):
@@ -405,6 +604,10 @@ class VerticalMultipleChoiceWidget(urwid.Edit):
             self.set_edit_text(str(value))
         else:
             raise ValueError(f"Expected str or int, got {type(value)}")
+        if self.is_drill_down():
+            self.current_batch = 0
+            self.drill_path = ""
+            self.drill_selected = True
 
         # Update the caption to reflect the selected choice
         self.set_caption(
@@ -436,15 +639,23 @@ class VerticalMultipleChoiceWidget(urwid.Edit):
         max_batch = (len(self.question_data.choices) - 1) // self.BATCH_SIZE
         if self.current_batch > max_batch:
             self.current_batch = max_batch if max_batch >= 0 else 0
+        # Choose from the top level of the new choices.
+        self.drill_path = ""
+        self.drill_selected = False
+        if self.is_drill_down():
+            self.current_batch = 0
 
         # Update the caption to reflect the current batch
+        self.choice_list_model = ChoiceListModel(
+            vc_question_data=self.question_data, indentation=self.indentation
+        )
         self.set_caption(self._get_batch_caption())
 
         # Clear the current input text
         self.set_edit_text("")
 
         # If there was a previous valid answer, try to restore it
-        if current_answer and current_answer in self.question_data.choices:
+        if current_answer:
             try:
                 self.set_answer(current_answer)
             except ValueError:
@@ -0,0 +1,93 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from tui_labeller.tuis.urwid.date_question.DateTimeQuestion import (
+    DateTimeQuestion,
+)
+from tui_labeller.tuis.urwid.input_validation.InputValidationQuestion import (
+    InputValidationQuestion,
+)
+from tui_labeller.tuis.urwid.multiple_choice_question.HorizontalMultipleChoiceWidget import (
+    HorizontalMultipleChoiceWidget,
+)
+from tui_labeller.tuis.urwid.multiple_choice_question.VerticalMultipleChoiceWidget import (
+    VerticalMultipleChoiceWidget,
+)
+from tui_labeller.typechecking import typechecked
+
+QuestionWidget = Union[
+    DateTimeQuestion,
+    InputValidationQuestion,
+    VerticalMultipleChoiceWidget,
+    HorizontalMultipleChoiceWidget,
+]
+Answer = Union[str, float, int, datetime]
+
+
+class AnswerMap:
+    """The answers of a questionnaire, keyed by question id.
+
+    The question id of a question is its question_id, or its question
+    text if it has no question_id. Repeated questions (e.g. a second
+    account block) have a unique question_id with a counter, see
+    assign_unique_question_ids. The map is built in a single pass over
+    the answers, so the receipt builders look up an answer in O(1)
+    instead of scanning all answers for a caption.
+    """
+
+    @typechecked
+    def __init__(self, *, final_answers: List[Tuple[QuestionWidget, Answer]]):
+        self.final_answers: List[Tuple[QuestionWidget, Answer]] = final_answers
+        self.answers_by_id: Dict[str, Tuple[QuestionWidget, Answer]] = {}
+        for widget, answer in final_answers:
+            question_id: str = get_question_key(widget=widget)
+            if question_id in self.answers_by_id:
+                raise ValueError(f"Duplicate question id:{question_id}")
+            self.answers_by_id[question_id] = (widget, answer)
+
+    def __contains__(self, question_id: str) -> bool:
+        return question_id in self.answers_by_id
+
+    @typechecked
+    def get_widget(self, *, question_id: str) -> QuestionWidget:
+        """Returns the widget of a question.
+
+        Raises:
+            ValueError: If the question is not in the answers.
+        """
+        if question_id not in self.answers_by_id:
+            raise ValueError(
+                f"Was not able to find widget with question_id={question_id}"
+            )
+        return self.answers_by_id[question_id][0]
+
+    @typechecked
+    def get_value(self, *, question_id: str, required: bool = False) -> Any:
+        """Returns the answer to a question, or None if the question is not
+        in the answers or was skipped (empty answer).
+
+        Raises:
+            ValueError: If the answer is required but not found.
+        """
+        if question_id not in self.answers_by_id:
+            if required:
+                raise ValueError(
+                    f"Did not find the answer to:{question_id} in the"
+                    f" answers:{list(self.answers_by_id.keys())}."
+                )
+            return None
+        value: Answer = self.answers_by_id[question_id][1]
+        return value if value != "" else None
+
+    @typechecked
+    def get_float(self, *, question_id: str) -> Optional[float]:
+        """Returns the answer to an optional number question as float, or
+        None if it was skipped."""
+        value: Any = self.get_value(question_id=question_id)
+        return float(value) if value is not None else None
+
+
+@typechecked
+def get_question_key(*, widget: QuestionWidget) -> str:
+    """Returns the question id of the question of a widget."""
+    return widget.question_data.question_id or widget.question_data.question
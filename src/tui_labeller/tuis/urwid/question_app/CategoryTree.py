@@ -0,0 +1,148 @@
+import os
+from typing import Dict, Iterable, List, Optional
+
+from tui_labeller.typechecking import typechecked
+
+SEPARATOR: str = ":"
+
+
+class CategoryNode:
+    """A segment of a colon separated category, e.g. "wholefoods" in
+    "expenses:wholefoods:groceries"."""
+
+    def __init__(self, *, path: str):
+        self.path: str = path
+        self.children: Dict[str, "CategoryNode"] = {}
+        # The nr of uses of this category and the categories below it.
+        self.count: int = 0
+        # True if the path itself is a category, not only a parent of one.
+        self.is_category: bool = False
+        self.ranked_children: Optional[List["CategoryNode"]] = None
+
+    def get_ranked_children(self) -> List["CategoryNode"]:
+        """Returns the children, the most used first, then in the order in
+        which they were added (cached until a count or child changes)."""
+        if self.ranked_children is None:
+            self.ranked_children = sorted(
+                self.children.values(), key=lambda child: -child.count
+            )
+        return self.ranked_children
+
+
+class CategoryTree:
+    """Index over colon separated categories or accounts, e.g.
+    "expenses:wholefoods:groceries" and "assets:btc:2342323", with the
+    nr of uses per node.
+
+    Each segment is a node, so the children of a category are a dict
+    lookup per segment, instead of a scan over all categories. This
+    allows completing a category one segment at a time, and choosing a
+    category by drilling down the levels, in O(depth x fan-out) instead
+    of paging through all categories.
+
+    Usage:
+        category_tree = CategoryTree(categories=["assets:gold", "assets:btc"])
+        category_tree.record_use(category="assets:gold")
+        category_tree.get_children(path="assets")  # ["assets:gold", ...]
+        category_tree.complete_segment(text="assets:g")  # "assets:gold"
+    """
+
+    @typechecked
+    def __init__(self, *, categories: Iterable[str] = ()):
+        self.root: CategoryNode = CategoryNode(path="")
+        for category in categories:
+            self.add(category=category)
+
+    @typechecked
+    def add(self, *, category: str, count: int = 0) -> None:
+        """Add a category, with count uses."""
+        node: CategoryNode = self.root
+        for segment in category.split(SEPARATOR):
+            node.count += count
+            if segment not in node.children:
+                node.children[segment] = CategoryNode(
+                    path=(
+                        f"{node.path}{SEPARATOR}{segment}"
+                        if node.path
+                        else segment
+                    )
+                )
+            # The ranking changes with the new child or its count.
+            node.ranked_children = None
+            node = node.children[segment]
+        node.count += count
+        node.is_category = True
+
+    @typechecked
+    def record_use(self, *, category: str) -> None:
+        """Count a use of a category, which is added if it is new."""
+        self.add(category=category, count=1)
+
+    @typechecked
+    def get_node(self, *, path: str) -> Optional[CategoryNode]:
+        """Returns the node of a path, the root for an empty path, or None
+        if the path is not in the tree."""
+        node: CategoryNode = self.root
+        if not path:
+            return node
+        for segment in path.split(SEPARATOR):
+            if segment not in node.children:
+                return None
+            node = node.children[segment]
+        return node
+
+    @typechecked
+    def get_children(self, *, path: str) -> List[str]:
+        """Returns the paths of the children of path, the most used first."""
+        node: Optional[CategoryNode] = self.get_node(path=path)
+        if node is None:
+            return []
+        return [child.path for child in node.get_ranked_children()]
+
+    @typechecked
+    def has_children(self, *, path: str) -> bool:
+        node: Optional[CategoryNode] = self.get_node(path=path)
+        return node is not None and bool(node.children)
+
+    @typechecked
+    def is_category(self, *, path: str) -> bool:
+        node: Optional[CategoryNode] = self.get_node(path=path)
+        return node is not None and node.is_category
+
+    @typechecked
+    def complete_segment(self, *, text: str) -> str:
+        """Complete the last segment of text, like a shell completes a path.
+
+        If a single child of the parent segments starts with the last
+        (case insensitive) segment, the segment is completed to it,
+        followed by a colon if the child is only a parent of categories.
+        If multiple children match, the segment is completed to their
+        common prefix.
+
+        Args:
+            text: A (partial) category, e.g. "expenses:who".
+
+        Returns:
+            The completed text, or text if it can not be completed.
+        """
+        parent, separator, partial = text.rpartition(SEPARATOR)
+        node: Optional[CategoryNode] = self.get_node(path=parent)
+        if node is None:
+            return text
+        matches: List[str] = [
+            segment
+            for segment in node.children
+            if segment.lower().startswith(partial.lower())
+        ]
+        if not matches:
+            return text
+        if len(matches) == 1:
+            child: CategoryNode = node.children[matches[0]]
+            suffix: str = (
+                SEPARATOR if child.children and not child.is_category else ""
+            )
+            return f"{parent}{separator}{matches[0]}{suffix}"
+        common_prefix: str = os.path.commonprefix(matches)
+        if len(common_prefix) <= len(partial):
+            return text
+        return f"{parent}{separator}{common_prefix}"
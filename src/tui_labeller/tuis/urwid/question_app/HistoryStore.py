@@ -0,0 +1,213 @@
+import json
+import math
+import os
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from hledger_preprocessor.TransactionObjects.Receipt import Receipt
+
+from tui_labeller.file_read_write_helper import to_jsonable, write_json_file
+from tui_labeller.instrumentation.Tracer import traced
+from tui_labeller.tuis.urwid.question_data_classes import HistorySuggestion
+from tui_labeller.typechecking import typechecked
+
+HISTORY_STORE_FILENAME: str = "history_store.json"
+# The weight of a use halves every 90 days.
+HALF_LIFE: float = 90 * 24 * 3600.0
+CATEGORY_QUESTION_ID: str = "\nBookkeeping expense category:"
+# The question_ids of the shop questions, per address field.
+SHOP_QUESTION_IDS: Dict[str, str] = {
+    "street": "shop_street",
+    "house_nr": "shop_house_nr",
+    "zipcode": "shop_zipcode",
+    "city": "shop_city",
+    "country": "shop_country",
+}
+
+# [count, last used timestamp, rank]
+HistoryEntry = List[float]
+
+
+class HistoryStore:
+    """The past answers per question_id, ranked by how often and how
+    recently they were given, shared by all receipts and sessions.
+
+    Each answer has a use count, the timestamp it was last used and a
+    rank: the log2 of its uses, each decayed with the half_life, at a
+    fixed reference time. Ranks can be compared without decaying all
+    answers to the current time, and are updated in O(1) per use.
+
+    The store is loaded lazily, on the first query, from its json file.
+    If there is no file yet, it is seeded from the labelled_receipts
+    (the category and the shop of each receipt). New answers are added
+    once a receipt is done, and the store is saved after each receipt.
+
+    Usage:
+        history_store = HistoryStore(filepath="history_store.json")
+        history_store.get_suggestions(question_id="shop_city")
+        history_store.add_answers(answers={"shop_city": "Nijmegen"})
+        history_store.save()
+    """
+
+    @typechecked
+    def __init__(
+        self,
+        *,
+        filepath: Optional[str] = None,
+        labelled_receipts: Optional[Iterable[Union[Receipt, Dict]]] = None,
+        half_life: float = HALF_LIFE,
+    ):
+        self.filepath: Optional[str] = filepath
+        self.half_life: float = half_life
+        # Is increased on every change, so the widgets can rebuild their
+        # suggestion index when it differs.
+        self.revision: int = 0
+        self._labelled_receipts: Optional[Iterable[Union[Receipt, Dict]]] = (
+            labelled_receipts
+        )
+        self._entries: Optional[Dict[str, Dict[str, HistoryEntry]]] = None
+        self._ranked: Dict[str, List[str]] = {}
+
+    @typechecked
+    def load(self) -> None:
+        """Load the store now instead of on the first query, e.g. at the
+        start of a session, so an invalid store or results file raises
+        before the questionnaire runs."""
+        self._get_entries()
+
+    def _get_entries(self) -> Dict[str, Dict[str, HistoryEntry]]:
+        if self._entries is None:
+            self._entries = {}
+            if self.filepath is not None and os.path.isfile(self.filepath):
+                with open(self.filepath, encoding="utf-8") as history_file:
+                    self._entries = json.load(history_file)["questions"]
+            elif self._labelled_receipts is not None:
+                for receipt in self._labelled_receipts:
+                    self._add_receipt(receipt=receipt)
+            self._labelled_receipts = None
+        return self._entries
+
+    def _add_receipt(self, *, receipt: Union[Receipt, Dict]) -> None:
+        """Add the category and shop answers of a labelled receipt, used at
+        the date of the receipt."""
+        content: Dict = (
+            receipt if isinstance(receipt, dict) else to_jsonable(receipt)
+        )
+        the_date: Optional[str] = content.get("the_date")
+        timestamp: float = (
+            datetime.fromisoformat(the_date).timestamp() if the_date else 0.0
+        )
+        shop: Dict = content.get("shop_identifier") or {}
+        answers: Dict[str, Optional[str]] = {
+            CATEGORY_QUESTION_ID: content.get("receipt_category"),
+            "shop_name": shop.get("name"),
+        }
+        address: Dict = shop.get("address") or {}
+        for field, question_id in SHOP_QUESTION_IDS.items():
+            answers[question_id] = address.get(field)
+        for question_id, answer in answers.items():
+            if answer:
+                self.add(
+                    question_id=question_id,
+                    answer=str(answer),
+                    timestamp=timestamp,
+                )
+
+    def add(
+        self,
+        *,
+        question_id: str,
+        answer: str,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """Count a use of answer for question_id, at timestamp (now by
+        default)."""
+        if timestamp is None:
+            timestamp = time.time()
+        answers: Dict[str, HistoryEntry] = self._get_entries().setdefault(
+            question_id, {}
+        )
+        count, last_used, rank = answers.get(answer, (0, 0.0, -math.inf))
+        reference: float = timestamp / self.half_life
+        answers[answer] = [
+            count + 1,
+            max(last_used, timestamp),
+            # log2(2**rank + 2**reference), without overflowing.
+            max(rank, reference) + math.log2(1 + 2 ** -abs(rank - reference)),
+        ]
+        self._ranked.pop(question_id, None)
+        self.revision += 1
+
+    @typechecked
+    def add_answers(
+        self, *, answers: Dict[str, Union[str, float, int]]
+    ) -> None:
+        """Count the (non empty) answers of a completed questionnaire."""
+        timestamp: float = time.time()
+        for question_id, answer in answers.items():
+            if str(answer).strip():
+                self.add(
+                    question_id=question_id,
+                    answer=str(answer),
+                    timestamp=timestamp,
+                )
+
+    def get_suggestions(self, *, question_id: str) -> List[str]:
+        """Returns the past answers of question_id, the highest ranked first
+        (cached until an answer of the question is added)."""
+        if question_id not in self._ranked:
+            answers: Dict[str, HistoryEntry] = self._get_entries().get(
+                question_id, {}
+            )
+            self._ranked[question_id] = sorted(
+                answers, key=lambda answer: -answers[answer][2]
+            )
+        return self._ranked[question_id]
+
+    def get_scored_suggestions(
+        self, *, question_id: str
+    ) -> List[Tuple[str, float]]:
+        """Returns the ranked past answers of question_id with their rank."""
+        answers: Dict[str, HistoryEntry] = self._get_entries().get(
+            question_id, {}
+        )
+        return [
+            (answer, answers[answer][2])
+            for answer in self.get_suggestions(question_id=question_id)
+        ]
+
+    @typechecked
+    def get_history_suggestions(
+        self, *, question_id: str
+    ) -> List[HistorySuggestion]:
+        """Returns the ranked past answers with their use counts."""
+        answers: Dict[str, HistoryEntry] = self._get_entries().get(
+            question_id, {}
+        )
+        return [
+            HistorySuggestion(
+                question=answer, frequency=int(answers[answer][0])
+            )
+            for answer in self.get_suggestions(question_id=question_id)
+        ]
+
+    @traced
+    @typechecked
+    def save(self, filepath: Optional[str] = None) -> None:
+        """Write the store to disk, atomically replacing the old file. A
+        store that was never loaded is unchanged, and is not written."""
+        filepath = filepath or self.filepath
+        if filepath is None:
+            raise ValueError("No filepath given to save the history store.")
+        if self._entries is None:
+            return
+        write_json_file(filepath=filepath, content={"questions": self._entries})
+
+
+@typechecked
+def get_frequency_rank(*, frequency: int) -> float:
+    """Returns the rank of an answer that was used frequency times at the
+    reference time, e.g. a fixed HistorySuggestion, which is below the
+    answers that were used since."""
+    return math.log2(max(frequency, 1))
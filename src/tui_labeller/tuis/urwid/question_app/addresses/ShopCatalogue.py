@@ -0,0 +1,331 @@
+import json
+import os
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from hledger_preprocessor.TransactionObjects.Receipt import (
+    Address,
+    Receipt,
+    ShopId,
+)
+
+from tui_labeller.instrumentation.Tracer import traced
+from tui_labeller.typechecking import typechecked
+
+ADDRESS_FIELDS: Tuple[str, ...] = (
+    "street",
+    "house_nr",
+    "zipcode",
+    "city",
+    "country",
+)
+SHOP_CATALOGUE_FILENAME: str = "shop_catalogue.json"
+
+# (shop name, address string, shop account nr)
+ShopKey = Tuple[str, str, str]
+# (negated receipt count, shop name, insertion order, shop key)
+RankingEntry = Tuple[int, str, int, ShopKey]
+
+
+class ShopCatalogue:
+    """Index of the shops in the labelled receipts, with the number of
+    receipts per category for each shop.
+
+    The catalogue is keyed by (name, address string, account nr), so
+    adding a receipt is O(1) and the address selector choices are a
+    lookup instead of a scan over all labelled receipts. The shops are
+    kept ranked by receipt count and name once the ranking is built, and
+    adding a receipt moves its shop within the ranking, so the choices of
+    a category are a pass over the ranking instead of a sort. The
+    catalogue is locked, so a prefetch thread can read it while receipts
+    are added.
+    """
+
+    @typechecked
+    def __init__(self, filepath: Optional[str] = None):
+        self.filepath: Optional[str] = filepath
+        self.shop_ids: Dict[ShopKey, ShopId] = {}
+        self.category_counts: Dict[ShopKey, Dict[str, int]] = {}
+        self.revision: int = 0
+        self._lock: threading.RLock = threading.RLock()
+        self._choices_cache: Dict[
+            Optional[str], Tuple[List[str], List[ShopId]]
+        ] = {}
+        # Built by the first get_choices call, e.g. in the prefetch thread.
+        self._ranking: Optional[List[RankingEntry]] = None
+        self._ranking_entries: Dict[ShopKey, RankingEntry] = {}
+
+    @classmethod
+    @typechecked
+    def from_receipts(
+        cls,
+        *,
+        labelled_receipts: Iterable[Union[Receipt, Dict]],
+        filepath: Optional[str] = None,
+    ) -> "ShopCatalogue":
+        """Build a catalogue from labelled receipts, Receipt objects or
+        their json dicts."""
+        shop_catalogue = cls(filepath=filepath)
+        for receipt in labelled_receipts:
+            shop_catalogue.add_receipt(receipt=receipt)
+        return shop_catalogue
+
+    @classmethod
+    @typechecked
+    def load(
+        cls,
+        *,
+        filepath: str,
+        labelled_receipts: Optional[Iterable[Union[Receipt, Dict]]] = None,
+    ) -> "ShopCatalogue":
+        """Load the catalogue from disk.
+
+        If the catalogue file does not exist yet, it is seeded from the
+        labelled_receipts (if any) instead. They are only iterated in
+        that case, so they can be a lazy stream of the results.ndjson.
+        """
+        if not os.path.isfile(filepath):
+            return cls.from_receipts(
+                labelled_receipts=(
+                    [] if labelled_receipts is None else labelled_receipts
+                ),
+                filepath=filepath,
+            )
+
+        shop_catalogue = cls(filepath=filepath)
+        with open(filepath, encoding="utf-8") as catalogue_file:
+            content: Dict = json.load(catalogue_file)
+        for shop in content["shops"]:
+            shop_id = ShopId(
+                name=shop["name"],
+                address=Address(**shop["address"]),
+                shop_account_nr=shop["shop_account_nr"],
+            )
+            for category, count in shop["category_counts"].items():
+                shop_catalogue.add_shop(
+                    shop_identifier=shop_id, category=category, count=count
+                )
+        return shop_catalogue
+
+    @traced
+    @typechecked
+    def save(self, filepath: Optional[str] = None) -> None:
+        """Write the catalogue to disk, atomically replacing the old file."""
+        filepath = filepath or self.filepath
+        if filepath is None:
+            raise ValueError("No filepath given to save the shop catalogue.")
+        with self._lock:
+            content: Dict = self._to_json_content()
+        tmp_filepath: str = f"{filepath}.tmp"
+        with open(tmp_filepath, "w", encoding="utf-8") as catalogue_file:
+            json.dump(content, catalogue_file)
+        os.replace(tmp_filepath, filepath)
+
+    def _to_json_content(self) -> Dict:
+        return {
+            "shops": [
+                {
+                    "name": shop_id.name,
+                    "address": {
+                        field: getattr(shop_id.address, field, None)
+                        for field in ADDRESS_FIELDS
+                    },
+                    "shop_account_nr": shop_id.shop_account_nr,
+                    "category_counts": dict(self.category_counts[shop_key]),
+                }
+                for shop_key, shop_id in self.shop_ids.items()
+            ]
+        }
+
+    @typechecked
+    def add_receipt(self, *, receipt: Union[Receipt, Dict]) -> bool:
+        """Add the shop of a labelled receipt (or its json dict) to the
+        catalogue.
+
+        Returns:
+            bool: True if the receipt was added, False if it has no
+            category or no shop address.
+        """
+        if isinstance(receipt, dict):
+            category: Optional[str] = receipt.get("receipt_category")
+            shop_identifier: Union[None, ShopId, Dict] = receipt.get(
+                "shop_identifier"
+            )
+        else:
+            category = receipt.receipt_category
+            shop_identifier = receipt.shop_identifier
+        if category is None or shop_identifier is None:
+            return False
+        if not has_valid_address(shop_identifier=shop_identifier):
+            return False
+        self.add_shop(shop_identifier=shop_identifier, category=category)
+        return True
+
+    @typechecked
+    def add_shop(
+        self,
+        *,
+        shop_identifier: Union[ShopId, Dict],
+        category: str,
+        count: int = 1,
+    ) -> None:
+        """Add count receipts of a shop in a category to the catalogue."""
+        shop_id: ShopId = to_shop_id(shop_identifier=shop_identifier)
+        shop_key: ShopKey = get_shop_key(shop_id=shop_id)
+        with self._lock:
+            if shop_key not in self.shop_ids:
+                self.shop_ids[shop_key] = shop_id
+                self.category_counts[shop_key] = {}
+            counts = self.category_counts[shop_key]
+            counts[category] = counts.get(category, 0) + count
+            if self._ranking is not None:
+                self._update_ranking(shop_key=shop_key)
+            self.revision += 1
+            self._choices_cache.clear()
+
+    def _get_ranking_entry(
+        self, *, shop_key: ShopKey, order: int
+    ) -> RankingEntry:
+        return (
+            -max(self.category_counts[shop_key].values()),
+            shop_key[0],
+            order,
+            shop_key,
+        )
+
+    def _update_ranking(self, *, shop_key: ShopKey) -> None:
+        """Move a shop whose counts changed to its place in the ranking."""
+        old_entry: Optional[RankingEntry] = self._ranking_entries.get(shop_key)
+        entry: RankingEntry = self._get_ranking_entry(
+            shop_key=shop_key,
+            order=(len(self._ranking) if old_entry is None else old_entry[2]),
+        )
+        if entry == old_entry:
+            return
+        if old_entry is not None:
+            del self._ranking[bisect_left(self._ranking, old_entry)]
+        insort(self._ranking, entry)
+        self._ranking_entries[shop_key] = entry
+
+    def _get_ranking(self) -> List[RankingEntry]:
+        """Returns the shops sorted by receipt count (descending), name and
+        the order in which they were added."""
+        if self._ranking is None:
+            self._ranking_entries = {
+                shop_key: self._get_ranking_entry(
+                    shop_key=shop_key, order=order
+                )
+                for order, shop_key in enumerate(self.category_counts)
+            }
+            self._ranking = sorted(self._ranking_entries.values())
+        return self._ranking
+
+    @typechecked
+    def get_category_shop_counts(
+        self, *, category_input: Optional[str] = None
+    ) -> Dict[str, List[Tuple[int, ShopId]]]:
+        """Returns a category-to-shop-id mapping with the receipt counts,
+        sorted by count descending."""
+        category_shop_counts: Dict[str, List[Tuple[int, ShopId]]] = {}
+        with self._lock:
+            for shop_key, counts in self.category_counts.items():
+                for category, count in counts.items():
+                    category_shop_counts.setdefault(category, []).append(
+                        (count, self.shop_ids[shop_key])
+                    )
+        for shop_counts in category_shop_counts.values():
+            shop_counts.sort(key=lambda entry: -entry[0])
+
+        if category_input:
+            return {
+                category_input: category_shop_counts.get(category_input, [])
+            }
+        return category_shop_counts
+
+    @typechecked
+    def get_choices(
+        self, *, category_input: Optional[str] = None
+    ) -> Tuple[List[str], List[ShopId]]:
+        """Returns the address selector choices and their ShopIds.
+
+        The shops whose most frequent category is category_input are
+        starred and listed first, both groups are sorted by receipt
+        count (descending) and name. The result is cached until the
+        catalogue changes.
+        """
+        with self._lock:
+            if category_input not in self._choices_cache:
+                self._choices_cache[category_input] = self._build_choices(
+                    category_input=category_input
+                )
+            choices, shop_ids = self._choices_cache[category_input]
+        return list(choices), list(shop_ids)
+
+    @typechecked
+    def _build_choices(
+        self, *, category_input: Optional[str]
+    ) -> Tuple[List[str], List[ShopId]]:
+        # Both groups keep the order of the ranking.
+        starred_shops: List[ShopKey] = []
+        non_starred_shops: List[ShopKey] = []
+        for negated_score, _, _, shop_key in self._get_ranking():
+            if (
+                category_input
+                and self.category_counts[shop_key].get(category_input)
+                == -negated_score
+            ):
+                starred_shops.append(shop_key)
+            else:
+                non_starred_shops.append(shop_key)
+
+        choices: List[str] = ["manual address"]
+        shop_ids: List[ShopId] = [
+            ShopId(name="manual address", address=Address())
+        ]  # Placeholder ShopId
+        for prefix, shop_keys in (
+            ("*", starred_shops),
+            ("", non_starred_shops),
+        ):
+            for name, address, _ in shop_keys:
+                choices.append(f"{prefix}{name}: {address}")
+            shop_ids.extend(self.shop_ids[shop_key] for shop_key in shop_keys)
+        return choices, shop_ids
+
+
+@typechecked
+def to_shop_id(*, shop_identifier: Union[ShopId, Dict]) -> ShopId:
+    """Convert a (json loaded) shop identifier dict into a ShopId."""
+    if isinstance(shop_identifier, ShopId):
+        return shop_identifier
+    address = shop_identifier.get("address") or {}
+    return ShopId(
+        name=shop_identifier["name"],
+        address=(Address(**address) if isinstance(address, dict) else address),
+        shop_account_nr=shop_identifier.get("shop_account_nr") or None,
+    )
+
+
+@typechecked
+def get_shop_key(*, shop_id: ShopId) -> ShopKey:
+    return (
+        shop_id.name,
+        shop_id.address.to_string(),
+        shop_id.shop_account_nr or "",
+    )
+
+
+@typechecked
+def has_valid_address(*, shop_identifier: Union[ShopId, Dict]) -> bool:
+    """Check if the shop identifier's address has at least one
+    non-None/non-empty field."""
+    if isinstance(shop_identifier, ShopId):
+        address = shop_identifier.address
+        values = [getattr(address, field, None) for field in ADDRESS_FIELDS]
+    else:
+        address = shop_identifier.get("address", {})
+        # Ensure address is a dictionary; if not, treat as invalid
+        if not isinstance(address, dict):
+            return False
+        values = [address.get(field) for field in ADDRESS_FIELDS]
+    return any(value is not None and value != "" for value in values)
@@ -1,7 +1,6 @@
-from typing import Dict, List, Union
+from typing import List, Set, Union
 
 import urwid
-from typeguard import typechecked
 from urwid import AttrMap, Pile
 
 from tui_labeller.tuis.urwid.multiple_choice_question.HorizontalMultipleChoiceWidget import (
@@ -13,12 +12,14 @@ from tui_labeller.tuis.urwid.multiple_choice_question.VerticalMultipleChoiceWidg
 from tui_labeller.tuis.urwid.question_app.create_widgets import (
     create_question_widget,
 )
+from tui_labeller.tuis.urwid.question_app.HistoryStore import HistoryStore
 from tui_labeller.tuis.urwid.question_data_classes import (
     DateQuestionData,
     HorizontalMultipleChoiceQuestionData,
     InputValidationQuestionData,
     VerticalMultipleChoiceQuestionData,
 )
+from tui_labeller.typechecking import typechecked
 
 
 # Manual
@@ -47,21 +48,14 @@ def build_questionnaire(
     ai_suggestion_box: AttrMap,
     history_suggestion_box: AttrMap,
     error_display: AttrMap,
-    history_store: Dict,
+    history_store: HistoryStore,
 ) -> None:
     # Manual
     """Build the complete questionnaire UI."""
 
     # pile.contents = [(Text(header), ("pack", None))]
 
-    question_counts = {}  # Track duplicates
-    for question in questions:
-        base_id = question.question_id or question.question
-        question_counts[base_id] = question_counts.get(base_id, 0) + 1
-        if question_counts[base_id] > 1:
-            question.question_id = (  # Append counter
-                f"{base_id}_{question_counts[base_id]}"
-            )
+    assign_unique_question_ids(questions=questions, taken_ids=set())
 
     pile_contents = [(urwid.Text(header), ("pack", None))]
 
@@ -83,3 +77,37 @@ def build_questionnaire(
         pile_contents.append((widget, ("pack", None)))
 
     pile.contents = pile_contents
+
+
+@typechecked
+def assign_unique_question_ids(
+    *,
+    questions: List[
+        Union[
+            DateQuestionData,
+            InputValidationQuestionData,
+            VerticalMultipleChoiceQuestionData,
+            HorizontalMultipleChoiceQuestionData,
+        ]
+    ],
+    taken_ids: Set[str],
+) -> None:
+    """Give every question a question_id that is not in taken_ids.
+
+    The first occurrence of a question keeps its own id, repeated
+    questions (e.g. a second account block) get a counter appended.
+
+    Args:
+        questions: The questions that are added to the questionnaire.
+        taken_ids: The ids already in use, is updated with the new ids.
+    """
+    for question in questions:
+        base_id = question.question_id or question.question
+        unique_id = base_id
+        counter = 1
+        while unique_id in taken_ids:
+            counter += 1
+            unique_id = f"{base_id}_{counter}"  # Append counter
+        if unique_id != base_id:
+            question.question_id = unique_id
+        taken_ids.add(unique_id)
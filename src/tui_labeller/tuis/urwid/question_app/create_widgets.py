@@ -1,7 +1,6 @@
-from typing import Dict, Union
+from typing import Union
 
 import urwid
-from typeguard import typechecked
 from urwid import AttrMap, Pile
 
 from tui_labeller.tuis.urwid.date_question.DateTimeQuestion import (
@@ -16,12 +15,14 @@ from tui_labeller.tuis.urwid.multiple_choice_question.HorizontalMultipleChoiceWi
 from tui_labeller.tuis.urwid.multiple_choice_question.VerticalMultipleChoiceWidget import (
     VerticalMultipleChoiceWidget,
 )
+from tui_labeller.tuis.urwid.question_app.HistoryStore import HistoryStore
 from tui_labeller.tuis.urwid.question_data_classes import (
     DateQuestionData,
     HorizontalMultipleChoiceQuestionData,
     InputValidationQuestionData,
     VerticalMultipleChoiceQuestionData,
 )
+from tui_labeller.typechecking import typechecked
 
 
 # Manual
@@ -38,7 +39,7 @@ def create_question_widget(
         VerticalMultipleChoiceQuestionData,
         HorizontalMultipleChoiceQuestionData,
     ],
-    history_store: Dict,
+    history_store: HistoryStore,
     descriptor_col_width: int,
 ) -> Union[
     VerticalMultipleChoiceWidget, HorizontalMultipleChoiceWidget, AttrMap
@@ -78,6 +79,7 @@ def create_question_widget(
             ai_suggestion_box=ai_suggestion_box,
             history_suggestion_box=history_suggestion_box,
             pile=pile,
+            history_store=history_store,
         )
         # if question_data.default is not None:
         #     widget.set_edit_text(question_data.default)
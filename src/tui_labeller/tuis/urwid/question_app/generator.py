@@ -1,10 +1,15 @@
-from typing import List, Union
+from typing import Callable, List, Optional, Union
 
+import urwid
 from hledger_preprocessor.TransactionObjects.Receipt import (
     Receipt,
 )
-from typeguard import typechecked
 
+from tui_labeller.headless.HeadlessDriver import HeadlessDriver
+from tui_labeller.instrumentation.KeyLatencyMonitor import KeyLatencyMonitor
+from tui_labeller.results.AnswerJournal import AnswerJournal
+from tui_labeller.results.ResultsSink import ResultsSink
+from tui_labeller.tuis.urwid.question_app.HistoryStore import HistoryStore
 from tui_labeller.tuis.urwid.question_data_classes import (
     DateQuestionData,
     HorizontalMultipleChoiceQuestionData,
@@ -12,6 +17,7 @@ from tui_labeller.tuis.urwid.question_data_classes import (
     VerticalMultipleChoiceQuestionData,
 )
 from tui_labeller.tuis.urwid.QuestionnaireApp import QuestionnaireApp
+from tui_labeller.typechecking import typechecked
 
 
 # Manual generator
@@ -27,10 +33,26 @@ def create_questionnaire(
         ]
     ],
     labelled_receipts: List[Receipt],
+    screen: Optional[urwid.display.BaseScreen] = None,
+    history_store: Optional[HistoryStore] = None,
+    results_sink: Optional[ResultsSink] = None,
+    answer_journal: Optional[AnswerJournal] = None,
+    input_filter: Optional[Callable] = None,
+    headless_driver: Optional[HeadlessDriver] = None,
+    key_latency_monitor: Optional[KeyLatencyMonitor] = None,
 ) -> QuestionnaireApp:
     """Create and run a questionnaire with the given questions."""
     app = QuestionnaireApp(
-        header=header, questions=questions, labelled_receipts=labelled_receipts
+        header=header,
+        questions=questions,
+        labelled_receipts=labelled_receipts,
+        screen=screen,
+        history_store=history_store,
+        results_sink=results_sink,
+        answer_journal=answer_journal,
+        input_filter=input_filter,
+        headless_driver=headless_driver,
+        key_latency_monitor=key_latency_monitor,
     )
     # write_to_file(filename="eg.txt", content="STARTED", append=False)
     return app
@@ -1,7 +1,6 @@
 from datetime import datetime
 from typing import List, Tuple, Union
 
-from typeguard import typechecked
 from urwid import AttrMap
 
 from tui_labeller.tuis.urwid.date_question.DateTimeQuestion import (
@@ -16,6 +15,7 @@ from tui_labeller.tuis.urwid.multiple_choice_question.HorizontalMultipleChoiceWi
 from tui_labeller.tuis.urwid.multiple_choice_question.VerticalMultipleChoiceWidget import (
     VerticalMultipleChoiceWidget,
 )
+from tui_labeller.typechecking import typechecked
 
 
 @typechecked
@@ -1,111 +1,63 @@
-from pprint import pprint
-from typing import Any, List, Tuple, Union
+from typing import List
 
-from hledger_preprocessor.TransactionObjects.Receipt import (
-    Receipt,
-)
-from typeguard import typechecked
-
-from tui_labeller.tuis.urwid.question_app.generator import create_questionnaire
-from tui_labeller.tuis.urwid.question_data_classes import (
-    VerticalMultipleChoiceQuestionData,
+from tui_labeller.instrumentation.Tracer import traced
+from tui_labeller.tuis.urwid.question_app.reconfiguration.splicing_questions import (
+    insert_questions,
 )
 from tui_labeller.tuis.urwid.QuestionnaireApp import (
     QuestionnaireApp,
 )
 from tui_labeller.tuis.urwid.receipts.AccountQuestions import AccountQuestions
+from tui_labeller.tuis.urwid.receipts.AccountRegistry import AccountRegistry
+from tui_labeller.typechecking import typechecked
 
 
+@traced
 @typechecked
 def handle_add_account(
+    *,
+    tui: "QuestionnaireApp",
     account_questions: "AccountQuestions",
-    current_questions: list,
-    preserved_answers: List[Union[None, Tuple[str, Any]]],
     selected_accounts: set,
-    labelled_receipts: List[Receipt],
 ) -> "QuestionnaireApp":
-    """Handle the addition of a new account question."""
-    available_accounts = [
-        acc
-        for acc in account_questions.belongs_to_options
-        if acc not in selected_accounts
-    ]
+    """Handle the addition of a new account question block.
+
+    The new block is spliced in after the last account question of the
+    running questionnaire, the answers of the other questions are kept.
+    The accounts that are not selected yet are kept by the account
+    registry, and only recomputed if the selected accounts changed.
+    """
+    account_registry: AccountRegistry = account_questions.account_registry
+    account_registry.set_selected(account_names=selected_accounts)
+    available_accounts: List[str] = account_registry.get_available_options()
     if not available_accounts:
         raise ValueError(
             "Cannot add another account, as there aren't any unpicked accounts"
             " left."
         )
 
-    # Finds the highest index in current_questions where a question matches any in account_questions.account_questions. Returns -1 if no match is found.
+    # Finds the highest index in the questions where a question matches any in account_questions.account_questions. Returns -1 if no match is found.
+    account_question_identifiers = {
+        q.question for q in account_questions.account_questions
+    }
     last_account_idx = max(
         (
             i
-            for i, q in enumerate(current_questions)
-            if q.question
-            in {q.question for q in account_questions.account_questions}
+            for i, q in enumerate(tui.questions)
+            if q.question in account_question_identifiers
         ),
         default=-1,
     )
 
-    # Create new AccountQuestions with filtered account_infos
-    new_account_questions = AccountQuestions(
-        account_infos=available_accounts,  # Only include available accounts
-        asset_accounts=account_questions.asset_accounts,  # TODO: verify this is necessary and correct.
-    ).account_questions
-    for new_account_question in new_account_questions:
-        if isinstance(new_account_question, VerticalMultipleChoiceQuestionData):
-            if (
-                new_account_question.question
-                == "Belongs to bank/asset_accounts:"
-            ):
-                new_account_question.choices = available_accounts
-
-    # Insert new_account_questions into current_questions at last_account_idx + 1
-    new_questions = (
-        current_questions[: last_account_idx + 1]
-        + new_account_questions
-        + current_questions[last_account_idx + 1 :]
+    # Only the available accounts can be chosen in the new block.
+    new_account_questions = account_questions.create_questions(
+        account_choices=available_accounts
     )
 
-    new_tui = create_questionnaire(
-        questions=new_questions,
-        header="Answer the receipt questions.",
-        labelled_receipts=labelled_receipts,
+    # Insert new_account_questions at last_account_idx + 1
+    insert_questions(
+        tui=tui,
+        insert_index=last_account_idx + 1,
+        new_questions=new_account_questions,
     )
-
-    # Calculate the range of indices for new account questions
-    new_account_start_idx = last_account_idx + 1
-    new_account_end_idx = new_account_start_idx + len(new_account_questions)
-    # Apply preserved answers only to questions outside the new account questions' indices
-    pprint(preserved_answers)
-    for idx, input_widget in enumerate(new_tui.inputs):
-
-        widget = input_widget.base_widget
-        question_text = widget.question_data.question
-
-        # if idx < len(preserved_answers):
-        #     if preserved_answers[idx] and isinstance(preserved_answers[idx],List) and len(preserved_answers[idx])>1:
-        #         input(f'Reconsidering question: {question_text}, with preserved answer:{preserved_answers[idx][1]}')
-        if new_account_start_idx <= idx < new_account_end_idx:
-            print(f"SKIPPING={idx}, question={widget.question_data.question}")
-            continue  # Skip new account questions
-        elif len(preserved_answers) > idx and (
-            preserved_answers[idx]
-            and question_text == preserved_answers[idx][0]
-        ):
-            print(
-                f"SETTING={idx},"
-                f" question={widget.question_data.question} with:{preserved_answers[idx][1]}"
-            )
-            widget.set_answer(preserved_answers[idx][1])
-        else:
-            print(
-                f"new_account_start_idx={new_account_start_idx},"
-                f" new_account_end_idx={new_account_end_idx}"
-            )
-            print(
-                f"Outside of scope, idx={idx},"
-                f" question={widget.question_data.question}"
-            )
-
-    return new_tui
+    return tui
@@ -0,0 +1,106 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from tui_labeller.instrumentation.Tracer import traced
+from tui_labeller.results.AnswerJournal import JournalState
+from tui_labeller.tuis.urwid.date_question.DateTimeQuestion import (
+    DateTimeQuestion,
+)
+from tui_labeller.tuis.urwid.question_app.reconfiguration.reconfiguration import (
+    get_configuration,
+    handle_manual_address_questions,
+)
+from tui_labeller.tuis.urwid.QuestionnaireApp import (
+    QuestionnaireApp,
+)
+from tui_labeller.tuis.urwid.receipts.AccountQuestions import AccountQuestions
+from tui_labeller.tuis.urwid.receipts.OptionalQuestions import OptionalQuestions
+from tui_labeller.typechecking import typechecked
+
+
+@traced
+@typechecked
+def restore_answers(
+    *, tui: "QuestionnaireApp", answers: Dict[str, Any]
+) -> List[str]:
+    """Set the answers of the questions that are in the questionnaire, in a
+    single pass over the widgets.
+
+    The restored (and invalid) answers are removed from answers, so the
+    remaining ones can be restored once their questions are added.
+
+    Args:
+        tui: The QuestionnaireApp that is modified in place.
+        answers: The json answers per question id, as in the journal.
+
+    Returns:
+        The question ids of the restored answers.
+    """
+    restored_question_ids: List[str] = []
+    for input_widget in tui.inputs:
+        widget = input_widget.base_widget
+        question_data = widget.question_data
+        question_id: str = question_data.question_id or question_data.question
+        if question_id not in answers:
+            continue
+        answer: Any = answers.pop(question_id)
+        if isinstance(widget, DateTimeQuestion) and isinstance(answer, str):
+            answer = datetime.fromisoformat(answer)
+        try:
+            widget.set_answer(answer)
+        except ValueError:
+            continue  # E.g. the choice is no longer available.
+        restored_question_ids.append(question_id)
+    return restored_question_ids
+
+
+@typechecked
+def get_question_position(
+    *, tui: "QuestionnaireApp", question_id: Optional[str]
+) -> Optional[int]:
+    """Returns the position of a question in the questionnaire, if any."""
+    for position, question_data in enumerate(tui.questions):
+        if (question_data.question_id or question_data.question) == question_id:
+            return position
+    return None
+
+
+@traced
+@typechecked
+def resume_questionnaire(
+    *,
+    tui: "QuestionnaireApp",
+    journal_state: JournalState,
+    account_questions: "AccountQuestions",
+    optional_questions: "OptionalQuestions",
+) -> int:
+    """Restore the answers of an interrupted questionnaire.
+
+    The questions that depend on answers (account blocks, manual address
+    questions) are added by reconfiguring after each restore round, and
+    their answers are restored in the next round.
+
+    Args:
+        tui: The new QuestionnaireApp, modified in place.
+        journal_state: The replayed answer journal.
+        account_questions: The account questions of the receipt.
+        optional_questions: The optional questions of the receipt.
+
+    Returns:
+        The position of the question that had the focus, or 0.
+    """
+    answers: Dict[str, Any] = dict(journal_state.answers)
+    tui.set_focus(0)
+    while restore_answers(tui=tui, answers=answers):
+        tui = handle_manual_address_questions(
+            tui=tui, optional_questions=optional_questions
+        )
+        tui = get_configuration(
+            tui=tui,
+            account_questions=account_questions,
+            optional_questions=optional_questions,
+        )
+    focus_position: Optional[int] = get_question_position(
+        tui=tui, question_id=journal_state.focus_question_id
+    )
+    return 0 if focus_position is None else focus_position
@@ -0,0 +1,124 @@
+from typing import List, Union
+
+from tui_labeller.instrumentation.Tracer import add_span_attributes, traced
+from tui_labeller.tuis.urwid.question_app.build_questionnaire import (
+    assign_unique_question_ids,
+)
+from tui_labeller.tuis.urwid.question_app.create_widgets import (
+    create_question_widget,
+)
+from tui_labeller.tuis.urwid.question_data_classes import (
+    DateQuestionData,
+    HorizontalMultipleChoiceQuestionData,
+    InputValidationQuestionData,
+    VerticalMultipleChoiceQuestionData,
+)
+from tui_labeller.tuis.urwid.QuestionnaireApp import (
+    QuestionnaireApp,
+)
+from tui_labeller.typechecking import typechecked
+
+
+@traced
+@typechecked
+def insert_questions(
+    *,
+    tui: "QuestionnaireApp",
+    insert_index: int,
+    new_questions: List[
+        Union[
+            DateQuestionData,
+            InputValidationQuestionData,
+            VerticalMultipleChoiceQuestionData,
+            HorizontalMultipleChoiceQuestionData,
+        ]
+    ],
+) -> None:
+    """Splice a block of new questions into the running questionnaire.
+
+    Only the widgets of the new questions are created, the existing
+    widgets (and their answers) are kept as they are.
+
+    Args:
+        tui: The QuestionnaireApp that is modified in place.
+        insert_index: The question index at which the block is inserted.
+        new_questions: The question data objects of the new block.
+
+    Raises:
+        ValueError: If insert_index is outside of the questionnaire.
+    """
+    if not 0 <= insert_index <= len(tui.questions):
+        raise ValueError(
+            f"Invalid insert_index={insert_index} for"
+            f" {len(tui.questions)} questions."
+        )
+    add_span_attributes(
+        nr_of_questions=len(tui.questions),
+        nr_of_new_questions=len(new_questions),
+    )
+    assign_unique_question_ids(
+        questions=new_questions,
+        taken_ids={q.question_id or q.question for q in tui.questions},
+    )
+    new_widgets = [
+        create_question_widget(
+            pile=tui.pile,
+            ai_suggestion_box=tui.ai_suggestion_box,
+            history_suggestion_box=tui.history_suggestion_box,
+            error_display=tui.error_display,
+            question_data=question_data,
+            history_store=tui.history_store,
+            descriptor_col_width=tui.descriptor_col_width,
+        )
+        for question_data in new_questions
+    ]
+
+    tui.questions[insert_index:insert_index] = new_questions
+    tui.inputs[insert_index:insert_index] = new_widgets
+    pile_index: int = insert_index + tui.nr_of_headers
+    tui.pile.contents[pile_index:pile_index] = [
+        (widget, ("pack", None)) for widget in new_widgets
+    ]
+
+
+@traced
+@typechecked
+def remove_questions(
+    *,
+    tui: "QuestionnaireApp",
+    indices: List[int],
+) -> None:
+    """Remove the questions at the given indices from the running
+    questionnaire.
+
+    Args:
+        tui: The QuestionnaireApp that is modified in place.
+        indices: The question indices that are removed.
+
+    Raises:
+        ValueError: If an index is outside of the questionnaire.
+    """
+    add_span_attributes(
+        nr_of_questions=len(tui.questions), nr_of_removed_questions=len(indices)
+    )
+    for index in sorted(set(indices), reverse=True):
+        if not 0 <= index < len(tui.questions):
+            raise ValueError(
+                f"Invalid index={index} for {len(tui.questions)} questions."
+            )
+        del tui.questions[index]
+        del tui.inputs[index]
+        del tui.pile.contents[index + tui.nr_of_headers]
+
+
+@typechecked
+def get_question_indices(
+    *, tui: "QuestionnaireApp", questions: set[str]
+) -> List[int]:
+    """Returns the indices of the questions whose question text is in
+    questions."""
+    return [
+        index
+        for index, question_data in enumerate(tui.questions)
+        if question_data.question in questions
+    ]
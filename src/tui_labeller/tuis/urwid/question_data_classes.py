@@ -1,24 +1,54 @@
-from typing import Dict, List, Optional, Union
+import sys
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 from urwid import AttrMap
 
 from tui_labeller.tuis.urwid.input_validation.InputType import InputType
 
+# The interned choices are cleared when they exceed this nr of tuples, e.g.
+# after many receipts with different address choices.
+MAX_INTERNED_CHOICES: int = 1024
+_interned_choices: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def intern_choices(*, choices: Iterable[str]) -> Tuple[str, ...]:
+    """Returns the shared tuple of the choices, so questions with equal
+    choices, e.g. the currencies of each account block, hold one copy."""
+    choices_tuple: Tuple[str, ...] = tuple(map(sys.intern, choices))
+    if len(_interned_choices) >= MAX_INTERNED_CHOICES:
+        _interned_choices.clear()
+    return _interned_choices.setdefault(choices_tuple, choices_tuple)
+
 
 class AISuggestion:
+    __slots__ = ("question", "probability", "ai_suggestions")
+
     def __init__(self, question: str, probability: float, model_name: str):
-        self.question: str = question
+        self.question: str = sys.intern(question)
         self.probability: float = probability
-        self.ai_suggestions: str = model_name
+        # The model name, shared by all suggestions of the model.
+        self.ai_suggestions: str = sys.intern(model_name)
 
 
 class HistorySuggestion:
+    __slots__ = ("question", "frequency")
+
     def __init__(self, question: str, frequency: int):
-        self.question: str = question
+        self.question: str = sys.intern(question)
         self.frequency: int = frequency
 
 
 class DateQuestionData:
+    __slots__ = (
+        "question",
+        "date_only",
+        "ai_suggestions",
+        "ans_required",
+        "reconfigurer",
+        "terminator",
+        "question_id",
+    )
+
     def __init__(
         self,
         question: str,
@@ -39,6 +69,18 @@ class DateQuestionData:
 
 
 class InputValidationQuestionData:
+    __slots__ = (
+        "question",
+        "input_type",
+        "ans_required",
+        "reconfigurer",
+        "terminator",
+        "ai_suggestions",
+        "history_suggestions",
+        "default",
+        "question_id",
+    )
+
     def __init__(
         self,
         question: str,
@@ -63,10 +105,24 @@ class InputValidationQuestionData:
 
 
 class VerticalMultipleChoiceQuestionData:
+    __slots__ = (
+        "ans_required",
+        "nr_of_ans_per_batch",
+        "reconfigurer",
+        "terminator",
+        "question",
+        "_choices",
+        "ai_suggestions",
+        "question_id",
+        "navigation_display",
+        "extra_data",
+        "drill_down",
+    )
+
     def __init__(
         self,
         question: str,
-        choices: List[str],
+        choices: Sequence[str],
         nr_of_ans_per_batch: int,
         ans_required: bool,
         reconfigurer: bool,
@@ -75,6 +131,7 @@ class VerticalMultipleChoiceQuestionData:
         question_id: Optional[str] = None,
         navigation_display: Optional[AttrMap] = None,
         extra_data: Optional[Dict] = None,
+        drill_down: bool = False,
     ):
         self.ans_required: bool = ans_required
         self.nr_of_ans_per_batch: int = nr_of_ans_per_batch
@@ -86,13 +143,35 @@ class VerticalMultipleChoiceQuestionData:
         self.question_id: Union[None, str] = question_id
         self.navigation_display: Union[None, AttrMap] = navigation_display
         self.extra_data: Optional[Dict] = extra_data
+        # Choose colon separated choices level by level.
+        self.drill_down: bool = drill_down
+
+    @property
+    def choices(self) -> Tuple[str, ...]:
+        return self._choices
+
+    @choices.setter
+    def choices(self, choices: Sequence[str]) -> None:
+        """Store the choices as their shared tuple, assigning new choices
+        replaces the tuple."""
+        self._choices = intern_choices(choices=choices)
 
 
 class HorizontalMultipleChoiceQuestionData:
+    __slots__ = (
+        "ans_required",
+        "reconfigurer",
+        "terminator",
+        "question",
+        "_choices",
+        "ai_suggestions",
+        "question_id",
+    )
+
     def __init__(
         self,
         question: str,
-        choices: List[str],
+        choices: Sequence[str],
         ai_suggestions: List[AISuggestion],
         ans_required: bool,
         reconfigurer: bool,
@@ -106,3 +185,11 @@ class HorizontalMultipleChoiceQuestionData:
         self.choices = choices
         self.ai_suggestions = ai_suggestions
         self.question_id: Union[None, str] = question_id
+
+    @property
+    def choices(self) -> Tuple[str, ...]:
+        return self._choices
+
+    @choices.setter
+    def choices(self, choices: Sequence[str]) -> None:
+        self._choices = intern_choices(choices=choices)
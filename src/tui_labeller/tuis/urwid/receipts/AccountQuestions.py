@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional, Sequence
 
 import urwid
 from hledger_preprocessor.Currency import Currency
@@ -10,6 +10,7 @@ from tui_labeller.tuis.urwid.question_data_classes import (
     InputValidationQuestionData,
     VerticalMultipleChoiceQuestionData,
 )
+from tui_labeller.tuis.urwid.receipts.AccountRegistry import AccountRegistry
 
 
 class AccountQuestions:
@@ -17,26 +18,41 @@ class AccountQuestions:
         self,
         account_infos: List[str],
         asset_accounts: set[str],
+        account_registry: Optional[AccountRegistry] = None,
     ):
         """account_infos are <account holder name>:<bank name>:<account_type>
-        they are a single string as they come directly from the arg parser."""
+        they are a single string as they come directly from the arg parser.
+        The account_registry is shared by the account blocks of a session,
+        it is built from the account_infos if it is not passed."""
         self.account_infos: List[str] = account_infos
         self.asset_accounts: set[str] = asset_accounts
-        self.belongs_to_options: List[str] = sorted(
-            list(set(list(self.account_infos) + list(self.asset_accounts)))
+        self.account_registry: AccountRegistry = (
+            account_registry
+            if account_registry is not None
+            else AccountRegistry.from_account_names(
+                account_names=account_infos, asset_accounts=asset_accounts
+            )
         )
+        # The registry is the single source of the account choices, so
+        # the choices match the accounts that can be resolved and added.
+        self.belongs_to_options: List[str] = self.account_registry.options
         self.account_questions = self.create_questions()
         self.verify_unique_questions(self.account_questions)
 
-    def create_questions(self):
-
+    def create_questions(self, account_choices: Optional[Sequence[str]] = None):
+        """Returns the questions of an account block, account_choices are
+        the choices of its account question (all accounts by default)."""
         return [
             VerticalMultipleChoiceQuestionData(
                 question="Belongs to bank/asset_accounts:",
                 ans_required=True,
                 reconfigurer=False,
                 terminator=False,
-                choices=self.belongs_to_options,
+                choices=(
+                    self.belongs_to_options
+                    if account_choices is None
+                    else account_choices
+                ),
                 ai_suggestions=[
                     AISuggestion(
                         question="name:uniswap:saving",
@@ -55,6 +71,7 @@ class AccountQuestions:
                     ),
                 ],
                 nr_of_ans_per_batch=8,
+                drill_down=True,
                 navigation_display=urwid.AttrMap(
                     urwid.Pile(
                         [
@@ -0,0 +1,141 @@
+from typing import Dict, Iterable, List, Optional, Set
+
+from hledger_preprocessor.receipt_transaction_matching.get_bank_data_from_transactions import (
+    HledgerFlowAccountInfo,
+)
+from hledger_preprocessor.TransactionObjects.Receipt import Account, AssetType
+from typing_extensions import TypeGuard
+
+from tui_labeller.typechecking import typechecked
+
+
+class AccountRegistry:
+    """The bank and asset accounts that can pay for a receipt, built once
+    per session from the --accounts and --categories.
+
+    The bank accounts are indexed by their colon separated string and the
+    asset accounts by their lowercased name, so an account answer is
+    resolved to an Account in O(1). The registry also keeps the accounts
+    that are selected in the account blocks of the current receipt, and
+    the remaining available options, which are only recomputed when the
+    selection changes.
+
+    Usage:
+        account_registry = AccountRegistry(
+            account_infos=account_infos, asset_accounts={"assets:gold"}
+        )
+        account_registry.resolve(account_name="assets:gold")
+        account_registry.set_selected(account_names={"assets:gold"})
+        account_registry.get_available_options()
+    """
+
+    @typechecked
+    def __init__(
+        self,
+        *,
+        account_infos: Iterable[HledgerFlowAccountInfo],
+        asset_accounts: Iterable[str],
+    ):
+        self.account_infos: Set[HledgerFlowAccountInfo] = set(account_infos)
+        self.asset_accounts: Set[str] = set(asset_accounts)
+        self._bank_accounts: Dict[str, List[HledgerFlowAccountInfo]] = {}
+        for account_info in self.account_infos:
+            self._bank_accounts.setdefault(
+                account_info.to_colon_separated_string(), []
+            ).append(account_info)
+        # The nr of asset accounts per lowercased name.
+        self._asset_accounts: Dict[str, int] = {}
+        for asset_account in self.asset_accounts:
+            lowered: str = asset_account.lower()
+            self._asset_accounts[lowered] = (
+                self._asset_accounts.get(lowered, 0) + 1
+            )
+        self.bank_account_names: List[str] = list(self._bank_accounts)
+        # The choices of the account question.
+        self.options: List[str] = sorted(
+            set(self.bank_account_names) | self.asset_accounts
+        )
+        self.selected: Set[str] = set()
+        self._available: Optional[List[str]] = None
+
+    @classmethod
+    @typechecked
+    def from_account_names(
+        cls, *, account_names: Iterable[str], asset_accounts: Iterable[str]
+    ) -> "AccountRegistry":
+        """Build a registry from the colon separated strings of the bank
+        accounts (account holder:bank:account type), the names that are
+        asset accounts are skipped."""
+        asset_accounts = set(asset_accounts)
+        account_infos: Set[HledgerFlowAccountInfo] = set()
+        for account_name in account_names:
+            if account_name in asset_accounts:
+                continue
+            account_holder, bank, account_type = account_name.split(":")
+            account_infos.add(
+                HledgerFlowAccountInfo(
+                    account_holder=account_holder,
+                    bank=bank,
+                    account_type=account_type,
+                )
+            )
+        return cls(account_infos=account_infos, asset_accounts=asset_accounts)
+
+    @typechecked
+    def resolve(self, *, account_name: str) -> Account:
+        """Returns the Account of an account answer.
+
+        Raises:
+            ValueError: If no account, or multiple accounts, match.
+        """
+        matches: List[Account] = [
+            Account(
+                asset_type=AssetType.BANK,
+                account_holder=account_info.account_holder,
+                bank=account_info.bank,
+                account_type=account_info.account_type,
+            )
+            for account_info in self._bank_accounts.get(account_name, [])
+        ]
+        if is_asset_account(s=account_name):
+            matches.extend(
+                Account(asset_type=AssetType.ASSET, asset_category=account_name)
+                for _ in range(
+                    self._asset_accounts.get(account_name.lower(), 0)
+                )
+            )
+
+        if not matches:
+            raise ValueError(f"No account found matching: {account_name}")
+        if len(matches) > 1:
+            raise ValueError(
+                f"Multiple accounts:\n{matches}\n found"
+                f" matching:\n{account_name}"
+            )
+        return matches[0]
+
+    @typechecked
+    def set_selected(self, *, account_names: Iterable[str]) -> None:
+        """Set the accounts that are selected in the current receipt, the
+        available options are only recomputed if they changed."""
+        account_names = set(account_names)
+        if account_names != self.selected:
+            self.selected = account_names
+            self._available = None
+
+    @typechecked
+    def get_available_options(self) -> List[str]:
+        """Returns the options that are not selected yet, in order."""
+        if self._available is None:
+            self._available = [
+                option for option in self.options if option not in self.selected
+            ]
+        return self._available
+
+
+@typechecked
+def is_asset_account(*, s: str) -> TypeGuard[str]:
+    """Check if string matches asset account format (e.g., 'assets:gold' or
+    'assets:BTC:address')."""
+    parts = s.split(":")
+    return len(parts) >= 2 and parts[0].lower() == "assets"
@@ -5,7 +5,6 @@ from hledger_preprocessor.TransactionObjects.Receipt import (  # For image handl
     ExchangedItem,
     Receipt,
 )
-from typeguard import typechecked
 
 from tui_labeller.tuis.urwid.date_question.DateTimeQuestion import (
     DateTimeQuestion,
@@ -22,6 +21,7 @@ from tui_labeller.tuis.urwid.question_data_classes import (
     InputValidationQuestionData,
     VerticalMultipleChoiceQuestionData,
 )
+from tui_labeller.typechecking import typechecked
 
 
 class ItemQuestionnaire:
@@ -6,9 +6,11 @@ from hledger_preprocessor.TransactionObjects.Receipt import (  # For image handl
     Receipt,
     ShopId,
 )
-from typeguard import typechecked
 
 from tui_labeller.tuis.urwid.input_validation.InputType import InputType
+from tui_labeller.tuis.urwid.question_app.addresses.ShopCatalogue import (
+    ShopCatalogue,
+)
 from tui_labeller.tuis.urwid.question_app.addresses.update_addresses import (
     get_initial_complete_list,
 )
@@ -17,6 +19,7 @@ from tui_labeller.tuis.urwid.question_data_classes import (
     InputValidationQuestionData,
     VerticalMultipleChoiceQuestionData,
 )
+from tui_labeller.typechecking import typechecked
 
 
 class OptionalQuestions:
@@ -24,20 +27,29 @@ class OptionalQuestions:
         self,
         labelled_receipts: List[Receipt],
         category: Optional[str] = None,
+        shop_catalogue: Optional[ShopCatalogue] = None,
     ):
         self.labelled_receipts = labelled_receipts
         self.category = category
+        self.shop_catalogue: ShopCatalogue = (
+            shop_catalogue
+            if shop_catalogue is not None
+            else ShopCatalogue.from_receipts(
+                labelled_receipts=labelled_receipts
+            )
+        )
         self.optional_questions = self.create_base_questions(
-            labelled_receipts=labelled_receipts, category=category
+            shop_catalogue=self.shop_catalogue, category=category
         )
         self.verify_unique_questions(self.optional_questions)
 
     def create_base_questions(
-        self, labelled_receipts: List[Receipt], category: Optional[str] = None
+        self, shop_catalogue: ShopCatalogue, category: Optional[str] = None
     ):
         # Get filtered shop IDs based on category
+        self.shop_catalogue_revision: int = shop_catalogue.revision
         choices, shop_ids = get_initial_complete_list(
-            labelled_receipts=labelled_receipts, category_input=category
+            shop_catalogue=shop_catalogue, category_input=category
         )
 
         # Base questions excluding manual address questions
@@ -100,6 +112,25 @@ class OptionalQuestions:
             ),
         ]
 
+    @typechecked
+    def refresh_shop_choices(self) -> bool:
+        """Update the address selector choices if shops were added to the
+        catalogue after the questions were created.
+
+        Returns:
+            bool: True if the choices were updated.
+        """
+        if self.shop_catalogue_revision == self.shop_catalogue.revision:
+            return False
+        self.shop_catalogue_revision = self.shop_catalogue.revision
+        choices, shop_ids = get_initial_complete_list(
+            shop_catalogue=self.shop_catalogue, category_input=self.category
+        )
+        address_selector = self.optional_questions[0]
+        address_selector.choices = choices
+        address_selector.extra_data["shop_ids"] = shop_ids
+        return True
+
     @typechecked
     def _is_shop_in_category(self, shop: ShopId, category: str) -> bool:
         # Placeholder method to check if a shop belongs to a category
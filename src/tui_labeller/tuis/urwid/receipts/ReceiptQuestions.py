@@ -0,0 +1,71 @@
+from typing import List, Optional, Union
+
+from hledger_preprocessor.receipt_transaction_matching.get_bank_data_from_transactions import (
+    HledgerFlowAccountInfo,
+)
+from hledger_preprocessor.TransactionObjects.Receipt import Receipt
+
+from tui_labeller.tuis.urwid.question_app.addresses.ShopCatalogue import (
+    ShopCatalogue,
+)
+from tui_labeller.tuis.urwid.question_data_classes import (
+    DateQuestionData,
+    HorizontalMultipleChoiceQuestionData,
+    InputValidationQuestionData,
+    VerticalMultipleChoiceQuestionData,
+)
+from tui_labeller.tuis.urwid.receipts.AccountQuestions import AccountQuestions
+from tui_labeller.tuis.urwid.receipts.AccountRegistry import AccountRegistry
+from tui_labeller.tuis.urwid.receipts.BaseQuestions import BaseQuestions
+from tui_labeller.tuis.urwid.receipts.OptionalQuestions import OptionalQuestions
+from tui_labeller.typechecking import typechecked
+
+
+class ReceiptQuestions:
+    """The question data objects of a single receipt.
+
+    They do not depend on the running questionnaire, so they can be
+    created ahead of time, e.g. by a prefetch thread.
+    """
+
+    @typechecked
+    def __init__(
+        self,
+        *,
+        account_infos: set[HledgerFlowAccountInfo],
+        asset_accounts: set[str],
+        labelled_receipts: List[Receipt],
+        shop_catalogue: Optional[ShopCatalogue] = None,
+        account_registry: Optional[AccountRegistry] = None,
+    ):
+        if account_registry is None:
+            account_registry = AccountRegistry(
+                account_infos=account_infos, asset_accounts=asset_accounts
+            )
+        self.account_questions: AccountQuestions = AccountQuestions(
+            account_infos=list(account_registry.bank_account_names),
+            asset_accounts=asset_accounts,
+            account_registry=account_registry,
+        )
+        self.base_questions: BaseQuestions = BaseQuestions()
+        self.optional_questions: OptionalQuestions = OptionalQuestions(
+            labelled_receipts=labelled_receipts, shop_catalogue=shop_catalogue
+        )
+
+    @typechecked
+    def get_questions(
+        self,
+    ) -> List[
+        Union[
+            DateQuestionData,
+            InputValidationQuestionData,
+            VerticalMultipleChoiceQuestionData,
+            HorizontalMultipleChoiceQuestionData,
+        ]
+    ]:
+        """Returns the initial questions of the receipt questionnaire."""
+        return (
+            self.base_questions.base_questions
+            + self.account_questions.account_questions
+            + self.optional_questions.optional_questions
+        )
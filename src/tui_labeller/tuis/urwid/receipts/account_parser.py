@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Tuple, Union
+from typing import List, Optional, Tuple, Union
 
 from hledger_preprocessor.Currency import Currency
 from hledger_preprocessor.receipt_transaction_matching.get_bank_data_from_transactions import (
@@ -8,16 +8,10 @@ from hledger_preprocessor.receipt_transaction_matching.get_bank_data_from_transa
 from hledger_preprocessor.TransactionObjects.Receipt import (  # For image handling
     Account,
     AccountTransaction,
-    AssetType,
     ExchangedItem,
     Receipt,
 )
-from typeguard import typechecked
-from typing_extensions import TypeGuard
 
-from tui_labeller.tuis.urwid.date_question.DateTimeQuestion import (
-    DateTimeQuestion,
-)
 from tui_labeller.tuis.urwid.input_validation.InputValidationQuestion import (
     InputValidationQuestion,
 )
@@ -27,14 +21,12 @@ from tui_labeller.tuis.urwid.multiple_choice_question.HorizontalMultipleChoiceWi
 from tui_labeller.tuis.urwid.multiple_choice_question.VerticalMultipleChoiceWidget import (
     VerticalMultipleChoiceWidget,
 )
+from tui_labeller.tuis.urwid.question_app.AnswerMap import AnswerMap
+from tui_labeller.tuis.urwid.receipts.AccountRegistry import AccountRegistry
+from tui_labeller.typechecking import typechecked
 
-
-@typechecked
-def is_asset_account(*, s: str) -> TypeGuard[str]:
-    """Check if string matches asset account format (e.g., 'assets:gold' or
-    'assets:BTC:address')."""
-    parts = s.split(":")
-    return len(parts) >= 2 and parts[0].lower() == "assets"
+ACCOUNT_QUESTION: str = "Belongs to bank/asset_accounts:"
+ADD_ACCOUNT_QUESTION: str = "Add another account (y/n)?"
 
 
 @typechecked
@@ -46,151 +38,102 @@ def parse_account_string(
 ) -> Account:
     """Parse input string and match to exactly one bank or asset account.
 
+    Builds the indexes of an AccountRegistry, use the resolve of a shared
+    registry to parse multiple strings.
+
     Returns an Account object or raises ValueError for no matches or
     multiple matches.
     """
-    matches: List[Account] = []
-
-    # Check bank accounts (HledgerFlowAccountInfo)
-    for account_info in account_infos:
-        bank_str = account_info.to_colon_separated_string()
-        if input_string == bank_str:
-            matches.append(
-                Account(
-                    asset_type=AssetType.BANK,
-                    account_holder=account_info.account_holder,
-                    bank=account_info.bank,
-                    account_type=account_info.account_type,
-                )
-            )
-
-    # Check asset accounts
-    if is_asset_account(s=input_string):
-        for asset in asset_accounts:
-            if input_string.lower() == asset.lower():
-                matches.append(
-                    Account(
-                        asset_type=AssetType.ASSET,
-                        asset_category=input_string,
-                    )
-                )
-
-    # Handle match results
-    if not matches:
-        raise ValueError(f"No account found matching: {input_string}")
-    if len(matches) > 1:
-        raise ValueError(
-            f"Multiple accounts:\n{matches}\n found matching:\n{input_string}"
-        )
-    return matches[0]
+    return AccountRegistry(
+        account_infos=account_infos, asset_accounts=asset_accounts
+    ).resolve(account_name=input_string)
 
 
 @typechecked
 def get_accounts_from_answers(
     *,
-    final_answers: List[
-        Tuple[
-            Union[
-                DateTimeQuestion,
-                InputValidationQuestion,
-                VerticalMultipleChoiceWidget,
-                HorizontalMultipleChoiceWidget,
-            ],
-            Union[str, float, int, datetime],
-        ]
-    ],
+    answer_map: AnswerMap,
     account_infos: set[HledgerFlowAccountInfo],
     asset_accounts: set[str],
+    account_registry: Optional[AccountRegistry] = None,
 ) -> List[AccountTransaction]:
+    """Parse the account blocks of the answers into AccountTransactions.
+
+    The answers are walked once. An account block starts at the account
+    question and consists of the account, currency, amount paid, change
+    returned and "add another account" answers. The next block is only
+    parsed if the previous block answered "y" to adding another account.
+    The accounts are resolved with the account_registry, which is built
+    from the account_infos and asset_accounts if it is not passed.
+    """
+    if account_registry is None:
+        account_registry = AccountRegistry(
+            account_infos=account_infos, asset_accounts=asset_accounts
+        )
+    final_answers = answer_map.final_answers
     account_transactions: List[AccountTransaction] = []
     i = 0
     while i < len(final_answers):
-
         widget, _ = final_answers[i]
-        caption = (
-            widget.question_data.question
-            if isinstance(widget, HorizontalMultipleChoiceWidget)
-            else widget.caption
-        )
-
-        first_account_question_id: str = "Belongs to bank/asset_accounts:"
-        if (
-            caption[: len(first_account_question_id)]
-            == first_account_question_id
-        ):
-            if not isinstance(widget, VerticalMultipleChoiceWidget):
-                raise ValueError(
-                    f"Expected VerticalMultipleChoiceWidget at index {i}"
-                )
-            if i + 4 >= len(final_answers):
-                raise ValueError("Incomplete account transaction questions")
+        if widget.question_data.question != ACCOUNT_QUESTION:
+            i += 1
+            continue
 
-            # Account
-            account_str = str(final_answers[i][1])
-            account = parse_account_string(
-                input_string=account_str,
-                account_infos=account_infos,
-                asset_accounts=asset_accounts,
+        if not isinstance(widget, VerticalMultipleChoiceWidget):
+            raise ValueError(
+                f"Expected VerticalMultipleChoiceWidget at index {i}"
             )
+        if i + 4 >= len(final_answers):
+            raise ValueError("Incomplete account transaction questions")
+
+        # Account
+        account_str = str(final_answers[i][1])
+        account = account_registry.resolve(account_name=account_str)
+
+        # Currency
+        currency_widget, currency_answer = final_answers[i + 1]
+        if not isinstance(currency_widget, VerticalMultipleChoiceWidget):
+            raise ValueError(
+                f"Expected VerticalMultipleChoiceWidget at index {i + 1}"
+            )
+        currency = Currency(currency_answer)
 
-            # Currency
-            currency_widget, currency_answer = final_answers[i + 1]
-            # currency_caption = currency_widget.question_data.question if isinstance(currency_widget, HorizontalMultipleChoiceWidget) else currency_widget.caption
-            if not isinstance(currency_widget, VerticalMultipleChoiceWidget):
-                raise ValueError(
-                    f"Expected VerticalMultipleChoiceWidget at index {i + 1}"
-                )
-            currency = Currency(currency_answer)
-
-            # Amount paid
-            amount_widget, amount_answer = final_answers[i + 2]
-            if not isinstance(amount_widget, InputValidationQuestion):
-                raise ValueError(
-                    f"Expected InputValidationQuestion at index {i + 2}"
-                )
-            amount_paid = float(amount_answer)
-
-            # Change returned
-            change_widget, change_answer = final_answers[i + 3]
-            if not isinstance(change_widget, InputValidationQuestion):
-                raise ValueError(
-                    f"Expected InputValidationQuestion at index {i + 3}"
-                )
-            change_returned = float(change_answer)
+        # Amount paid
+        amount_widget, amount_answer = final_answers[i + 2]
+        if not isinstance(amount_widget, InputValidationQuestion):
+            raise ValueError(
+                f"Expected InputValidationQuestion at index {i + 2}"
+            )
+        amount_paid = float(amount_answer)
 
-            account_transactions.append(
-                AccountTransaction(
-                    account=account,
-                    currency=currency,
-                    amount_paid=amount_paid,
-                    change_returned=change_returned,
-                )
+        # Change returned
+        change_widget, change_answer = final_answers[i + 3]
+        if not isinstance(change_widget, InputValidationQuestion):
+            raise ValueError(
+                f"Expected InputValidationQuestion at index {i + 3}"
             )
+        change_returned = float(change_answer)
+
+        account_transactions.append(
+            AccountTransaction(
+                account=account,
+                currency=currency,
+                amount_paid=amount_paid,
+                change_returned=change_returned,
+            )
+        )
 
-            # Check for additional account
-            if i + 4 < len(final_answers):
-                add_widget, add_answer = final_answers[i + 4]
-                add_caption = (
-                    add_widget.question_data.question
-                    if isinstance(add_widget, HorizontalMultipleChoiceWidget)
-                    else add_widget.caption
-                )
-                if add_caption == "Add another account (y/n)?:":
-                    if not isinstance(
-                        add_widget, HorizontalMultipleChoiceWidget
-                    ):
-                        raise ValueError(
-                            "Expected HorizontalMultipleChoiceWidget at index"
-                            f" {i + 4}"
-                        )
-                    if str(add_answer).lower() == "y":
-                        i += 5
-                        continue
-                    else:
-                        break
+        # Check for additional account
+        add_widget, add_answer = final_answers[i + 4]
+        if add_widget.question_data.question != ADD_ACCOUNT_QUESTION:
             break
-        else:
-            i += 1
+        if not isinstance(add_widget, HorizontalMultipleChoiceWidget):
+            raise ValueError(
+                f"Expected HorizontalMultipleChoiceWidget at index {i + 4}"
+            )
+        if str(add_answer).lower() != "y":
+            break
+        i += 5
     return account_transactions
 
 
@@ -220,27 +163,19 @@ def separate_account_transactions(
 
 def get_bought_and_returned_items(
     *,
-    final_answers: List[
-        Tuple[
-            Union[
-                DateTimeQuestion,
-                InputValidationQuestion,
-                VerticalMultipleChoiceWidget,
-                HorizontalMultipleChoiceWidget,
-            ],
-            Union[str, float, int, datetime],
-        ]
-    ],
+    answer_map: AnswerMap,
     account_infos: set[HledgerFlowAccountInfo],
     asset_accounts: set[str],
     average_receipt_category: str,
     the_date: datetime,
+    account_registry: Optional[AccountRegistry] = None,
 ) -> Tuple[None, ExchangedItem, Union[None, ExchangedItem]]:
     # Get the AccountTransactions.
     account_transactions: List[AccountTransaction] = get_accounts_from_answers(
-        final_answers=final_answers,
+        answer_map=answer_map,
         account_infos=account_infos,
         asset_accounts=asset_accounts,
+        account_registry=account_registry,
     )
 
     # Map currency string back to Enum.
@@ -1,6 +1,6 @@
+import logging
 from datetime import datetime
-from pprint import pprint
-from typing import Any, List, Optional, Tuple, Union
+from typing import List, Optional, Tuple, Union
 
 from hledger_preprocessor.receipt_transaction_matching.get_bank_data_from_transactions import (
     HledgerFlowAccountInfo,
@@ -12,8 +12,8 @@ from hledger_preprocessor.TransactionObjects.Receipt import (  # For image handl
     Receipt,
     ShopId,
 )
-from typeguard import typechecked
 
+from tui_labeller.instrumentation.Tracer import add_span_attributes, traced
 from tui_labeller.tuis.urwid.date_question.DateTimeQuestion import (
     DateTimeQuestion,
 )
@@ -26,11 +26,17 @@ from tui_labeller.tuis.urwid.multiple_choice_question.HorizontalMultipleChoiceWi
 from tui_labeller.tuis.urwid.multiple_choice_question.VerticalMultipleChoiceWidget import (
     VerticalMultipleChoiceWidget,
 )
+from tui_labeller.tuis.urwid.question_app.AnswerMap import AnswerMap
 from tui_labeller.tuis.urwid.receipts.account_parser import (
     get_bought_and_returned_items,
 )
+from tui_labeller.tuis.urwid.receipts.AccountRegistry import AccountRegistry
+from tui_labeller.typechecking import typechecked
 
+logger = logging.getLogger(__name__)
 
+
+@traced
 @typechecked
 def build_receipt_from_answers(
     *,
@@ -48,70 +54,23 @@ def build_receipt_from_answers(
     verbose: bool,
     account_infos: set[HledgerFlowAccountInfo],
     asset_accounts: set[str],
+    account_registry: Optional[AccountRegistry] = None,
 ) -> Receipt:
     """Builds a Receipt object from the dictionary of answers returned by
     tui.get_answers()
 
     Args:
         final_answers: Dictionary containing question widgets as keys and their answers as values
+        account_registry: Resolves the account answers, built from the
+            account_infos and asset_accounts if it is not passed.
 
     Returns:
         Receipt object with mapped values
     """
 
-    # Helper function to extract value from widget key
-    @typechecked
-    def get_widget(*, caption: str, required: Optional[bool] = False) -> any:
-        for index, answer in enumerate(final_answers):
-            widget, value = answer
-            # for widget, value in final_answers.items():
-            if hasattr(widget, "caption"):
-                if caption in widget.caption:
-                    # Convert empty strings to None for optional fields
-                    return widget
-        raise ValueError(f"Was not able to find widget with caption={caption}")
-
-    # Helper function to extract value from widget key
-    @typechecked
-    def get_value(*, caption: str, required: Optional[bool] = False) -> Any:
-        for index, answer in enumerate(final_answers):
-            widget, value = answer
-            # for widget, value in final_answers.items():
-            if hasattr(widget, "caption"):
-                if caption in widget.caption:
-                    # Convert empty strings to None for optional fields
-                    return value if value != "" else None
-            elif isinstance(widget, VerticalMultipleChoiceWidget):
-                if caption in widget.question_data.question:
-                    return value
-            elif isinstance(widget, HorizontalMultipleChoiceWidget):
-                if caption in widget.question_data.question:
-                    return value
-            else:
-                raise TypeError(f"Did not expect question widget type:{widget}")
-        if required:
-            pprint(final_answers)
-            raise ValueError(
-                f"Did not find the answer to:{caption}\n in the answers above."
-            )
-        return None
-
-    @typechecked
-    def get_float(*, caption) -> float:
-        found_caption: bool = False
-        for index, answer in enumerate(final_answers):
-            widget, value = answer
-            if hasattr(widget, "caption") and caption in widget.caption:
-                found_caption = True
-                # Convert empty strings to None for optional fields
-                return float(value) if value != "" else 0.0
-        if not found_caption:
-            print("\n")
-            pprint(final_answers)
-            raise ValueError(
-                f"Did not find caption:{caption} in above answers."
-            )
-        return 0.0
+    add_span_attributes(nr_of_answers=len(final_answers))
+    # Index the answers once, the lookups below are O(1).
+    answer_map: AnswerMap = AnswerMap(final_answers=final_answers)
 
     def build_address(
         street: Optional[str] = None,
@@ -129,56 +88,51 @@ def build_receipt_from_answers(
             country=country or None,
         )
 
-    average_receipt_category: str = get_value(
-        caption="\nBookkeeping expense category:", required=True
+    average_receipt_category: str = answer_map.get_value(
+        question_id="\nBookkeeping expense category:", required=True
     )
-    the_date: datetime = get_value(
-        caption="Receipt date and time:\n", required=True
+    the_date: datetime = answer_map.get_value(
+        question_id="Receipt date and time:\n", required=True
     )
     net_bought_items: Union[None, ExchangedItem]
     net_returned_items: Union[None, ExchangedItem]
     net_bought_items, net_returned_items = get_bought_and_returned_items(
-        final_answers=final_answers,
+        answer_map=answer_map,
         account_infos=account_infos,
         asset_accounts=asset_accounts,
         average_receipt_category=average_receipt_category,
         the_date=the_date,
+        account_registry=account_registry,
     )
 
     # Check if a shop address was selected from multiple choice
-    selected_addres_widget = get_widget(caption="Select Shop Address:")
+    selected_addres_widget = answer_map.get_widget(
+        question_id="address_selector"
+    )
     address_nr: int = selected_addres_widget.get_int_answer()
     if address_nr and address_nr != 0:
-        for index, answer in enumerate(final_answers):
-            widget, value = answer
-            if (
-                isinstance(widget, VerticalMultipleChoiceWidget)
-                and "Select Shop Address:" in widget.question_data.question
-            ):
-
-                # Assuming the extra_data contains shop_ids with address information
-                shop_id_data = widget.question_data.extra_data.get(
-                    "shop_ids", {}
-                )
-
-                # selected_shop = shop_id_data[address_nr]
-                selected_shop: ShopId = get_shop_id_from_choice(
-                    choice=widget.question_data.choices[address_nr],
-                    shop_ids=shop_id_data,
-                )
-                break
+        # Assuming the extra_data contains shop_ids with address information
+        shop_id_data = selected_addres_widget.question_data.extra_data.get(
+            "shop_ids", {}
+        )
+        selected_shop: ShopId = get_shop_id_from_choice(
+            choice=selected_addres_widget.question_data.choices[address_nr],
+            shop_ids=shop_id_data,
+        )
     else:
         shop_address = build_address(
-            street=get_value(caption="Shop street:") or None,
-            house_nr=get_value(caption="Shop house nr.:") or None,
-            zipcode=get_value(caption="Shop zipcode:") or None,
-            city=get_value(caption="Shop City:") or None,
-            country=get_value(caption="Shop country:") or None,
+            street=answer_map.get_value(question_id="shop_street"),
+            house_nr=answer_map.get_value(question_id="shop_house_nr"),
+            zipcode=answer_map.get_value(question_id="shop_zipcode"),
+            city=answer_map.get_value(question_id="shop_city"),
+            country=answer_map.get_value(question_id="shop_country"),
         )
         selected_shop: ShopId = ShopId(
-            name=get_value(caption="\nShop name:\n") or "",
+            name=answer_map.get_value(question_id="shop_name") or "",
             address=shop_address,
-            shop_account_nr=get_value(caption="\nShop account nr:\n"),
+            shop_account_nr=answer_map.get_value(
+                question_id="\nShop account nr:\n"
+            ),
         )
 
     # Map the answers to Receipt parameters
@@ -187,38 +141,21 @@ def build_receipt_from_answers(
         "net_bought_items": net_bought_items,
         "net_returned_items": net_returned_items,
         "the_date": the_date,
-        "subtotal": (
-            float(
-                get_value(
-                    caption="\nSubtotal (Optional, press enter to skip):\n"
-                )
-            )
-            if get_value(
-                caption="\nSubtotal (Optional, press enter to skip):\n"
-            )
-            else None
+        "subtotal": answer_map.get_float(
+            question_id="\nSubtotal (Optional, press enter to skip):\n"
         ),
-        "total_tax": (
-            float(
-                get_value(
-                    caption="\nTotal tax (Optional, press enter to skip):\n"
-                )
-            )
-            if get_value(
-                caption="\nTotal tax (Optional, press enter to skip):\n"
-            )
-            else None
+        "total_tax": answer_map.get_float(
+            question_id="\nTotal tax (Optional, press enter to skip):\n"
         ),
         # TODO: store amount payed and returned per account.
-        "receipt_owner_address": get_value(
-            caption="\nReceipt owner address (optional):\n"
+        "receipt_owner_address": answer_map.get_value(
+            question_id="\nReceipt owner address (optional):\n"
         ),
         "receipt_category": average_receipt_category,
     }
 
     if verbose:
-        pprint(receipt_params)
-        print("OK?")
+        logger.info("Built a receipt from the answers: %s", receipt_params)
     return Receipt(**receipt_params)
 
 
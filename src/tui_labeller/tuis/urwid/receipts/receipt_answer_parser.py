@@ -4,7 +4,6 @@ from typing import Dict, Union
 from hledger_preprocessor.TransactionObjects.Receipt import (  # For image handling
     Receipt,
 )
-from typeguard import typechecked
 
 from tui_labeller.target_objects import Receipt
 from tui_labeller.tuis.urwid.date_question.DateTimeQuestion import (
@@ -16,6 +15,7 @@ from tui_labeller.tuis.urwid.input_validation.InputValidationQuestion import (
 from tui_labeller.tuis.urwid.multiple_choice_question.VerticalMultipleChoiceWidget import (
     VerticalMultipleChoiceWidget,
 )
+from tui_labeller.typechecking import typechecked
 
 
 @typechecked
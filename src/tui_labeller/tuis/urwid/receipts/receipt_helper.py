@@ -1,12 +1,11 @@
 from typing import Any, List, Union
 
-from typeguard import typechecked
-
 from tui_labeller.tuis.urwid.question_data_classes import (
     AISuggestion,
     HistorySuggestion,
     InputValidationQuestionData,
 )
+from tui_labeller.typechecking import typechecked
 
 
 @typechecked
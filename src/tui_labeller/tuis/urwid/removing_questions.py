@@ -1,12 +1,12 @@
 from typing import List
 
 import urwid
-from typeguard import typechecked
 
 from tui_labeller.tuis.urwid.question_data_classes import (
     InputValidationQuestionData,
 )
 from tui_labeller.tuis.urwid.QuestionnaireApp import QuestionnaireApp
+from tui_labeller.typechecking import typechecked
 
 
 @typechecked
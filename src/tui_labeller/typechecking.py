@@ -0,0 +1,40 @@
+"""Runtime type checking that can be switched off in production.
+
+The modules of this package use the typechecked decorator of this
+module instead of the one of typeguard. By default it applies the
+typeguard checks, e.g. in the tests. If the TUI_LABELLER_TYPECHECK
+environment variable is "0" when a module is imported, the functions
+of that module are left unwrapped, so the keystroke handlers do not pay
+for the runtime checks. The entry point (__main__) switches the checks
+off unless the variable is set.
+"""
+
+import os
+from typing import TypeVar
+
+TYPECHECK_ENV_VAR: str = "TUI_LABELLER_TYPECHECK"
+
+T = TypeVar("T")
+
+
+def is_typechecking_enabled() -> bool:
+    """Returns True unless TUI_LABELLER_TYPECHECK is set to "0"."""
+    return os.environ.get(TYPECHECK_ENV_VAR, "1") != "0"
+
+
+def typechecked(target: T) -> T:
+    """Apply typeguard's typechecked to a function or class, if type
+    checking is enabled.
+
+    Args:
+        target: The decorated function or class.
+
+    Returns:
+        The type checked target, or the target itself if checks are off.
+    """
+    if not is_typechecking_enabled():
+        return target
+    # Imported here so production runs do not import typeguard.
+    from typeguard import typechecked as typeguard_typechecked
+
+    return typeguard_typechecked(target)
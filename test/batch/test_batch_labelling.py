@@ -0,0 +1,93 @@
+import pytest
+from hledger_preprocessor.receipt_transaction_matching.get_bank_data_from_transactions import (
+    HledgerFlowAccountInfo,
+)
+from hledger_preprocessor.TransactionObjects.Receipt import Address, ShopId
+
+from tui_labeller.batch.batch_labelling import (
+    get_image_paths,
+    get_output_json_path,
+    get_unlabelled_image_paths,
+    label_images,
+)
+from tui_labeller.batch.ReceiptPrefetcher import ReceiptPrefetcher
+from tui_labeller.file_read_write_helper import write_json_file
+from tui_labeller.headless.HeadlessScreen import HeadlessScreen
+from tui_labeller.results.ResultsSink import RESULTS_FILENAME
+from tui_labeller.tuis.urwid.question_app.addresses.ShopCatalogue import (
+    ShopCatalogue,
+)
+
+
+def test_labelled_images_are_skipped(tmp_path):
+    """Test only the images without an output json are queued, in order."""
+    image_dir = tmp_path / "images"
+    output_json_dir = tmp_path / "output"
+    image_dir.mkdir()
+    output_json_dir.mkdir()
+    for filename in ["2.jpg", "0.PNG", "1.jpeg", "notes.txt"]:
+        (image_dir / filename).write_text("")
+
+    image_paths = get_image_paths(image_dir=str(image_dir))
+    assert [path.split("/")[-1] for path in image_paths] == [
+        "0.PNG",
+        "1.jpeg",
+        "2.jpg",
+    ]
+
+    write_json_file(
+        filepath=get_output_json_path(
+            output_json_dir=str(output_json_dir), image_path=image_paths[1]
+        ),
+        content={"receipt_category": "groceries"},
+    )
+    assert get_unlabelled_image_paths(
+        image_paths=image_paths, output_json_dir=str(output_json_dir)
+    ) == [image_paths[0], image_paths[2]]
+
+
+def test_prefetched_receipts_get_new_shop_choices():
+    """Test the prepared receipts arrive in order, and that the shop choices
+    of a prepared receipt include the shops added after it was prepared."""
+    shop_catalogue = ShopCatalogue()
+    with ReceiptPrefetcher(
+        image_paths=["0.jpg", "1.jpg"],
+        account_infos={
+            HledgerFlowAccountInfo(
+                account_holder="holder", bank="bank", account_type="checking"
+            )
+        },
+        asset_accounts={"assets:gold"},
+        labelled_receipts=[],
+        shop_catalogue=shop_catalogue,
+    ) as prefetcher:
+        assert prefetcher.get().image_path == "0.jpg"
+        shop_catalogue.add_shop(
+            shop_identifier=ShopId(
+                name="bakery", address=Address(street="Broodstraat")
+            ),
+            category="groceries:bread",
+        )
+        prepared_receipt = prefetcher.get()
+
+    assert prepared_receipt.image_path == "1.jpg"
+    optional_questions = prepared_receipt.receipt_questions.optional_questions
+    address_selector = optional_questions.optional_questions[0]
+    assert address_selector.choices[1].startswith("bakery: ")
+    assert address_selector.extra_data["shop_ids"][1].name == "bakery"
+
+
+def test_invalid_results_raise_at_startup(tmp_path):
+    """Test an invalid results line, that seeds the history store, raises
+    when the session starts instead of during a keystroke."""
+    (tmp_path / RESULTS_FILENAME).write_text('{"kind": "rec\n{}\n')
+
+    with pytest.raises(ValueError, match="Invalid results line"):
+        label_images(
+            image_paths=[],
+            output_json_dir=str(tmp_path),
+            account_infos=set(),
+            asset_accounts={"assets:gold"},
+            shop_catalogue=ShopCatalogue(),
+            screen=HeadlessScreen(),
+        )
@@ -0,0 +1,48 @@
+import pytest
+
+from tui_labeller.instrumentation.KeyLatencyMonitor import (
+    INPUT,
+    RENDER,
+    SUGGESTIONS,
+    TOTAL,
+    KeyLatencyMonitor,
+    suggestion_phase,
+)
+
+
+@suggestion_phase
+def update_suggestions(*, depth: int) -> None:
+    if depth:
+        update_suggestions(depth=depth - 1)
+
+
+def test_rolling_window_percentiles(monkeypatch):
+    """Test only the last window_size keys are kept per question type, and
+    that a key that is not rendered has no render time."""
+    # The started key sets the active monitor, which is reset after the
+    # test so later questionnaires are not timed.
+    monkeypatch.setattr(KeyLatencyMonitor, "active", None)
+    key_latency_monitor = KeyLatencyMonitor(window_size=10)
+    for _ in range(25):
+        key_latency_monitor.start_key(question_type="DateTimeQuestion")
+        update_suggestions(depth=2)
+        key_latency_monitor.end_input()
+        key_latency_monitor.end_render()
+    key_latency_monitor.start_key(question_type="DateTimeQuestion")
+    key_latency_monitor.end_input()
+    key_latency_monitor.start_key(question_type="InputValidationQuestion")
+
+    latencies = key_latency_monitor.latencies["DateTimeQuestion"]
+    assert key_latency_monitor.nr_of_keys == {"DateTimeQuestion": 26}
+    assert len(latencies[TOTAL]) == 10
+    assert len(latencies[RENDER]) == 10
+    assert latencies[TOTAL][-1] == pytest.approx(
+        latencies[INPUT][-1] + latencies[SUGGESTIONS][-1]
+    )
+    assert latencies[SUGGESTIONS][-2] > 0
+    percentiles = key_latency_monitor.get_percentiles(
+        question_type="DateTimeQuestion"
+    )
+    assert list(percentiles) == [50, 95, 99]
+    assert percentiles[50] <= percentiles[95] <= percentiles[99]
+    assert KeyLatencyMonitor.active is key_latency_monitor
@@ -0,0 +1,38 @@
+import json
+
+from tui_labeller.instrumentation.MemoryMonitor import MemoryMonitor
+
+
+class App:
+    pass
+
+
+def test_surviving_apps_are_reported_as_leaked(tmp_path):
+    """Test an app that is dropped after its receipt is not counted, and an
+    app that is kept alive is counted as leaked."""
+    memory_monitor = MemoryMonitor(nr_of_frames=1)
+    memory_monitor.start()
+    try:
+        memory_monitor.track_app(app=App())
+        first = memory_monitor.snapshot_receipt(image_path="a.jpg")
+        kept_app = App()
+        memory_monitor.track_app(app=kept_app)
+        second = memory_monitor.snapshot_receipt(image_path="b.jpg")
+    finally:
+        memory_monitor.stop()
+    assert first["leaked_questionnaire_apps"] == 0
+    assert second["leaked_questionnaire_apps"] == 1
+    assert second["traced_bytes"] > 0
+
+    filepath = str(tmp_path / "memory.json")
+    memory_monitor.write(filepath=filepath)
+    with open(filepath, encoding="utf-8") as report_file:
+        report = json.load(report_file)
+    assert [receipt["image_path"] for receipt in report["receipts"]] == [
+        "a.jpg",
+        "b.jpg",
+    ]
+    assert "top_allocation_sites" in report
+    assert "top_growth_sites" in report
+    assert MemoryMonitor.active is None
+    assert kept_app is not None
@@ -0,0 +1,64 @@
+import time
+
+from tui_labeller.instrumentation.SamplingProfiler import (
+    IDLE,
+    SUMMARY_SUFFIX,
+    SamplingProfiler,
+    get_subsystem,
+)
+
+
+def test_get_subsystem():
+    """Test the innermost subsystem of a stack is used, and that waiting
+    for a key is idle."""
+    assert (
+        get_subsystem(
+            module_names=[
+                "urwid.widget.pile",
+                "tui_labeller.tuis.urwid.question_app.addresses.ShopCatalogue",
+                "tui_labeller.tuis.urwid.appending_questions",
+                "__main__",
+            ]
+        )
+        == "address ranking"
+    )
+    assert (
+        get_subsystem(
+            module_names=[
+                "urwid.widget.pile",
+                "tui_labeller.tuis.urwid.appending_questions",
+            ]
+        )
+        == "reconfiguration"
+    )
+    assert get_subsystem(module_names=["urwid.canvas", "__main__"]) == (
+        "widgets"
+    )
+    assert get_subsystem(module_names=["selectors", "urwid.x"]) == IDLE
+
+
+def busy_wait(*, duration: float) -> None:
+    end: float = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        pass
+
+
+def test_sampling_profiler_writes_collapsed_stacks(tmp_path):
+    """Test the main thread is sampled and written as collapsed stacks with
+    the subsystem as root frame, and a summary."""
+    with SamplingProfiler(interval=0.001) as sampling_profiler:
+        busy_wait(duration=0.2)
+    filepath = str(tmp_path / "session.collapsed")
+    sampling_profiler.write(filepath=filepath)
+
+    assert sampling_profiler.nr_of_samples > 10
+    with open(filepath, encoding="utf-8") as collapsed_file:
+        lines = collapsed_file.read().splitlines()
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == (
+        sampling_profiler.nr_of_samples
+    )
+    assert any(
+        line.startswith("other;") and ":busy_wait " in line for line in lines
+    )
+    with open(f"{filepath}{SUMMARY_SUFFIX}", encoding="utf-8") as summary:
+        assert "other" in summary.read()
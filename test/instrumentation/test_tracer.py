@@ -0,0 +1,38 @@
+import json
+
+from tui_labeller.instrumentation.Tracer import (
+    Tracer,
+    add_span_attributes,
+    span,
+    traced,
+)
+
+
+@traced
+def reconfigure(*, nr_of_questions: int) -> int:
+    add_span_attributes(nr_of_questions=nr_of_questions)
+    return nr_of_questions
+
+
+def test_nested_spans_are_written_as_chrome_trace(tmp_path):
+    """Test the spans nest in time, keep their attributes, and are only
+    recorded while the tracer is active."""
+    reconfigure(nr_of_questions=1)
+    tracer = Tracer()
+    tracer.start()
+    with span("label_receipt", image_path="a.jpg"):
+        assert reconfigure(nr_of_questions=20) == 20
+    tracer.stop()
+    reconfigure(nr_of_questions=3)
+    filepath = str(tmp_path / "session.trace.json")
+    tracer.write(filepath=filepath)
+
+    with open(filepath, encoding="utf-8") as trace_file:
+        events = json.load(trace_file)["traceEvents"]
+    assert [event["ph"] for event in events] == ["M", "X", "X"]
+    inner, outer = events[1], events[2]
+    assert inner["name"] == "reconfigure"
+    assert inner["args"] == {"nr_of_questions": 20}
+    assert outer["args"] == {"image_path": "a.jpg"}
+    assert outer["ts"] <= inner["ts"]
+    assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
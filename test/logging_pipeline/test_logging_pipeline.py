@@ -0,0 +1,45 @@
+import logging
+import threading
+
+from tui_labeller.logging_pipeline import (
+    LOGGER_NAME,
+    DeferredQueueHandler,
+    configure_logging,
+)
+
+
+def test_records_are_written_by_the_listener_thread(tmp_path):
+    """Test the records of the package loggers above the level are
+    formatted and written by the listener thread, not the caller."""
+    log_filepath = str(tmp_path / "log.txt")
+    queue_listener = configure_logging(
+        log_level="INFO", log_filepath=log_filepath
+    )
+    logger = logging.getLogger(f"{LOGGER_NAME}.tuis.urwid.QuestionnaireApp")
+    formatting_threads = []
+
+    class Answer:
+        def __str__(self):
+            formatting_threads.append(threading.current_thread())
+            return "groceries"
+
+    try:
+        logger.debug("Skipped %s", Answer())
+        logger.info("Answer=%s", Answer())
+    finally:
+        queue_listener.stop()
+        package_logger = logging.getLogger(LOGGER_NAME)
+        for handler in list(package_logger.handlers):
+            if isinstance(handler, DeferredQueueHandler):
+                package_logger.removeHandler(handler)
+        package_logger.propagate = True
+        package_logger.setLevel(logging.NOTSET)
+
+    with open(log_filepath, encoding="utf-8") as log_file:
+        lines = log_file.read().splitlines()
+    assert len(lines) == 1
+    assert lines[0].endswith(
+        "INFO tui_labeller.tuis.urwid.QuestionnaireApp - Answer=groceries"
+    )
+    assert len(formatting_threads) == 1
+    assert formatting_threads[0] is not threading.current_thread()
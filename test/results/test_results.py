@@ -0,0 +1,87 @@
+import os
+from datetime import datetime
+
+from tui_labeller.results.AnswerJournal import AnswerJournal
+from tui_labeller.results.NdjsonWriter import NdjsonWriter
+from tui_labeller.results.results_reader import read_results
+
+
+def test_read_results_skips_partial_last_line(tmp_path):
+    """Test the records are read back per kind, and that a partial last line
+    of an interrupted write is skipped."""
+    filepath = str(tmp_path / "results.ndjson")
+    with NdjsonWriter(filepath=filepath, fsync_every=2) as writer:
+        writer.write(record={"kind": "answers", "answers": {"a": 1}})
+        writer.write(record={"kind": "receipt", "image_path": "a.jpg"})
+        writer.write(record={"kind": "answers", "answers": {"b": None}})
+    with open(filepath, "a", encoding="utf-8") as results_file:
+        results_file.write('{"kind": "rec')
+
+    assert len(list(read_results(filepath=filepath))) == 3
+    assert list(read_results(filepath=filepath, kind="receipt")) == [
+        {"kind": "receipt", "image_path": "a.jpg"}
+    ]
+
+
+def test_append_after_partial_last_line(tmp_path):
+    """Test a partial last line is truncated before the next session appends,
+    so the new records stay readable."""
+    filepath = str(tmp_path / "results.ndjson")
+    with NdjsonWriter(filepath=filepath) as writer:
+        writer.write(record={"kind": "a"})
+    with open(filepath, "a", encoding="utf-8") as results_file:
+        results_file.write('{"kind": "rec')
+
+    with NdjsonWriter(filepath=filepath) as writer:
+        writer.write(record={"kind": "b"})
+
+    assert list(read_results(filepath=filepath)) == [
+        {"kind": "a"},
+        {"kind": "b"},
+    ]
+
+
+def test_answer_journal_replays_last_answers(tmp_path):
+    """Test a reopened journal restores the last answer per question and the
+    focus, and that unchanged answers are not appended."""
+    filepath = str(tmp_path / "a.journal.ndjson")
+    with AnswerJournal(filepath=filepath) as answer_journal:
+        assert answer_journal.record_answer(question_id="amount", answer=1.5)
+        assert not answer_journal.record_answer(
+            question_id="amount", answer=1.5
+        )
+        answer_journal.record_answer(
+            question_id="date", answer=datetime(2025, 1, 2, 3, 4)
+        )
+        answer_journal.record_answer(question_id="shop", answer="bakery")
+        answer_journal.record_answer(question_id="shop", answer=None)
+        answer_journal.record_focus(question_id="shop")
+
+    resumed = AnswerJournal(filepath=filepath)
+    assert resumed.state.answers == {
+        "amount": 1.5,
+        "date": "2025-01-02T03:04:00",
+    }
+    assert resumed.state.focus_question_id == "shop"
+    assert not resumed.record_answer(question_id="amount", answer=1.5)
+    resumed.discard()
+    assert not os.path.exists(filepath)
+
+
+def test_answer_journal_resumes_after_partial_last_line(tmp_path):
+    """Test a journal with a partial last line resumes from its complete
+    records, and that the resumed journal stays readable."""
+    filepath = str(tmp_path / "a.journal.ndjson")
+    with AnswerJournal(filepath=filepath) as answer_journal:
+        answer_journal.record_answer(question_id="amount", answer=1.5)
+    with open(filepath, "a", encoding="utf-8") as journal_file:
+        journal_file.write('{"kind": "answer", "question_id": "sh')
+
+    with AnswerJournal(filepath=filepath) as resumed:
+        assert resumed.state.answers == {"amount": 1.5}
+        resumed.record_answer(question_id="shop", answer="bakery")
+
+    assert AnswerJournal(filepath=filepath).state.answers == {
+        "amount": 1.5,
+        "shop": "bakery",
+    }
@@ -0,0 +1,59 @@
+import os
+from collections import Counter
+
+from tui_labeller.synthetic.CorpusGenerator import (
+    CorpusGenerator,
+    write_corpus,
+)
+from tui_labeller.tuis.urwid.question_app.addresses.ShopCatalogue import (
+    SHOP_CATALOGUE_FILENAME,
+    ShopCatalogue,
+)
+
+
+def test_corpus_is_seeded_and_zipf_distributed():
+    """Test the same seed gives the same corpus, and that the most popular
+    shop is drawn far more often than the least popular one."""
+    receipts = list(
+        CorpusGenerator(seed=3, nr_of_shops=50).generate_receipts(
+            nr_of_receipts=2000
+        )
+    )
+    assert receipts == list(
+        CorpusGenerator(seed=3, nr_of_shops=50).generate_receipts(
+            nr_of_receipts=2000
+        )
+    )
+
+    corpus_generator = CorpusGenerator(seed=3, nr_of_shops=50)
+    shop_counts = Counter(
+        corpus_generator.shops.index(receipt.shop_identifier)
+        for receipt in receipts
+    )
+    assert shop_counts[0] > 10 * shop_counts[49]
+
+
+def test_write_corpus(tmp_path):
+    """Test a json is written per receipt, and a shop catalogue with the
+    shops of the receipts."""
+    corpus_generator = CorpusGenerator(seed=0, nr_of_shops=20)
+    assert (
+        write_corpus(
+            receipts=corpus_generator.generate_receipts(nr_of_receipts=100),
+            output_json_dir=str(tmp_path),
+        )
+        == 100
+    )
+    assert len(list(tmp_path.glob("receipt_*.json"))) == 100
+
+    shop_catalogue = ShopCatalogue.load(
+        filepath=os.path.join(tmp_path, SHOP_CATALOGUE_FILENAME)
+    )
+    assert 0 < len(shop_catalogue.shop_ids) <= 20
+    assert (
+        sum(
+            sum(category_counts.values())
+            for category_counts in shop_catalogue.category_counts.values()
+        )
+        == 100
+    )
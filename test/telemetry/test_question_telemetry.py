@@ -0,0 +1,89 @@
+from tui_labeller.headless.HeadlessScreen import HeadlessScreen
+from tui_labeller.results.results_reader import read_results
+from tui_labeller.telemetry.QuestionTelemetry import QuestionTelemetry
+from tui_labeller.telemetry.rank_questions import rank_questions
+from tui_labeller.tuis.urwid.input_validation.InputType import InputType
+from tui_labeller.tuis.urwid.question_app.generator import (
+    create_questionnaire,
+)
+from tui_labeller.tuis.urwid.question_data_classes import (
+    AISuggestion,
+    InputValidationQuestionData,
+)
+
+
+def get_question(*, question_id: str, ai_suggestions=()):
+    return InputValidationQuestionData(
+        question=f"{question_id}:",
+        input_type=InputType.LETTERS,
+        ans_required=False,
+        reconfigurer=False,
+        terminator=False,
+        ai_suggestions=list(ai_suggestions),
+        history_suggestions=[],
+        question_id=question_id,
+    )
+
+
+def test_visits_are_recorded_and_ranked(tmp_path):
+    """Test the keys, the accepted AI suggestion and the revisits
+    (reversals) are recorded per visit, and aggregated per question_id."""
+    filepath = str(tmp_path / "metrics.ndjson")
+    question_telemetry = QuestionTelemetry(filepath=filepath, session_id="s")
+    question_telemetry.start()
+    try:
+        app = create_questionnaire(
+            header="Test",
+            questions=[
+                get_question(
+                    question_id="category",
+                    ai_suggestions=[
+                        AISuggestion(
+                            question="groceries",
+                            probability=0.9,
+                            model_name="model",
+                        )
+                    ],
+                ),
+                get_question(question_id="shop"),
+            ],
+            labelled_receipts=[],
+            screen=HeadlessScreen(),
+        )
+        app.pile.focus_position = app.nr_of_headers
+        # Accept the AI suggestion, type in the shop, go back and forth.
+        for key in ["meta u", "a", "b", "up", "down"]:
+            app.loop.process_input([key])
+    finally:
+        question_telemetry.stop()
+
+    visits = list(read_results(filepath=filepath, kind="question_visit"))
+    assert [
+        (
+            visit["question_id"],
+            visit["nr_of_keys"],
+            visit["accepted_suggestion"],
+            visit["reversal"],
+        )
+        for visit in visits
+    ] == [
+        ("category", 1, "ai", False),
+        ("shop", 3, None, False),
+        ("category", 1, None, True),
+        ("shop", 0, None, True),
+    ]
+    assert all(visit["dwell_s"] >= 0 for visit in visits)
+
+    rows = {
+        row["question_id"]: row
+        for row in rank_questions(
+            filepaths=[filepath], sort_by="keys_per_answer"
+        )
+    }
+    assert rows["category"]["nr_of_answers"] == 1
+    assert rows["category"]["keys_per_answer"] == 2
+    assert rows["category"]["ai_accepted"] == 1.0
+    assert rows["category"]["nr_of_reversals"] == 1
+    assert rows["shop"]["keys_per_answer"] == 3
+    assert rows["shop"]["nr_of_reversals"] == 1
+    assert QuestionTelemetry.active is None
@@ -0,0 +1,68 @@
+import pytest
+from hledger_preprocessor.receipt_transaction_matching.get_bank_data_from_transactions import (
+    HledgerFlowAccountInfo,
+)
+from hledger_preprocessor.TransactionObjects.Receipt import AssetType
+
+from tui_labeller.tuis.urwid.receipts.AccountRegistry import AccountRegistry
+
+ACCOUNT_INFO: HledgerFlowAccountInfo = HledgerFlowAccountInfo(
+    account_holder="account_placeholder",
+    bank="bank_placeholder",
+    account_type="account_type_placeholder",
+)
+BANK_ACCOUNT: str = ACCOUNT_INFO.to_colon_separated_string()
+
+
+@pytest.fixture
+def account_registry() -> AccountRegistry:
+    return AccountRegistry(
+        account_infos={ACCOUNT_INFO},
+        asset_accounts={"assets:gold", "assets:btc:2342323"},
+    )
+
+
+def test_resolve(account_registry: AccountRegistry):
+    """Test the bank and asset accounts resolve to their Account."""
+    bank_account = account_registry.resolve(account_name=BANK_ACCOUNT)
+    assert bank_account.asset_type == AssetType.BANK
+    assert bank_account.bank == "bank_placeholder"
+
+    asset_account = account_registry.resolve(account_name="Assets:Gold")
+    assert asset_account.asset_type == AssetType.ASSET
+    assert asset_account.asset_category == "Assets:Gold"
+
+    with pytest.raises(ValueError, match="No account found"):
+        account_registry.resolve(account_name="assets:silver")
+    with pytest.raises(ValueError, match="Multiple accounts"):
+        AccountRegistry(
+            account_infos=set(), asset_accounts={"assets:gold", "Assets:Gold"}
+        ).resolve(account_name="assets:gold")
+
+
+def test_available_options(account_registry: AccountRegistry):
+    """Test the available options are only recomputed if the selection
+    changes."""
+    assert account_registry.get_available_options() == [
+        BANK_ACCOUNT,
+        "assets:btc:2342323",
+        "assets:gold",
+    ]
+
+    account_registry.set_selected(account_names={"assets:gold"})
+    available_options = account_registry.get_available_options()
+    assert available_options == [BANK_ACCOUNT, "assets:btc:2342323"]
+
+    account_registry.set_selected(account_names=["assets:gold"])
+    assert account_registry.get_available_options() is available_options
+
+
+def test_from_account_names():
+    """Test the colon separated bank accounts are parsed, and the asset
+    accounts skipped."""
+    account_registry = AccountRegistry.from_account_names(
+        account_names=[BANK_ACCOUNT, "assets:gold"],
+        asset_accounts={"assets:gold"},
+    )
+    assert account_registry.account_infos == {ACCOUNT_INFO}
+    assert account_registry.bank_account_names == [BANK_ACCOUNT]
@@ -0,0 +1,74 @@
+from hledger_preprocessor.receipt_transaction_matching.get_bank_data_from_transactions import (
+    HledgerFlowAccountInfo,
+)
+
+from tui_labeller.tuis.urwid.question_app.AnswerMap import (
+    AnswerMap,
+    get_question_key,
+)
+from tui_labeller.tuis.urwid.question_app.generator import create_questionnaire
+from tui_labeller.tuis.urwid.question_app.reconfiguration.adding_questions import (
+    handle_add_account,
+)
+from tui_labeller.tuis.urwid.receipts.account_parser import (
+    get_accounts_from_answers,
+)
+from tui_labeller.tuis.urwid.receipts.AccountQuestions import AccountQuestions
+from tui_labeller.tuis.urwid.receipts.OptionalQuestions import OptionalQuestions
+
+
+def test_all_account_blocks_are_parsed():
+    """Test the answers are keyed by unique question id, and that a second
+    account block is parsed if another account was added."""
+    account_info = HledgerFlowAccountInfo(
+        account_holder="holder", bank="bank", account_type="checking"
+    )
+    account_questions = AccountQuestions(
+        account_infos=[account_info.to_colon_separated_string()],
+        asset_accounts={"assets:gold"},
+    )
+    app = create_questionnaire(
+        questions=account_questions.account_questions
+        + OptionalQuestions(labelled_receipts=[]).optional_questions,
+        header="Answer the receipt questions.",
+        labelled_receipts=[],
+    )
+    handle_add_account(
+        tui=app, account_questions=account_questions, selected_accounts=set()
+    )
+    answers = {
+        "Belongs to bank/asset_accounts:": "holder:bank:checking",
+        "Currency:": "EUR",
+        "Amount paid from account:": 12.5,
+        "Change returned to account:": 0.0,
+        "Add another account (y/n)?": "y",
+        "Belongs to bank/asset_accounts:_2": "assets:gold",
+        "Currency:_2": "EUR",
+        "Amount paid from account:_2": 3.0,
+        "Change returned to account:_2": 1.0,
+        "Add another account (y/n)?_2": "n",
+    }
+    widgets = [input_widget.base_widget for input_widget in app.inputs]
+    answer_map = AnswerMap(
+        final_answers=[
+            (widget, answers.get(get_question_key(widget=widget), ""))
+            for widget in widgets
+        ]
+    )
+    assert answer_map.get_value(question_id="Currency:_2") == "EUR"
+    assert answer_map.get_widget(question_id="address_selector") in widgets
+    assert (
+        answer_map.get_float(
+            question_id="\nSubtotal (Optional, press enter to skip):\n"
+        )
+        is None
+    )
+
+    account_transactions = get_accounts_from_answers(
+        answer_map=answer_map,
+        account_infos={account_info},
+        asset_accounts={"assets:gold"},
+    )
+    assert [
+        transaction.amount_paid for transaction in account_transactions
+    ] == [12.5, 3.0]
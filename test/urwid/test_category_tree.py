@@ -0,0 +1,143 @@
+import urwid
+
+from tui_labeller.tuis.urwid.input_validation.InputType import InputType
+from tui_labeller.tuis.urwid.input_validation.InputValidationQuestion import (
+    InputValidationQuestion,
+)
+from tui_labeller.tuis.urwid.multiple_choice_question.VerticalMultipleChoiceWidget import (
+    VerticalMultipleChoiceWidget,
+)
+from tui_labeller.tuis.urwid.question_app.CategoryTree import CategoryTree
+from tui_labeller.tuis.urwid.question_app.HistoryStore import HistoryStore
+from tui_labeller.tuis.urwid.question_data_classes import (
+    InputValidationQuestionData,
+    VerticalMultipleChoiceQuestionData,
+)
+
+
+def test_children_are_ranked_and_segments_completed():
+    """Test the children of a level are ranked by the uses below them, and
+    that a segment is completed to its single match or common prefix."""
+    category_tree = CategoryTree(
+        categories=[
+            "expenses:wholefoods:groceries",
+            "expenses:wholefoods:bakery",
+            "expenses:rent",
+            "assets:btc:2342323",
+        ]
+    )
+    category_tree.record_use(category="expenses:wholefoods:bakery")
+    category_tree.record_use(category="expenses:wholefoods:bakery")
+    category_tree.record_use(category="assets:btc:2342323")
+
+    assert category_tree.get_children(path="") == ["expenses", "assets"]
+    assert category_tree.get_children(path="expenses:wholefoods") == [
+        "expenses:wholefoods:bakery",
+        "expenses:wholefoods:groceries",
+    ]
+    assert category_tree.get_children(path="unknown") == []
+
+    assert category_tree.complete_segment(text="exp") == "expenses:"
+    assert category_tree.complete_segment(text="expenses:W") == (
+        "expenses:wholefoods:"
+    )
+    assert category_tree.complete_segment(text="expenses:rent") == (
+        "expenses:rent"
+    )
+    assert category_tree.complete_segment(text="x") == "x"
+    category_tree.add(category="expenses:wholesale")
+    assert category_tree.complete_segment(text="expenses:w") == (
+        "expenses:whole"
+    )
+
+
+def test_drill_down_selects_a_choice_level_by_level():
+    """Test a vertical multiple choice question with more choices than fit
+    in a batch is answered level by level, the most used first."""
+    choices = [f"assets:account{i}" for i in range(20)] + [
+        "holder:bank:checking",
+        "holder:bank:saving",
+    ]
+    history_store = HistoryStore()
+    history_store.add(
+        question_id="Belongs to:", answer="holder:bank:saving", timestamp=0.0
+    )
+    question_data = VerticalMultipleChoiceQuestionData(
+        question="Belongs to:",
+        choices=choices,
+        nr_of_ans_per_batch=8,
+        ans_required=True,
+        reconfigurer=False,
+        terminator=False,
+        ai_suggestions=[],
+        drill_down=True,
+    )
+    widget = VerticalMultipleChoiceWidget(
+        question_data=question_data, history_store=history_store
+    )
+    widget.owner = urwid.AttrMap(widget, "normal")
+    assert widget._get_batch_caption().splitlines()[2:] == [
+        " :",
+        "  0 holder:",
+        "  1 assets:",
+    ]
+
+    assert widget.keypress((40,), "0") is None
+    assert widget._get_level_choices() == ["holder:bank"]
+    widget.keypress((40,), "0")
+    assert widget._get_level_choices() == [
+        "holder:bank:saving",
+        "holder:bank:checking",
+    ]
+    assert not widget.has_answer()
+
+    # Back up to the top level, into assets, where 1 waits for a 2nd digit.
+    widget.keypress((40,), "backspace")
+    widget.keypress((40,), "backspace")
+    widget.keypress((40,), "1")
+    widget.keypress((40,), "1")
+    assert widget.get_edit_text() == "1"
+    assert widget.keypress((40,), "2") == "next_question"
+    assert widget.get_answer() == "assets:account12"
+
+    widget.set_answer("holder:bank:checking")
+    assert widget.get_answer() == "holder:bank:checking"
+
+    # Enter on a selected choice keeps it and moves on.
+    assert widget.keypress((40,), "enter") == "next_question"
+    assert widget.get_answer() == "holder:bank:checking"
+
+
+def test_tab_completes_a_category_segment_by_segment():
+    """Test tab completes the current segment of a category if the input
+    matches multiple suggestions."""
+    history_store = HistoryStore()
+    history_store.add_answers(
+        answers={"category": "expenses:wholefoods:groceries"}
+    )
+    history_store.add_answers(
+        answers={"category": "expenses:wholefoods:bakery"}
+    )
+    widget = InputValidationQuestion(
+        question_data=InputValidationQuestionData(
+            question="Category:",
+            input_type=InputType.LETTERS_SEMICOLON,
+            ans_required=True,
+            reconfigurer=False,
+            terminator=False,
+            ai_suggestions=[],
+            history_suggestions=[],
+            question_id="category",
+        ),
+        history_store=history_store,
+    )
+    widget.owner = urwid.AttrMap(widget, "normal")
+    widget.set_edit_text("exp")
+    widget.set_edit_pos(3)
+    widget.keypress((40,), "tab")
+    assert widget.get_edit_text() == "expenses:"
+    widget.keypress((40,), "tab")
+    assert widget.get_edit_text() == "expenses:wholefoods:"
+    widget.keypress((40,), "g")
+    assert widget.keypress((40,), "tab") == "next_question"
+    assert widget.get_edit_text() == "expenses:wholefoods:groceries"
@@ -0,0 +1,45 @@
+from tui_labeller.tuis.urwid.multiple_choice_question.VerticalMultipleChoiceWidget import (
+    VerticalMultipleChoiceWidget,
+)
+from tui_labeller.tuis.urwid.question_data_classes import (
+    AISuggestion,
+    VerticalMultipleChoiceQuestionData,
+)
+
+
+def test_captions_follow_replaced_choices():
+    """Test the batch caption shows the AI suggestion of a choice, and that
+    the captions are rebuilt when the choices of the question are replaced."""
+    question_data = VerticalMultipleChoiceQuestionData(
+        question="Belongs to:",
+        choices=[f"assets:account{i}" for i in range(40)],
+        nr_of_ans_per_batch=8,
+        ans_required=True,
+        reconfigurer=False,
+        terminator=False,
+        ai_suggestions=[
+            AISuggestion(
+                question="assets:account16", probability=0.5, model_name="a"
+            ),
+            AISuggestion(
+                question="assets:account16", probability=0.9, model_name="b"
+            ),
+        ],
+    )
+    widget = VerticalMultipleChoiceWidget(question_data=question_data)
+    widget._navigate_to_next_batch()
+    caption_lines = widget._get_batch_caption().splitlines()
+    assert caption_lines[1] == "Belongs to:"
+    assert caption_lines[2].startswith(" 15 assets:account15 ")
+    assert caption_lines[3] == " 16 assets:account16  0.90 b"
+    assert len(caption_lines) == 2 + VerticalMultipleChoiceWidget.BATCH_SIZE
+
+    question_data.choices = ["assets:gold", "assets:silver"]
+    widget.refresh_choices()
+    assert widget.current_batch == 0
+    assert widget._get_batch_caption().splitlines()[2:] == [
+        " 0 assets:gold    ",
+        " 1 assets:silver  ",
+    ]
+    widget.set_answer("assets:silver")
+    assert widget.get_answer() == "assets:silver"
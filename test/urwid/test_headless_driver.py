@@ -0,0 +1,104 @@
+import json
+
+from hledger_preprocessor.receipt_transaction_matching.get_bank_data_from_transactions import (
+    HledgerFlowAccountInfo,
+)
+
+from tui_labeller.headless.HeadlessDriver import HeadlessDriver
+from tui_labeller.headless.HeadlessScreen import HeadlessScreen
+from tui_labeller.headless.key_scripts import read_key_script, write_key_script
+from tui_labeller.instrumentation.KeyLatencyMonitor import KeyLatencyMonitor
+from tui_labeller.tuis.urwid.ask_urwid_receipt import build_receipt_from_urwid
+
+# Two accounts pay for the receipt, the second one is added with "y".
+RECEIPT_KEYS = (
+    ["enter"]
+    + list("groceries:ekoplaza")
+    + ["enter", "0", "enter", "0", "enter"]
+    + list("12.5")
+    + ["enter", "0", "enter", "enter"]
+    + ["0", "enter", "0", "enter", "3", "enter", "0", "enter", "tab", "enter"]
+    + ["0", "enter"]
+    + list("ekoplaza")
+    + ["enter"]
+    + list("Groenestraat")
+    + ["enter", "1", "enter"]
+    + list("6531HE")
+    + ["enter"]
+    + list("Nijmegen")
+    + ["enter"]
+    + list("Netherlands")
+    + ["enter", "enter", "enter", "enter"]
+)
+
+
+class RenderingDriver(HeadlessDriver):
+    """Keeps the text of the questionnaire at the start of each run."""
+
+    def run(self, *, loop):
+        self.text = b"\n".join(loop.widget.render((160, 80)).text).decode()
+        super().run(loop=loop)
+
+
+def test_replay_key_script(tmp_path):
+    """Test a key script fills a receipt, including the reconfiguration runs
+    that add the second account and the manual address questions, under
+    the header of the receipt."""
+    key_script = str(tmp_path / "receipt.keys")
+    write_key_script(filepath=key_script, keys=RECEIPT_KEYS)
+    headless_driver = RenderingDriver(keys=read_key_script(filepath=key_script))
+
+    receipt = build_receipt_from_urwid(
+        account_infos={
+            HledgerFlowAccountInfo(
+                account_holder="account_placeholder",
+                bank="bank_placeholder",
+                account_type="account_type_placeholder",
+            )
+        },
+        asset_accounts={"assets:gold"},
+        labelled_receipts=[],
+        screen=HeadlessScreen(),
+        headless_driver=headless_driver,
+        header="1/3 receipts/0.jpg",
+    )
+
+    assert receipt.receipt_category == "groceries:ekoplaza"
+    assert receipt.shop_identifier.address.city == "Nijmegen"
+    assert len(receipt.net_bought_items.account_transactions) == 2
+    assert headless_driver.nr_of_runs > 1
+    assert len(headless_driver.key_latencies) == len(RECEIPT_KEYS)
+    assert headless_driver.text.startswith("1/3 receipts/0.jpg")
+
+
+def test_key_latency_monitor(tmp_path):
+    """Test each replayed key is timed per question type, with the suggestion
+    updates split off, and that the report is dumped."""
+    key_latency_monitor = KeyLatencyMonitor(show_hud=True)
+    build_receipt_from_urwid(
+        account_infos={
+            HledgerFlowAccountInfo(
+                account_holder="account_placeholder",
+                bank="bank_placeholder",
+                account_type="account_type_placeholder",
+            )
+        },
+        asset_accounts={"assets:gold"},
+        labelled_receipts=[],
+        screen=HeadlessScreen(),
+        headless_driver=HeadlessDriver(keys=RECEIPT_KEYS),
+        key_latency_monitor=key_latency_monitor,
+    )
+    report_filepath = str(tmp_path / "key_latencies.json")
+    key_latency_monitor.dump(filepath=report_filepath)
+
+    assert sum(key_latency_monitor.nr_of_keys.values()) == len(RECEIPT_KEYS)
+    with open(report_filepath, encoding="utf-8") as report_file:
+        question_types = json.load(report_file)["question_types"]
+    assert (
+        question_types["InputValidationQuestion"]["phases"]["suggestions"][
+            "p99_ms"
+        ]
+        > 0
+    )
+    assert "VerticalMultipleChoiceWidget" in question_types
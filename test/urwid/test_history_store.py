@@ -0,0 +1,103 @@
+from tui_labeller.headless.HeadlessScreen import HeadlessScreen
+from tui_labeller.tuis.urwid.input_validation.InputType import InputType
+from tui_labeller.tuis.urwid.question_app.generator import (
+    create_questionnaire,
+)
+from tui_labeller.tuis.urwid.question_app.HistoryStore import (
+    CATEGORY_QUESTION_ID,
+    HistoryStore,
+)
+from tui_labeller.tuis.urwid.question_data_classes import (
+    InputValidationQuestionData,
+)
+
+RECEIPT = {
+    "the_date": "2024-05-01T12:00:00",
+    "receipt_category": "groceries:ekoplaza",
+    "shop_identifier": {
+        "name": "ekoplaza",
+        "address": {"street": "Groenestraat", "city": "Nijmegen"},
+    },
+}
+
+
+def test_answers_are_ranked_by_frequency_and_recency():
+    """Test a frequent answer loses to a recent one once its uses decayed,
+    and a more frequent answer wins at the same time."""
+    history_store = HistoryStore(half_life=10.0)
+    for timestamp in (0.0, 1.0, 2.0):
+        history_store.add(question_id="q", answer="old", timestamp=timestamp)
+    history_store.add(question_id="q", answer="recent", timestamp=100.0)
+    for timestamp in (99.0, 100.0):
+        history_store.add(question_id="q", answer="both", timestamp=timestamp)
+
+    assert history_store.get_suggestions(question_id="q") == [
+        "both",
+        "recent",
+        "old",
+    ]
+    assert [
+        suggestion.frequency
+        for suggestion in history_store.get_history_suggestions(question_id="q")
+    ] == [2, 1, 3]
+    assert history_store.get_suggestions(question_id="unknown") == []
+
+
+def test_store_is_seeded_lazily_and_persisted(tmp_path):
+    """Test the store is seeded from the labelled receipts on the first
+    query only, and that a saved store is loaded instead of seeded."""
+    filepath = str(tmp_path / "history_store.json")
+    seeded = []
+
+    def get_receipts():
+        seeded.append(True)
+        yield RECEIPT
+
+    history_store = HistoryStore(
+        filepath=filepath, labelled_receipts=get_receipts()
+    )
+    assert not seeded
+    assert history_store.get_suggestions(question_id=CATEGORY_QUESTION_ID) == [
+        "groceries:ekoplaza"
+    ]
+    assert history_store.get_suggestions(question_id="shop_city") == [
+        "Nijmegen"
+    ]
+    history_store.add_answers(answers={"shop_city": "Arnhem", "shop_name": ""})
+    history_store.save()
+
+    loaded = HistoryStore(filepath=filepath, labelled_receipts=[{}])
+    assert loaded.get_suggestions(question_id="shop_city") == [
+        "Arnhem",
+        "Nijmegen",
+    ]
+    assert loaded.get_suggestions(question_id="shop_name") == ["ekoplaza"]
+
+
+def test_ctrl_u_applies_the_top_ranked_history_answer():
+    """Test the history of a question is looked up by its question_id, not
+    its caption, and ctrl+u applies the highest ranked answer."""
+    history_store = HistoryStore()
+    history_store.add(question_id="shop_city", answer="Arnhem", timestamp=1.0)
+    history_store.add(question_id="shop_city", answer="Nijmegen")
+    app = create_questionnaire(
+        header="Test",
+        questions=[
+            InputValidationQuestionData(
+                question="City:",
+                input_type=InputType.LETTERS,
+                ans_required=True,
+                reconfigurer=False,
+                terminator=False,
+                ai_suggestions=[],
+                history_suggestions=[],
+                question_id="shop_city",
+            )
+        ],
+        labelled_receipts=[],
+        screen=HeadlessScreen(),
+        history_store=history_store,
+    )
+    app.pile.focus_position = app.nr_of_headers
+    app.loop.process_input(["ctrl u"])
+    assert app.inputs[0].base_widget.get_edit_text() == "Nijmegen"
@@ -0,0 +1,53 @@
+import sys
+
+from tui_labeller.tuis.urwid.question_data_classes import (
+    AISuggestion,
+    HorizontalMultipleChoiceQuestionData,
+    VerticalMultipleChoiceQuestionData,
+)
+
+
+def get_vc_question_data(*, choices) -> VerticalMultipleChoiceQuestionData:
+    return VerticalMultipleChoiceQuestionData(
+        question="Currency:",
+        choices=choices,
+        nr_of_ans_per_batch=8,
+        ans_required=True,
+        reconfigurer=False,
+        terminator=False,
+        ai_suggestions=[],
+    )
+
+
+def test_equal_choices_are_shared():
+    """Test questions with equal choices share a single choices tuple, and
+    new choices replace it."""
+    question_data = get_vc_question_data(choices=["EUR", "USD"])
+    other_question_data = get_vc_question_data(choices=("EUR", "USD"))
+    assert question_data.choices == ("EUR", "USD")
+    assert question_data.choices is other_question_data.choices
+
+    question_data.choices = ["EUR"]
+    assert question_data.choices == ("EUR",)
+    assert other_question_data.choices == ("EUR", "USD")
+    assert (
+        HorizontalMultipleChoiceQuestionData(
+            question="Add another account (y/n)?",
+            choices=["EUR"],
+            ai_suggestions=[],
+            ans_required=True,
+            reconfigurer=True,
+            terminator=False,
+        ).choices
+        is question_data.choices
+    )
+
+
+def test_slots():
+    """Test the question data and suggestions have no instance dict."""
+    suggestion = AISuggestion(
+        question="".join(["assets:", "gold"]), probability=0.5, model_name="a"
+    )
+    assert not hasattr(suggestion, "__dict__")
+    assert suggestion.question is sys.intern("assets:gold")
+    assert not hasattr(get_vc_question_data(choices=[]), "__dict__")
@@ -0,0 +1,154 @@
+import pytest
+from hledger_preprocessor.receipt_transaction_matching.get_bank_data_from_transactions import (
+    HledgerFlowAccountInfo,
+)
+
+from tui_labeller.tuis.urwid.question_app.generator import create_questionnaire
+from tui_labeller.tuis.urwid.question_app.reconfiguration.adding_questions import (
+    handle_add_account,
+)
+from tui_labeller.tuis.urwid.question_app.reconfiguration.reconfiguration import (
+    NO_ACCOUNTS_LEFT_NOTICE,
+    collect_selected_accounts,
+    get_configuration,
+)
+from tui_labeller.tuis.urwid.question_app.reconfiguration.removing_questions import (
+    remove_later_account_questions,
+)
+from tui_labeller.tuis.urwid.QuestionnaireApp import QuestionnaireApp
+from tui_labeller.tuis.urwid.receipts.AccountQuestions import AccountQuestions
+from tui_labeller.tuis.urwid.receipts.BaseQuestions import BaseQuestions
+from tui_labeller.tuis.urwid.receipts.OptionalQuestions import OptionalQuestions
+
+
+@pytest.fixture
+def some_dict():
+    account_info: HledgerFlowAccountInfo = HledgerFlowAccountInfo(
+        account_holder="account_placeholder",
+        bank="bank_placeholder",
+        account_type="account_type_placeholder",
+    )
+    account_questions = AccountQuestions(
+        account_infos=[account_info.to_colon_separated_string()],
+        asset_accounts={"assets:gold", "assets:btc:2342323"},
+    )
+    optional_questions = OptionalQuestions(labelled_receipts=[])
+    app: QuestionnaireApp = create_questionnaire(
+        questions=BaseQuestions().base_questions
+        + account_questions.account_questions
+        + optional_questions.optional_questions,
+        header="Answer the receipt questions.",
+        labelled_receipts=[],
+    )
+    return {"app": app, "account_questions": account_questions}
+
+
+def assert_pile_matches_inputs(*, app: QuestionnaireApp) -> None:
+    pile_widgets = [
+        widget for widget, _ in app.pile.contents[app.nr_of_headers :]
+    ]
+    assert pile_widgets == app.inputs
+    assert len(app.questions) == len(app.inputs)
+
+
+def test_add_account_is_spliced_in_place(some_dict):
+    """Test adding an account block keeps the existing widgets and answers."""
+    app: QuestionnaireApp = some_dict["app"]
+    account_questions: AccountQuestions = some_dict["account_questions"]
+
+    category_widget = app.inputs[1]
+    category_widget.base_widget.set_answer("groceries:fruit")
+    original_inputs = list(app.inputs)
+    nr_of_account_questions = len(account_questions.account_questions)
+
+    returned_app = handle_add_account(
+        tui=app,
+        account_questions=account_questions,
+        selected_accounts=set(),
+    )
+
+    assert returned_app is app
+    assert len(app.inputs) == len(original_inputs) + nr_of_account_questions
+    assert app.inputs[1] is category_widget
+    assert category_widget.base_widget.get_answer() == "groceries:fruit"
+    # The new block is inserted directly after the first account block.
+    new_block_start: int = 2 + nr_of_account_questions
+    assert (
+        app.questions[new_block_start].question_id
+        == "Belongs to bank/asset_accounts:_2"
+    )
+    assert app.inputs[new_block_start + nr_of_account_questions] is (
+        original_inputs[new_block_start]
+    )
+    assert_pile_matches_inputs(app=app)
+
+
+def test_remove_later_account_questions(some_dict):
+    """Test removing a later account block restores the original layout."""
+    app: QuestionnaireApp = some_dict["app"]
+    account_questions: AccountQuestions = some_dict["account_questions"]
+    original_inputs = list(app.inputs)
+
+    handle_add_account(
+        tui=app,
+        account_questions=account_questions,
+        selected_accounts=set(),
+    )
+    remove_later_account_questions(
+        tui=app,
+        account_questions=account_questions,
+        start_question_nr=1 + len(account_questions.account_questions),
+    )
+
+    assert app.inputs == original_inputs
+    assert_pile_matches_inputs(app=app)
+
+
+def test_add_account_excludes_selected_accounts(some_dict):
+    """Test the new account block does not offer the selected account."""
+    app: QuestionnaireApp = some_dict["app"]
+    account_questions: AccountQuestions = some_dict["account_questions"]
+    app.inputs[2].base_widget.set_answer("assets:gold")
+
+    selected_accounts = collect_selected_accounts(app)
+    assert selected_accounts == {"assets:gold"}
+    handle_add_account(
+        tui=app,
+        account_questions=account_questions,
+        selected_accounts=selected_accounts,
+    )
+
+    new_block_start: int = 2 + len(account_questions.account_questions)
+    assert "assets:gold" not in app.questions[new_block_start].choices
+    assert "assets:btc:2342323" in app.questions[new_block_start].choices
+
+
+def test_add_account_without_accounts_left():
+    """Test answering "y" to adding an account when every account is picked
+    answers "n" with a notice, instead of raising."""
+    account_questions = AccountQuestions(
+        account_infos=["holder:bank:checking"], asset_accounts=set()
+    )
+    optional_questions = OptionalQuestions(labelled_receipts=[])
+    app: QuestionnaireApp = create_questionnaire(
+        questions=BaseQuestions().base_questions
+        + account_questions.account_questions
+        + optional_questions.optional_questions,
+        header="Answer the receipt questions.",
+        labelled_receipts=[],
+    )
+    app.inputs[1].base_widget.set_answer("groceries:fruit")
+    app.inputs[2].base_widget.set_answer("holder:bank:checking")
+    add_account_nr: int = 1 + len(account_questions.account_questions)
+    app.inputs[add_account_nr].base_widget.set_answer("y")
+    nr_of_inputs: int = len(app.inputs)
+
+    get_configuration(
+        tui=app,
+        account_questions=account_questions,
+        optional_questions=optional_questions,
+    )
+
+    assert len(app.inputs) == nr_of_inputs
+    assert app.inputs[add_account_nr].base_widget.get_answer() == "n"
+    assert app.error_message.text == NO_ACCOUNTS_LEFT_NOTICE
@@ -0,0 +1,88 @@
+from hledger_preprocessor.TransactionObjects.Receipt import Address, ShopId
+
+from tui_labeller.tuis.urwid.question_app.addresses.ShopCatalogue import (
+    ShopCatalogue,
+)
+
+
+def get_shop_id(*, name: str, street: str) -> ShopId:
+    return ShopId(
+        name=name,
+        address=Address(street=street, house_nr="1", city="Nijmegen"),
+    )
+
+
+def test_choices_star_most_frequent_category(tmp_path):
+    """Test the shops of the selected category are starred and listed first,
+    and that the catalogue survives a save/load round trip."""
+    shop_catalogue = ShopCatalogue(
+        filepath=str(tmp_path / "shop_catalogue.json")
+    )
+    bakery = get_shop_id(name="bakery", street="Broodstraat")
+    market = get_shop_id(name="market", street="Marktplein")
+    shop_catalogue.add_shop(
+        shop_identifier=bakery, category="groceries:bread", count=3
+    )
+    shop_catalogue.add_shop(
+        shop_identifier=market, category="groceries:fruit", count=5
+    )
+    shop_catalogue.add_shop(shop_identifier=market, category="groceries:bread")
+
+    choices, shop_ids = shop_catalogue.get_choices(
+        category_input="groceries:bread"
+    )
+    assert choices[0] == "manual address"
+    assert choices[1].startswith("*bakery")
+    assert choices[2].startswith("market")
+    assert shop_ids[1:] == [bakery, market]
+
+    shop_catalogue.save()
+    reloaded = ShopCatalogue.load(filepath=shop_catalogue.filepath)
+    assert reloaded.category_counts == shop_catalogue.category_counts
+    assert reloaded.get_choices(category_input="groceries:bread")[0] == choices
+
+
+def test_ranking_follows_added_receipts():
+    """Test a shop moves up in the choices once receipts are added to it
+    after the ranking was built, and that new shops are ranked."""
+    shop_catalogue = ShopCatalogue()
+    bakery = get_shop_id(name="bakery", street="Broodstraat")
+    market = get_shop_id(name="market", street="Marktplein")
+    shop_catalogue.add_shop(shop_identifier=bakery, category="groceries")
+    shop_catalogue.add_shop(shop_identifier=market, category="groceries")
+    assert shop_catalogue.get_choices()[1][1:] == [bakery, market]
+
+    shop_catalogue.add_shop(shop_identifier=market, category="fruit", count=2)
+    assert shop_catalogue.get_choices()[1][1:] == [market, bakery]
+    cheese = get_shop_id(name="cheese", street="Kaasmarkt")
+    shop_catalogue.add_shop(shop_identifier=cheese, category="fruit", count=3)
+    choices, shop_ids = shop_catalogue.get_choices(category_input="groceries")
+    assert shop_ids[1:] == [bakery, cheese, market]
+    assert choices[1].startswith("*bakery")
+
+
+def test_load_seeds_from_json_receipts(tmp_path):
+    """Test a catalogue without a file is seeded from the json receipts of
+    the results.ndjson, skipping those without a shop address."""
+    shop_catalogue = ShopCatalogue.load(
+        filepath=str(tmp_path / "shop_catalogue.json"),
+        labelled_receipts=iter(
+            [
+                {
+                    "receipt_category": "groceries:bread",
+                    "shop_identifier": {
+                        "name": "bakery",
+                        "address": {"street": "Broodstraat", "city": "Ede"},
+                    },
+                },
+                {
+                    "receipt_category": "groceries:fruit",
+                    "shop_identifier": {"name": "market", "address": {}},
+                },
+                {"receipt_category": None, "shop_identifier": None},
+            ]
+        ),
+    )
+    assert list(shop_catalogue.category_counts.values()) == [
+        {"groceries:bread": 1}
+    ]
@@ -0,0 +1,189 @@
+import random
+from typing import List
+
+import urwid
+
+from tui_labeller.tuis.urwid.input_validation.autocomplete_filtering import (
+    get_filtered_suggestions,
+)
+from tui_labeller.tuis.urwid.input_validation.InputType import InputType
+from tui_labeller.tuis.urwid.input_validation.InputValidationQuestion import (
+    InputValidationQuestion,
+)
+from tui_labeller.tuis.urwid.input_validation.SuggestionIndex import (
+    SuggestionIndex,
+)
+from tui_labeller.tuis.urwid.question_app.HistoryStore import HistoryStore
+from tui_labeller.tuis.urwid.question_data_classes import (
+    AISuggestion,
+    InputValidationQuestionData,
+)
+
+
+def test_index_matches_linear_filtering():
+    """Test the index returns the same suggestions, in the same order, as the
+    linear get_filtered_suggestions, also after suggestions are added."""
+    rng = random.Random(7)
+    suggestions: List[str] = [
+        ":".join(
+            "".join(rng.choice("abcdE") for _ in range(rng.randint(1, 5)))
+            for _ in range(rng.randint(1, 3))
+        )
+        for _ in range(5000)
+    ]
+    index = SuggestionIndex(suggestions[:4000])
+    index.sync(suggestions=suggestions)
+
+    queries: List[str] = ["", "*", " a ", "ab*", "*cd", "a*bcd*e", "e*:a"]
+    for _ in range(200):
+        query: str = "".join(rng.choice("abcde:*") for _ in range(4))
+        # Grow the query one character at a time, like typing.
+        queries.extend(query[:i] for i in range(1, len(query) + 1))
+
+    for query in queries:
+        assert index.get_filtered_suggestions(
+            input_text=query
+        ) == get_filtered_suggestions(
+            input_text=query, available_suggestions=suggestions
+        ), query
+
+
+def test_top_suggestions_are_the_highest_scored_matches():
+    """Test get_top_suggestions returns the k highest scored distinct
+    matches of the filtered suggestions, equal scores in insertion
+    order."""
+    rng = random.Random(11)
+    suggestions: List[str] = [
+        "".join(rng.choice("abc") for _ in range(rng.randint(1, 4)))
+        for _ in range(2000)
+    ]
+    scores: List[float] = [float(rng.randint(0, 5)) for _ in suggestions]
+    index = SuggestionIndex(suggestions, scores=scores)
+
+    for query in ["", "a", "ab", "b*c", "cc*a", "abcabc"]:
+        positions: List[int] = [
+            position
+            for position, suggestion in enumerate(suggestions)
+            if suggestion in index.get_filtered_suggestions(input_text=query)
+        ]
+        expected: List[str] = list(
+            dict.fromkeys(
+                suggestions[position]
+                for position in sorted(
+                    positions,
+                    key=lambda position: (-scores[position], position),
+                )
+            )
+        )
+        for k in (1, 3, 10):
+            assert (
+                index.get_top_suggestions(input_text=query, k=k) == expected[:k]
+            ), (query, k)
+
+
+def test_tab_applies_a_suggestion_that_was_added_twice():
+    """Test a suggestion that is in the AI suggestions twice is the single
+    match of tab, and is applied."""
+    index = SuggestionIndex(
+        ["name:uniswap:saving", "name:uniswap:saving", "name:other"],
+        scores=[0.9, 0.8, 0.1],
+    )
+    assert index.get_top_suggestions(input_text="name:u", k=2) == [
+        "name:uniswap:saving"
+    ]
+
+    widget = InputValidationQuestion(
+        question_data=InputValidationQuestionData(
+            question="Name:",
+            input_type=InputType.LETTERS_SEMICOLON,
+            ans_required=True,
+            reconfigurer=False,
+            terminator=False,
+            ai_suggestions=[
+                AISuggestion(
+                    question="name:uniswap:saving",
+                    probability=probability,
+                    model_name="model",
+                )
+                for probability in (0.9, 0.8)
+            ],
+            history_suggestions=[],
+            question_id="name",
+        ),
+        history_store=HistoryStore(),
+    )
+    widget.owner = urwid.AttrMap(widget, "normal")
+    widget.set_edit_text("name:u")
+    widget.set_edit_pos(6)
+    assert widget.keypress((40,), "tab") == "next_question"
+    assert widget.get_edit_text() == "name:uniswap:saving"
+
+
+def get_prefix_distance(*, query: str, suggestion: str) -> int:
+    """Returns the smallest edit distance between query and a prefix of
+    suggestion, the brute force way."""
+    distances: List[int] = []
+    for length in range(len(suggestion) + 1):
+        prefix: str = suggestion[:length]
+        row: List[int] = list(range(len(query) + 1))
+        for char in prefix:
+            next_row: List[int] = [row[0] + 1]
+            for j, query_char in enumerate(query):
+                next_row.append(
+                    min(
+                        row[j + 1] + 1,
+                        next_row[j] + 1,
+                        row[j] + (query_char != char),
+                    )
+                )
+            row = next_row
+        distances.append(row[-1])
+    return min(distances)
+
+
+def test_fuzzy_suggestions_match_brute_force_prefix_distance():
+    """Test get_fuzzy_suggestions returns the suggestions that start with a
+    typo of the query, the closest and highest scored first."""
+    rng = random.Random(13)
+    suggestions: List[str] = [
+        "".join(rng.choice("abcd:") for _ in range(rng.randint(3, 9)))
+        for _ in range(500)
+    ]
+    scores: List[float] = [float(rng.randint(0, 3)) for _ in suggestions]
+    index = SuggestionIndex(suggestions, scores=scores)
+    assert (
+        index.get_fuzzy_suggestions(input_text="groceries:ekoplza", k=3) == []
+    )
+
+    for _ in range(50):
+        query: str = "".join(rng.choice("abcd:") for _ in range(6))
+        distances: List[int] = [
+            get_prefix_distance(query=query, suggestion=suggestion)
+            for suggestion in suggestions
+        ]
+        expected: List[str] = [
+            suggestions[position]
+            for position in sorted(
+                (
+                    position
+                    for position, distance in enumerate(distances)
+                    if 0 < distance <= 1
+                ),
+                key=lambda position: (
+                    distances[position],
+                    -scores[position],
+                    position,
+                ),
+            )
+        ]
+        assert (
+            index.get_fuzzy_suggestions(
+                input_text=query, k=5, max_distance=1, time_budget=10.0
+            )
+            == expected[:5]
+        ), query
+
+    index = SuggestionIndex(["groceries:ekoplaza", "groceries:albert heijn"])
+    assert index.get_fuzzy_suggestions(input_text="grocreies:eko", k=3) == [
+        "groceries:ekoplaza"
+    ]